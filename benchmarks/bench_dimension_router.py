@@ -0,0 +1,125 @@
+"""Benchmark: routed vs. full fan-out prelim stage.
+
+Runs a set of inquiries through the graph with the full fan-out against the
+`FakeLLM` backend, fits a `DimensionRouter` on the first half and runs the
+second half with routing. Reports LLM calls saved and the supervisor metric
+lost against the full fan-out of the same inquiries.
+
+    PYTHONPATH=. python -m benchmarks.bench_dimension_router --recall 0.9
+
+The fake backend answers at random, so its per-dimension statistics carry
+little signal; point `--history` at real batch results for meaningful numbers.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from src.agents.supervisors.dimension_router import DimensionRouter  # noqa: E402
+from src.agents.supervisors.inquiry_supervisor import InquirySupervisor  # noqa: E402
+from src.agents.workers.inquiry_base import calculate_worker_metric  # noqa: E402
+from src.graphs.inquiry_bot import graph  # noqa: E402
+from src.llms.fake_llm import FakeLLM  # noqa: E402
+
+TOPICS = [
+    "push-ups",
+    "sourdough bread",
+    "job interviews",
+    "cat behaviour",
+    "solar panels",
+    "learning Spanish",
+    "city cycling",
+    "sleep quality",
+    "saving money",
+    "houseplants",
+]
+TEMPLATES = [
+    "How to get better at {}?",
+    "Common mistakes with {}",
+    "Is {} worth it?",
+    "What should beginners know about {}?",
+]
+
+
+def run(run_id: int, inquiry: str, router: DimensionRouter | None) -> dict:
+    llm = FakeLLM(latency=0.0, seed=run_id)
+    config = {
+        "configurable": {
+            "thread_id": f"router-bench-{run_id}-{router is not None}",
+            "llm": llm,
+            "response_cache": None,
+            "dimension_router": router,
+        }
+    }
+    state = graph.invoke({"inquiry": inquiry}, config)
+    replies = state["worker_replies"]
+    return {
+        "inquiry": inquiry,
+        "llm_calls": llm.calls,
+        "supervisor": InquirySupervisor.calculate_metric(replies),
+        "workers": {
+            dim: calculate_worker_metric(reply) for dim, reply in replies.items()
+        },
+    }
+
+
+def run_all(
+    inquiries: list[str], router: DimensionRouter | None, concurrency: int
+) -> list[dict]:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(lambda args: run(*args, router), enumerate(inquiries)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Routed vs. full fan-out prelim stage")
+    parser.add_argument("--recall", type=float, default=0.9)
+    parser.add_argument("--min-dimensions", type=int, default=3)
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--history", help="Fit on these batch results instead of the train half"
+    )
+    args = parser.parse_args()
+
+    inquiries = [t.format(topic) for topic in TOPICS for t in TEMPLATES]
+    train, test = inquiries[::2], inquiries[1::2]
+    kwargs = {"recall": args.recall, "min_dimensions": args.min_dimensions}
+    if args.history:
+        router = DimensionRouter.from_batch_results(args.history, **kwargs)
+    else:
+        history = run_all(train, None, args.concurrency)
+        router = DimensionRouter(**kwargs).fit(
+            [r["inquiry"] for r in history], [r["workers"] for r in history]
+        )
+
+    full = run_all(test, None, args.concurrency)
+    routed = run_all(test, router, args.concurrency)
+    calls_full = sum(r["llm_calls"] for r in full)
+    calls_routed = sum(r["llm_calls"] for r in routed)
+    metric_full = sum(r["supervisor"] for r in full)
+    metric_routed = sum(r["supervisor"] for r in routed)
+    estimate = router.evaluate(
+        [r["inquiry"] for r in full], [r["workers"] for r in full]
+    )
+
+    report = {
+        "inquiries": len(test),
+        "recall_target": args.recall,
+        "prelim_calls_saved": sum(router.route(q)["calls_saved"] for q in test),
+        "llm_calls_full": calls_full,
+        "llm_calls_routed": calls_routed,
+        "llm_calls_saved": 1 - calls_routed / calls_full,
+        "metric_full": metric_full,
+        "metric_routed": metric_routed,
+        "metric_loss": (metric_full - metric_routed) / metric_full,
+        "estimated_metric_loss": estimate["metric_loss"],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Benchmark: hedged vs. plain worker and merger calls.
+
+Runs the same inquiries through the async graph against a `FakeLLM` with
+occasional stragglers (`--slow-rate` of the calls take `--slow-factor` times
+longer), once without and once with a `RequestHedger`. Reports call and run
+latency percentiles, the hedge rate and the extra LLM calls.
+
+    PYTHONPATH=. python -m benchmarks.bench_hedging -n 20 --slow-rate 0.03
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from benchmarks.load_generator import DEFAULT_INQUIRIES  # noqa: E402
+from src.graphs.inquiry_bot import graph  # noqa: E402
+from src.graphs.profiling import RunProfiler  # noqa: E402
+from src.llms.fake_llm import FakeLLM  # noqa: E402
+from src.llms.hedging import RequestHedger  # noqa: E402
+from src.utils.stats import percentile  # noqa: E402
+
+
+async def run(
+    run_id: int, inquiry: str, llm_params: dict, hedger, profiler, semaphore
+) -> dict:
+    llm = FakeLLM(**llm_params, seed=run_id)
+    config = {
+        "configurable": {
+            "thread_id": f"hedging-bench-{run_id}-{hedger is not None}",
+            "llm": llm,
+            "response_cache": None,
+            "hedger": hedger,
+            "profiler": profiler,
+        }
+    }
+    async with semaphore:
+        start = time.perf_counter()
+        await graph.ainvoke({"inquiry": inquiry}, config)
+        return {"wall_time": time.perf_counter() - start, "llm_calls": llm.calls}
+
+
+async def bench(
+    inquiries: list[str], llm_params: dict, hedger, concurrency: int
+) -> dict:
+    profiler = RunProfiler()
+    semaphore = asyncio.Semaphore(concurrency)
+    runs = await asyncio.gather(
+        *(
+            run(i, q, llm_params, hedger, profiler, semaphore)
+            for i, q in enumerate(inquiries)
+        )
+    )
+    calls = [c for c in profiler.calls if c.role in ("worker", "merger")]
+    call_times = [c.wall_time for c in calls]
+    run_times = [r["wall_time"] for r in runs]
+    report = {
+        "llm_calls": sum(r["llm_calls"] for r in runs),
+        "call_p50": percentile(call_times, 50),
+        "call_p99": percentile(call_times, 99),
+        "run_p50": percentile(run_times, 50),
+        "run_p99": percentile(run_times, 99),
+    }
+    if hedger is not None:
+        report.update(hedger.stats())
+        report["call_p99_unhedged_estimate"] = percentile(
+            [c.unhedged_time for c in calls], 99
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Hedged vs. plain worker and merger calls"
+    )
+    parser.add_argument("-n", "--num-inquiries", type=int, default=20)
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--slow-rate", type=float, default=0.03)
+    parser.add_argument("--slow-factor", type=float, default=10.0)
+    parser.add_argument("--percentile", type=float, default=95.0)
+    parser.add_argument("--max-hedge-rate", type=float, default=0.05)
+    args = parser.parse_args()
+
+    llm_params = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "slow_rate": args.slow_rate,
+        "slow_factor": args.slow_factor,
+    }
+    inquiries = [
+        DEFAULT_INQUIRIES[i % len(DEFAULT_INQUIRIES)] for i in range(args.num_inquiries)
+    ]
+    hedger = RequestHedger(
+        percentile=args.percentile, max_hedge_rate=args.max_hedge_rate
+    )
+    plain = asyncio.run(bench(inquiries, llm_params, None, args.concurrency))
+    hedged = asyncio.run(bench(inquiries, llm_params, hedger, args.concurrency))
+    report = {
+        "plain": plain,
+        "hedged": hedged,
+        "call_p99_improvement": 1 - hedged["call_p99"] / plain["call_p99"],
+        "run_p99_improvement": 1 - hedged["run_p99"] / plain["run_p99"],
+        "extra_llm_calls": hedged["llm_calls"] / plain["llm_calls"] - 1,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: the same inquiries under different model routing profiles.
+
+Runs every inquiry once per `ModelRouting` profile (JSON files, see
+`routing_profiles/`) and reports run latency, tokens, estimated cost and the
+supervisor metric side by side.
+
+    PYTHONPATH=. python -m benchmarks.bench_model_routing -n 20 -c 4 \\
+        benchmarks/routing_profiles/single.json benchmarks/routing_profiles/tiered.json
+
+Without profile arguments, all profiles in `routing_profiles/` are compared.
+The bundled profiles use the fake backend with model-like latencies and
+prices; point them at real backends for meaningful quality numbers.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from benchmarks.load_generator import DEFAULT_INQUIRIES  # noqa: E402
+from src.agents.supervisors.inquiry_supervisor import InquirySupervisor  # noqa: E402
+from src.graphs.inquiry_bot import graph  # noqa: E402
+from src.graphs.profiling import RunProfiler  # noqa: E402
+from src.llms.model_routing import ModelRouting  # noqa: E402
+from src.utils.stats import percentile  # noqa: E402
+
+PROFILE_DIR = os.path.join(os.path.dirname(__file__), "routing_profiles")
+
+
+def run(run_id: int, inquiry: str, routing: ModelRouting) -> dict:
+    profiler = RunProfiler()
+    config = {
+        "configurable": {
+            "thread_id": f"routing-bench-{routing.name}-{run_id}",
+            "model_routing": routing,
+            "response_cache": None,
+            "profiler": profiler,
+        }
+    }
+    start = time.perf_counter()
+    state = graph.invoke({"inquiry": inquiry}, config)
+    report = profiler.report()
+    totals = report["totals"]
+    return {
+        "wall_time": time.perf_counter() - start,
+        "llm_calls": totals["calls"],
+        "errors": totals["errors"],
+        "tokens": totals["prompt_tokens"] + totals["completion_tokens"],
+        "cost": routing.cost(report["calls"]),
+        "supervisor": InquirySupervisor.calculate_metric(state["worker_replies"]),
+    }
+
+
+def bench_profile(
+    routing: ModelRouting, inquiries: list[str], concurrency: int
+) -> dict:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        runs = list(
+            executor.map(lambda args: run(*args, routing), enumerate(inquiries))
+        )
+    latencies = [r["wall_time"] for r in runs]
+    n = len(runs)
+    return {
+        "profile": routing.name,
+        "inquiries": n,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "llm_calls": sum(r["llm_calls"] for r in runs) / n,
+        "errors": sum(r["errors"] for r in runs),
+        "tokens": sum(r["tokens"] for r in runs) / n,
+        "cost": sum(r["cost"] for r in runs) / n,
+        "supervisor": sum(r["supervisor"] for r in runs) / n,
+    }
+
+
+def print_table(results: list[dict]) -> None:
+    print(
+        f"{'profile':<14}{'p50 [s]':>9}{'p95 [s]':>9}{'calls':>8}{'errors':>8}"
+        f"{'tokens':>9}{'cost [$]':>11}{'metric':>9}"
+    )
+    for r in results:
+        print(
+            f"{r['profile']:<14}{r['p50']:>9.3f}{r['p95']:>9.3f}"
+            f"{r['llm_calls']:>8.1f}{r['errors']:>8}{r['tokens']:>9.0f}"
+            f"{r['cost']:>11.5f}{r['supervisor']:>9.3f}"
+        )
+    print("(calls, tokens, cost and metric are per inquiry)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare model routing profiles")
+    parser.add_argument("profiles", nargs="*", help="Routing profile JSON files")
+    parser.add_argument("-n", "--num-inquiries", type=int, default=10)
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    paths = args.profiles or sorted(glob.glob(os.path.join(PROFILE_DIR, "*.json")))
+    inquiries = [
+        DEFAULT_INQUIRIES[i % len(DEFAULT_INQUIRIES)] for i in range(args.num_inquiries)
+    ]
+    results = [
+        bench_profile(ModelRouting.from_file(path), inquiries, args.concurrency)
+        for path in paths
+    ]
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Micro-benchmark: precompiled prompt engine vs. compiling the template per call.
+
+    PYTHONPATH=. python -m benchmarks.bench_prompt_engine
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+import jinja2
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.agents.workers.inquiry_base import (  # noqa: E402
+    ALL_DIMENSIONS,
+    BASE_PROMPT_TEMPLATE,
+    InquiryCausal,
+)
+
+INQUIRY = "Correct push-ups?"
+CONTEXT = (
+    '[{"answer": "Keep your back straight", "answer_type": "manner", "score": 0.9}]'
+)
+
+
+def legacy_render_prompt(cls, inquiry: str, additional_context: str = "") -> str:
+    """The rendering path before the prompt engine: compile on every call."""
+    template = jinja2.Template(BASE_PROMPT_TEMPLATE)
+    valid_uif_dimensions = [d for d in ALL_DIMENSIONS if d != cls.dimension]
+    return template.render(
+        dimension=cls.dimension,
+        primary_focus=cls.primary_focus,
+        answer_types=", ".join(cls.answer_types),
+        valid_uif_dimensions=", ".join(valid_uif_dimensions),
+        contextual_utility=cls.contextual_utility,
+        inquiry=inquiry,
+        additional_context=additional_context,
+        max_answers=5,
+        max_fillups=2,
+        max_connections=3,
+        similarity_threshold=0.8,
+        request_similarity=True,
+    )
+
+
+def run_benchmark(number: int) -> dict:
+    assert legacy_render_prompt(InquiryCausal, INQUIRY, CONTEXT) == (
+        InquiryCausal.render_prompt(INQUIRY, CONTEXT)
+    )
+    cases = {
+        "legacy": lambda: legacy_render_prompt(InquiryCausal, INQUIRY, CONTEXT),
+        "engine": lambda: InquiryCausal.render_prompt(INQUIRY, CONTEXT),
+    }
+    return {
+        name: min(timeit.repeat(fn, number=number, repeat=5)) / number
+        for name, fn in cases.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt rendering micro-benchmark")
+    parser.add_argument("-n", "--number", type=int, default=200)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.number)
+    for name, seconds in results.items():
+        print(f"{name:<8}{seconds * 1e6:>10.1f} us/render")
+    print(f"speedup {results['legacy'] / results['engine']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
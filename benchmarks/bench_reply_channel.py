@@ -0,0 +1,142 @@
+"""Benchmark: `worker_replies` as a full-dict channel vs. a delta channel.
+
+Runs the same inquiries against the `FakeLLM` backend with a `SQLiteCheckpointer`
+that keeps every checkpoint, once with the previous channel (`merge_dict`, the
+whole dict in every checkpoint) and once per `--snapshot-frequency` with the
+`DeltaChannel` of `AgentState` (only changed replies, plus a snapshot every N
+updates). Per reply update (prelim step or cross loop) it reports the
+checkpoint bytes written and the time spent in the channel reducers, and per
+run the time to restore the state (`graph.get_state`) from a fresh saver.
+
+    PYTHONPATH=. python -m benchmarks.bench_reply_channel --snapshot-frequency 2 4 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Annotated, TypedDict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from langgraph.channels.delta import DeltaChannel  # noqa: E402
+
+from benchmarks.load_generator import DEFAULT_INQUIRIES  # noqa: E402
+from src.agents.workers.inquiry_base import WorkerReply  # noqa: E402
+from src.graphs.checkpointing import SQLiteCheckpointer  # noqa: E402
+from src.graphs.inquiry_bot import (
+    AgentState,
+    add_revisions,
+    build_workflow,
+    merge_dict,
+    merge_replies,
+)  # noqa: E402
+from src.llms.fake_llm import FakeLLM  # noqa: E402
+
+
+class ReducerTimer:
+    def __init__(self):
+        self.seconds = 0.0
+
+    def wrap(self, reducer):
+        def timed(value, update):  # LangGraph checks the (a, b) signature
+            start = time.perf_counter()
+            try:
+                return reducer(value, update)
+            finally:
+                self.seconds += time.perf_counter() - start
+
+        return timed
+
+
+def state_schema(timer: ReducerTimer, snapshot_frequency: int | None) -> type:
+    """`AgentState` with the previous full-dict channels (None) or delta channels."""
+    if snapshot_frequency is None:
+        replies = Annotated[dict[str, WorkerReply], timer.wrap(merge_dict)]
+        revisions = Annotated[
+            dict[str, int], timer.wrap(lambda old, new: add_revisions(old or {}, [new]))
+        ]
+    else:
+        replies = Annotated[
+            dict[str, WorkerReply],
+            DeltaChannel(
+                timer.wrap(merge_replies), snapshot_frequency=snapshot_frequency
+            ),
+        ]
+        revisions = Annotated[
+            dict[str, int],
+            DeltaChannel(
+                timer.wrap(add_revisions), snapshot_frequency=snapshot_frequency
+            ),
+        ]
+    fields = {
+        **AgentState.__annotations__,
+        "worker_replies": replies,
+        "reply_revisions": revisions,
+    }
+    return TypedDict("BenchState", fields)
+
+
+def bench(inquiries: list[str], snapshot_frequency: int | None) -> dict:
+    timer = ReducerTimer()
+    workflow = build_workflow(state_schema(timer, snapshot_frequency))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "checkpoints.sqlite")
+        saver = SQLiteCheckpointer(path, keep_latest_only=False)
+        graph = workflow.compile(checkpointer=saver)
+        configs, updates = [], 0
+        for i, inquiry in enumerate(inquiries):
+            config = {
+                "configurable": {
+                    "thread_id": f"channel-bench-{i}",
+                    "llm": FakeLLM(latency=0.0, seed=i),
+                    "response_cache": None,
+                }
+            }
+            final = graph.invoke({"inquiry": inquiry}, config)
+            updates += final["loop_count"] + 1  # prelim step + cross loops
+            configs.append(config)
+        stats, reducer_time = saver.stats(), timer.seconds
+        saver.close()
+
+        # restore every thread from disk, as a resumed run would
+        fresh = SQLiteCheckpointer(path, keep_latest_only=False)
+        graph = workflow.compile(checkpointer=fresh)
+        start = time.perf_counter()
+        for config in configs:
+            graph.get_state(config)
+        restore_time = time.perf_counter() - start
+        fresh.close()
+    return {
+        "reply_updates": updates,
+        "checkpoint_bytes_per_update": stats["bytes"] / updates,
+        "reducer_us_per_update": reducer_time / updates * 1e6,
+        "get_state_ms": restore_time / len(inquiries) * 1e3,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Full-dict vs. delta worker_replies channel"
+    )
+    parser.add_argument("-n", "--num-inquiries", type=int, default=20)
+    parser.add_argument("--snapshot-frequency", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+
+    inquiries = [
+        DEFAULT_INQUIRIES[i % len(DEFAULT_INQUIRIES)] for i in range(args.num_inquiries)
+    ]
+    report = {"full": bench(inquiries, None)}
+    for frequency in args.snapshot_frequency:
+        report[f"delta_{frequency}"] = bench(inquiries, frequency)
+    full = report["full"]["checkpoint_bytes_per_update"]
+    for name, result in report.items():
+        result["bytes_saved"] = 1 - result["checkpoint_bytes_per_update"] / full
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
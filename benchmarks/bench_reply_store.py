@@ -0,0 +1,107 @@
+"""Benchmark: batched columnar metrics vs. the per-object metric functions.
+
+    PYTHONPATH=. python -m benchmarks.bench_reply_store --runs 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.agents.supervisors.inquiry_supervisor import InquirySupervisor  # noqa: E402
+from src.agents.supervisors.reply_store import (  # noqa: E402
+    ReplyStore,
+    supervisor_metrics,
+    worker_metrics,
+)
+from src.agents.workers.inquiry_base import (  # noqa: E402
+    ALL_DIMENSIONS,
+    AnswerItem,
+    DimensionConnection,
+    SimilarityScore,
+    WorkerReply,
+    calculate_worker_metric,
+)
+
+
+def random_reply(rng: random.Random) -> WorkerReply:
+    n = rng.randint(0, 5)
+    types = [rng.choice("abc") for _ in range(n)]
+    return WorkerReply(
+        answers_list=[
+            AnswerItem(answer=f"answer {k}", answer_type=t, score=rng.random())
+            for k, t in enumerate(types)
+        ],
+        similarity_scores=[
+            SimilarityScore(i=i, j=j, score=rng.random())
+            for i in range(n)
+            for j in range(i + 1, n)
+            if types[i] == types[j]
+        ],
+        connections_list=[
+            DimensionConnection(i=i, dimension_name=rng.choice(ALL_DIMENSIONS))
+            for i in range(n)
+            for _ in range(rng.randint(0, 3))
+        ],
+    )
+
+
+def random_runs(num_runs: int, seed: int = 0) -> list[dict[str, WorkerReply]]:
+    rng = random.Random(seed)
+    return [{dim: random_reply(rng) for dim in ALL_DIMENSIONS} for _ in range(num_runs)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(num_runs: int) -> dict:
+    runs = random_runs(num_runs)
+    store, t_convert = timed(lambda: ReplyStore.from_runs(runs))
+
+    expected_workers, t_workers = timed(
+        lambda: [calculate_worker_metric(r) for run in runs for r in run.values()]
+    )
+    expected_supervisor, t_supervisor = timed(
+        lambda: [InquirySupervisor.calculate_metric(run) for run in runs]
+    )
+    workers, t_workers_vec = timed(lambda: worker_metrics(store))
+    supervisor, t_supervisor_vec = timed(lambda: supervisor_metrics(store))
+
+    assert np.allclose(workers, expected_workers)
+    assert np.allclose(supervisor, expected_supervisor)
+    return {
+        "replies": store.num_replies,
+        "from_runs": t_convert,
+        "worker_metric": {"per_object": t_workers, "columnar": t_workers_vec},
+        "supervisor_metric": {"per_object": t_supervisor, "columnar": t_supervisor_vec},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar metric benchmark")
+    parser.add_argument(
+        "--runs", type=int, default=2000, help="Number of 22-reply runs"
+    )
+    args = parser.parse_args()
+
+    results = run_benchmark(args.runs)
+    print(f"replies: {results['replies']}, conversion: {results['from_runs']:.3f}s")
+    for name in ["worker_metric", "supervisor_metric"]:
+        r = results[name]
+        print(
+            f"{name:<18} per-object {r['per_object']:.4f}s  "
+            f"columnar {r['columnar']:.4f}s  "
+            f"speedup {r['per_object'] / r['columnar']:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
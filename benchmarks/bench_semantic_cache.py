@@ -0,0 +1,140 @@
+"""Benchmark: semantic near-duplicate cache in front of the graph.
+
+Runs a stream of paraphrased inquiries (`--topics` topics, each asked in
+several phrasings, shuffled) through the graph against the `FakeLLM` backend,
+without and with a `SemanticCache`. Reports hit and seed rates, lookup latency,
+how often the LSH index finds the same neighbour as an exact scan, LLM calls
+and run latency.
+
+    PYTHONPATH=. python -m benchmarks.bench_semantic_cache -n 200 --seed-threshold 0.6
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from src.graphs.inquiry_bot import graph  # noqa: E402
+from src.graphs.semantic_cache import SemanticCache, embed  # noqa: E402
+from src.llms.fake_llm import FakeLLM  # noqa: E402
+from src.utils.stats import percentile  # noqa: E402
+
+TOPICS = [
+    "push-ups",
+    "sourdough bread",
+    "job interviews",
+    "cat behaviour",
+    "solar panels",
+    "learning Spanish",
+    "city cycling",
+    "sleep quality",
+    "saving money",
+    "houseplants",
+    "marathon training",
+    "home espresso",
+    "public speaking",
+    "composting",
+    "chess openings",
+]
+PHRASINGS = [
+    "How to get better at {}?",
+    "How do I get better at {}",
+    "Tips for {}?",
+    "What should beginners know about {}?",
+    "Beginner tips for {}",
+    "{}: common mistakes?",
+]
+
+
+def inquiries(n: int, topics: int, seed: int) -> list[tuple[str, str]]:
+    """(inquiry, topic) pairs."""
+    rng = random.Random(seed)
+    pairs = []
+    for _ in range(n):
+        topic = rng.choice(TOPICS[:topics])
+        pairs.append((rng.choice(PHRASINGS).format(topic), topic))
+    return pairs
+
+
+def exact_neighbour(inquiry: str, stored: list[str]) -> str | None:
+    if not stored:
+        return None
+    similarities = np.stack([embed(s) for s in stored]) @ embed(inquiry)
+    return stored[int(np.argmax(similarities))]
+
+
+def bench(
+    stream: list[tuple[str, str]], latency: float, cache: SemanticCache | None
+) -> dict:
+    run_times, llm_calls, same_neighbour, matches, wrong_topic = [], 0, 0, 0, 0
+    stored: dict[str, str] = {}  # inquiry -> topic
+    for i, (inquiry, topic) in enumerate(stream):
+        llm = FakeLLM(latency=latency, seed=i)
+        config = {
+            "configurable": {
+                "thread_id": f"semantic-bench-{i}-{cache is not None}",
+                "llm": llm,
+                "response_cache": None,
+                "semantic_cache": cache,
+            }
+        }
+        start = time.perf_counter()
+        state = graph.invoke({"inquiry": inquiry}, config)
+        run_times.append(time.perf_counter() - start)
+        llm_calls += llm.calls
+        if cache is not None and state.get("semantic_cache"):
+            neighbour = state["semantic_cache"]["inquiry"]
+            matches += 1
+            same_neighbour += neighbour == exact_neighbour(inquiry, list(stored))
+            wrong_topic += stored[neighbour] != topic
+        if (
+            cache is not None
+            and (state.get("semantic_cache") or {}).get("mode") != "hit"
+        ):
+            stored[inquiry] = topic
+    report = {
+        "llm_calls": llm_calls,
+        "run_p50": percentile(run_times, 50),
+        "run_p99": percentile(run_times, 99),
+        "total_time": sum(run_times),
+    }
+    if cache is not None:
+        report.update(cache.stats())
+        report["ann_agreement"] = same_neighbour / matches if matches else None
+        report["wrong_topic_matches"] = wrong_topic
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic near-duplicate cache")
+    parser.add_argument("-n", "--num-inquiries", type=int, default=200)
+    parser.add_argument("--topics", type=int, default=len(TOPICS))
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--seed-threshold", type=float, default=None)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    stream = inquiries(args.num_inquiries, args.topics, args.seed)
+    plain = bench(stream, args.latency, None)
+    cached = bench(
+        stream, args.latency, SemanticCache(args.threshold, args.seed_threshold)
+    )
+    report = {
+        "plain": plain,
+        "semantic_cache": cached,
+        "llm_calls_saved": 1 - cached["llm_calls"] / plain["llm_calls"],
+        "time_saved": 1 - cached["total_time"] / plain["total_time"],
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Load test: the inquiry service over HTTP against the offline backend.
+
+Starts an `InquiryService` on a local port with a `FakeLLM` and sends `-n`
+requests from `-c` concurrent clients. The inquiries are drawn from `--distinct`
+different texts, so concurrent duplicates are coalesced into one run. Reports
+request latency and time to first event percentiles, graph runs, coalesced
+and rejected (503) requests and LLM calls per request.
+
+    PYTHONPATH=. python -m benchmarks.bench_service -n 200 -c 32 --distinct 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from src.graphs.inquiry_bot import graph  # noqa: E402
+from src.llms.fake_llm import FakeLLM  # noqa: E402
+from src.server import InquiryService, start_server  # noqa: E402
+from src.utils.stats import percentile  # noqa: E402
+
+
+async def timed_request(host: str, port: int, inquiry: str) -> dict:
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps({"inquiry": inquiry}).encode("utf-8")
+    writer.write(
+        f"POST /inquiries HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split(b" ", 2)[1])
+    first_event = None
+    while line := await reader.readline():
+        if first_event is None and line.lstrip().startswith(b"{"):
+            first_event = time.perf_counter() - start
+    writer.close()
+    return {
+        "status": status,
+        "latency": time.perf_counter() - start,
+        "first_event": first_event,
+    }
+
+
+async def bench(args) -> dict:
+    llm = FakeLLM(latency=args.latency, jitter=args.jitter)
+    service = InquiryService(
+        graph,
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        config={"configurable": {"llm": llm, "response_cache": None}},
+    )
+    server = await start_server(service, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    rng = random.Random(args.seed)
+    inquiries = [
+        f"Inquiry {rng.randrange(args.distinct)}?" for _ in range(args.num_requests)
+    ]
+    pending = iter(inquiries)
+    results = []
+
+    async def client():
+        for inquiry in pending:
+            results.append(await timed_request("127.0.0.1", port, inquiry))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    wall_time = time.perf_counter() - start
+    await service.join()
+    server.close()
+
+    ok = [r for r in results if r["status"] == 200]
+    latencies = [r["latency"] for r in ok]
+    first_events = [r["first_event"] for r in ok]
+    stats = service.stats()
+    return {
+        "requests": len(results),
+        "ok": len(ok),
+        "rejected": stats["rejected"],
+        "runs": stats["runs"],
+        "coalesced": stats["coalesced"],
+        "llm_calls_per_request": llm.calls / max(1, len(ok)),
+        "throughput": len(ok) / wall_time,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p99": percentile(latencies, 99),
+        "first_event_p50": percentile(first_events, 50),
+        "first_event_p99": percentile(first_events, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test of the inquiry service")
+    parser.add_argument("-n", "--num-requests", type=int, default=200)
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=32, help="Concurrent clients"
+    )
+    parser.add_argument(
+        "--distinct", type=int, default=20, help="Number of different inquiries"
+    )
+    parser.add_argument(
+        "--max-concurrency", type=int, default=8, help="Graph runs at a time"
+    )
+    parser.add_argument("--max-queue", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(bench(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Benchmark: process startup cost of the CLI and the graph.
+
+Each measurement runs in a fresh interpreter (median of `--repeat` runs):
+
+- `interpreter`: `python -c pass`, the floor for everything else;
+- `cli_help`: `python src/cli.py --help`, wall time of the whole process;
+- `import_cli` / `import_graph_module`: importing `src.cli` / `src.graphs.inquiry_bot`;
+- `first_llm_request`: from the start of the script until the first LLM call of a
+  run starts (imports, graph compilation, client creation), fake backend.
+
+    PYTHONPATH=. python -m benchmarks.bench_startup --json startup.json
+    PYTHONPATH=. python -m benchmarks.bench_startup --baseline startup.json
+
+With `--baseline`, the script exits with status 1 if a measurement got slower than
+the baseline by more than `--tolerance` (relative) plus `--slack` seconds.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+"""
+
+FIRST_REQUEST_SCRIPT = """
+import time
+start = time.perf_counter()
+from src import cli
+from src.graphs.profiling import RunProfiler
+profiler = RunProfiler()
+config = {"configurable": {"thread_id": "startup", "profiler": profiler}}
+cli.get_graph().invoke({"inquiry": "Correct push-ups?"}, config)
+print(profiler.t0 + min(c.start for c in profiler.calls) - start)
+"""
+
+
+def child_env() -> dict:
+    return {
+        **os.environ,
+        "PYTHONPATH": ROOT,
+        "LLM_BACKEND": "fake",
+        "LLM_CACHE_SIZE": "0",
+        "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY", "unused"),
+    }
+
+
+def wall_time(args: list[str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(args, cwd=ROOT, env=child_env(), check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def reported_time(script: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env=child_env(),
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def measure(repeat: int) -> dict:
+    measurements = {
+        "interpreter": lambda: wall_time([sys.executable, "-c", "pass"]),
+        "cli_help": lambda: wall_time([sys.executable, "src/cli.py", "--help"]),
+        "import_cli": lambda: reported_time(IMPORT_SCRIPT.format(module="src.cli")),
+        "import_graph_module": lambda: reported_time(
+            IMPORT_SCRIPT.format(module="src.graphs.inquiry_bot")
+        ),
+        "first_llm_request": lambda: reported_time(FIRST_REQUEST_SCRIPT),
+    }
+    return {
+        name: statistics.median(run() for _ in range(repeat))
+        for name, run in measurements.items()
+    }
+
+
+def regressions(
+    results: dict, baseline: dict, tolerance: float, slack: float
+) -> list[str]:
+    return [
+        f"{name}: {results[name]:.3f}s (baseline {baseline[name]:.3f}s)"
+        for name in results
+        if name in baseline and results[name] > baseline[name] * (1 + tolerance) + slack
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Startup time of the CLI and the graph"
+    )
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    parser.add_argument(
+        "--baseline", help="Compare against the results in this JSON file"
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument(
+        "--slack", type=float, default=0.05, help="Absolute slack in seconds"
+    )
+    args = parser.parse_args()
+
+    results = measure(args.repeat)
+    for name, value in results.items():
+        print(f"{name:<22}{value:>8.3f}s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = regressions(results, json.load(f), args.tolerance, args.slack)
+        for line in slower:
+            print(f"REGRESSION {line}")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Offline load generator for the inquiry graph.
+
+Drives `graph.stream` for N inquiries at a chosen concurrency against the
+`FakeLLM` backend and reports wall time, per-node latency percentiles and LLM
+calls per inquiry.
+
+    PYTHONPATH=. python -m benchmarks.load_generator -n 50 -c 8 --latency 0.2
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from src.graphs.inquiry_bot import graph  # noqa: E402
+from src.llms.fake_llm import FakeLLM  # noqa: E402
+from src.llms.response_cache import ResponseCache  # noqa: E402
+from src.utils.stats import percentile  # noqa: E402
+
+NODES = ("prelim_nodes", "cross_nodes", "summarizer")
+
+DEFAULT_INQUIRIES = [
+    "Correct push-ups?",
+    "Healthier options than burger and fries",
+    "Research the current state of AI agents",
+    "How to prepare for a job interview?",
+    "Why do cats purr?",
+]
+
+
+def run_inquiry(
+    run_id: int,
+    inquiry: str,
+    llm_params: dict,
+    response_cache: ResponseCache | None = None,
+    merger_mode: str | None = None,
+) -> dict:
+    """Stream one inquiry through the graph and time each node update."""
+    llm = FakeLLM(**{**llm_params, "seed": llm_params.get("seed", 0) + run_id})
+    config = {
+        "configurable": {
+            # a fresh thread per run, also when run_load is called repeatedly in
+            # one process
+            "thread_id": f"loadgen-{uuid.uuid4().hex}-{run_id}",
+            "llm": llm,
+            "response_cache": response_cache,
+            "merger_mode": merger_mode,
+        }
+    }
+    timings = {node: [] for node in NODES}
+    cross_loops = []
+    start = last = time.perf_counter()
+    error = None
+    try:
+        for event in graph.stream({"inquiry": inquiry}, config):
+            now = time.perf_counter()
+            for node, update in event.items():
+                if node in timings:
+                    timings[node].append(now - last)
+                if (update or {}).get("cross_timing"):
+                    cross_loops.append(update["cross_timing"])
+            last = now
+    except Exception as e:
+        error = repr(e)
+    return {
+        "run_id": run_id,
+        "inquiry": inquiry,
+        "wall_time": time.perf_counter() - start,
+        "node_timings": timings,
+        "cross_loops": cross_loops,
+        "llm_calls": llm.calls,
+        "error": error,
+    }
+
+
+def run_load(
+    n: int,
+    concurrency: int,
+    llm_params: dict,
+    inquiries: list[str] | None = None,
+    response_cache: ResponseCache | None = None,
+    merger_mode: str | None = None,
+) -> dict:
+    """Run `n` inquiries with up to `concurrency` graph runs in flight."""
+    inquiries = inquiries or DEFAULT_INQUIRIES
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [
+            executor.submit(
+                run_inquiry,
+                i,
+                inquiries[i % len(inquiries)],
+                llm_params,
+                response_cache,
+                merger_mode,
+            )
+            for i in range(n)
+        ]
+        runs = [future.result() for future in as_completed(futures)]
+    wall_time = time.perf_counter() - start
+    report = summarize_runs(runs, wall_time, concurrency)
+    if response_cache is not None:
+        report["response_cache"] = response_cache.stats()
+    return report
+
+
+def summarize_runs(runs: list[dict], wall_time: float, concurrency: int) -> dict:
+    ok = [r for r in runs if r["error"] is None]
+    report = {
+        "inquiries": len(runs),
+        "failed": len(runs) - len(ok),
+        "concurrency": concurrency,
+        "wall_time": wall_time,
+        "throughput": len(ok) / wall_time if wall_time else 0.0,
+        "llm_calls_per_inquiry": (
+            sum(r["llm_calls"] for r in ok) / len(ok) if ok else 0.0
+        ),
+        "run": _percentiles([r["wall_time"] for r in ok]),
+        "nodes": {},
+    }
+    for node in NODES:
+        samples = [t for r in ok for t in r["node_timings"][node]]
+        report["nodes"][node] = _percentiles(samples)
+    # pipelined cross loop vs. a stage barrier between cross and merge calls
+    loops = [loop for r in ok for loop in r["cross_loops"]]
+    report["cross_critical_path"] = {
+        "loop_time": _percentiles([loop["loop_time"] for loop in loops]),
+        "max_cross_plus_merge": _percentiles(
+            [loop["max_cross_plus_merge"] for loop in loops]
+        ),
+        "max_cross_plus_max_merge": _percentiles(
+            [loop["max_cross_plus_max_merge"] for loop in loops]
+        ),
+    }
+    return report
+
+
+def _percentiles(samples: list[float]) -> dict:
+    return {
+        "count": len(samples),
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"Inquiries: {report['inquiries']} (failed: {report['failed']}), "
+        f"concurrency: {report['concurrency']}"
+    )
+    print(
+        f"Wall time: {report['wall_time']:.3f}s, "
+        f"throughput: {report['throughput']:.2f} inquiries/s, "
+        f"LLM calls per inquiry: {report['llm_calls_per_inquiry']:.1f}"
+    )
+    print(f"\n{'stage':<14}{'count':>7}{'p50 [s]':>10}{'p95 [s]':>10}{'p99 [s]':>10}")
+    rows = [("run", report["run"])] + list(report["nodes"].items())
+    for name, stats in rows:
+        print(
+            f"{name:<14}{stats['count']:>7}{stats['p50']:>10.3f}"
+            f"{stats['p95']:>10.3f}{stats['p99']:>10.3f}"
+        )
+    print("\ncross loop critical path")
+    for name, stats in report["cross_critical_path"].items():
+        print(
+            f"{name:<26}{stats['count']:>7}{stats['p50']:>10.3f}"
+            f"{stats['p95']:>10.3f}{stats['p99']:>10.3f}"
+        )
+    if "response_cache" in report:
+        print(f"\nResponse cache: {report['response_cache']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Offline load generator for the inquiry graph"
+    )
+    parser.add_argument("-n", "--num-inquiries", type=int, default=20)
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Mean LLM latency [s]"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.02, help="Latency std. deviation [s]"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Share an in-memory response cache across runs",
+    )
+    parser.add_argument(
+        "--merger-mode",
+        choices=["llm", "local", "hybrid"],
+        help="Overrides MERGER_MODE",
+    )
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    args = parser.parse_args()
+
+    llm_params = {
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "seed": args.seed,
+    }
+    response_cache = ResponseCache() if args.cache else None
+    report = run_load(
+        args.num_inquiries,
+        args.concurrency,
+        llm_params,
+        response_cache=response_cache,
+        merger_mode=args.merger_mode,
+    )
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
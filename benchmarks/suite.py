@@ -0,0 +1,271 @@
+"""Benchmark suite: hot paths and full-graph runs, gated against stored baselines.
+
+Micro benchmarks (best of `--repeat` rounds, seconds per call):
+`render_prompt` of a prelim and a cross call, `calculate_worker_metric`, the
+supervisor metric, the `worker_replies` reducers (`merge_dict`,
+`merge_replies`) and a `SQLiteCheckpointer` put / get of a state with 22
+replies. Graph benchmarks: `graph.stream` against the `FakeLLM` backend at
+several concurrency levels and latency distributions (p50/p99 run time).
+Everything runs offline.
+
+    PYTHONPATH=. python -m benchmarks.suite                    # compare to baselines
+    PYTHONPATH=. python -m benchmarks.suite --update-baseline  # record baselines
+    PYTHONPATH=. python -m benchmarks.suite --only micro --quick
+
+A benchmark regresses if it got slower than its baseline by more than
+`--tolerance` (relative); the script then exits with status 1. Micro
+benchmarks are compared relative to a reference Python loop timed in the same
+process (`calibration`), so a uniformly slower or busier machine doesn't trip
+the gate; graph runs are dominated by the simulated LLM latency and compared
+as they are. Baselines are still best recorded on the machine that runs the
+gate.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+from langgraph.checkpoint.base import empty_checkpoint  # noqa: E402
+
+from benchmarks.bench_reply_store import random_runs  # noqa: E402
+from benchmarks.load_generator import run_load  # noqa: E402
+from src.agents.supervisors.inquiry_supervisor import InquirySupervisor  # noqa: E402
+from src.agents.workers.inquiry_base import calculate_worker_metric  # noqa: E402
+from src.graphs.checkpointing import SQLiteCheckpointer  # noqa: E402
+from src.graphs.inquiry_bot import (  # noqa: E402
+    collect_cross_inputs,
+    get_worker_class,
+    merge_dict,
+    merge_replies,
+    render_cross_prompt,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "suite.json")
+INQUIRY = "How to prepare for a job interview?"
+
+# FakeLLM parameters of the graph benchmarks
+LATENCY_DISTRIBUTIONS = {
+    "constant": {"latency": 0.01, "jitter": 0.0},
+    "jitter": {"latency": 0.01, "jitter": 0.01},
+    "heavy_tail": {
+        "latency": 0.01,
+        "jitter": 0.005,
+        "slow_rate": 0.05,
+        "slow_factor": 10.0,
+    },
+}
+CONCURRENCY_LEVELS = (1, 4, 16)
+
+
+def per_call(fn, number: int, repeat: int) -> float:
+    """Best time per call over `repeat` rounds of `number` calls, like timeit."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def calibration() -> float:
+    """Best time of a fixed pure-Python loop, the unit of the micro benchmarks."""
+    return per_call(lambda: sum(i * i for i in range(20_000)), 1, 7)
+
+
+def checkpoint_roundtrip(saver: SQLiteCheckpointer, replies: dict):
+    def roundtrip():
+        checkpoint = empty_checkpoint()
+        checkpoint["channel_values"] = {"inquiry": INQUIRY, "worker_replies": replies}
+        config = {"configurable": {"thread_id": "suite", "checkpoint_ns": ""}}
+        config = saver.put(config, checkpoint, {"source": "loop", "step": 1}, {})
+        saver.get_tuple(config)
+
+    return roundtrip
+
+
+def micro_benchmarks(quick: bool) -> dict:
+    number, repeat = (20, 3) if quick else (200, 5)
+    previous, current = random_runs(2, seed=0)
+    state = {"inquiry": INQUIRY, "worker_replies": previous, "deactivated_workers": []}
+    to_dim, answers = next(iter(collect_cross_inputs(state).items()))
+    config = {
+        "configurable": {
+            "thread_id": f"suite-{uuid.uuid4().hex}",
+            "context_compactor": None,
+        }
+    }
+    worker_class = get_worker_class("Content")
+    reply = max(previous.values(), key=lambda r: len(r.answers_list))
+    saver = SQLiteCheckpointer(keep_latest_only=True)
+    results = {
+        "render_prompt.prelim": per_call(
+            lambda: worker_class.render_prompt(inquiry=INQUIRY), number, repeat
+        ),
+        "render_prompt.cross": per_call(
+            lambda: render_cross_prompt(state, to_dim, answers, config), number, repeat
+        ),
+        "calculate_worker_metric": per_call(
+            lambda: calculate_worker_metric(reply), number * 10, repeat
+        ),
+        "supervisor_metric": per_call(
+            lambda: InquirySupervisor.calculate_metric(previous), number, repeat
+        ),
+        "merge_dict": per_call(
+            lambda: merge_dict(previous, current), number * 10, repeat
+        ),
+        "merge_replies": per_call(
+            lambda: merge_replies(previous, [current]), number * 10, repeat
+        ),
+        "checkpoint.put_get": per_call(
+            checkpoint_roundtrip(saver, previous), number, repeat
+        ),
+    }
+    saver.close()
+    return {f"micro.{name}": value for name, value in results.items()}
+
+
+def graph_benchmarks(quick: bool) -> dict:
+    results = {}
+    for name, llm_params in LATENCY_DISTRIBUTIONS.items():
+        for concurrency in CONCURRENCY_LEVELS:
+            n = max(concurrency, 4) if quick else max(2 * concurrency, 10)
+            report = run_load(n, concurrency, {**llm_params, "seed": 0})
+            if report["failed"]:
+                raise RuntimeError(
+                    f"{report['failed']} graph runs failed ({name}, c={concurrency})"
+                )
+            results[f"graph.{name}.c{concurrency}.p50"] = report["run"]["p50"]
+            results[f"graph.{name}.c{concurrency}.p99"] = report["run"]["p99"]
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[dict]:
+    rows = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        change = value / base - 1 if base else None
+        if (
+            change is not None
+            and name.startswith("micro.")
+            and "calibration" in baseline
+        ):
+            change = (value / results["calibration"]) / (
+                base / baseline["calibration"]
+            ) - 1
+        rows.append(
+            {
+                "name": name,
+                "value": value,
+                "baseline": base,
+                "change": change,
+                "regression": change is not None
+                and change > tolerance
+                and name != "calibration",
+            }
+        )
+    return rows
+
+
+def format_time(seconds: float | None) -> str:
+    if seconds is None:
+        return "-"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark suite with regression gates"
+    )
+    parser.add_argument("--only", choices=["micro", "graph"], help="Run only one group")
+    parser.add_argument(
+        "--quick", action="store_true", help="Fewer rounds and runs (noisier)"
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline JSON file")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Write the results as new baselines",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.5, help="Allowed relative slowdown"
+    )
+    parser.add_argument("--json", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    random.seed(0)
+    results = {}
+    if args.only in (None, "micro"):
+        results["calibration"] = calibration()
+        results.update(micro_benchmarks(args.quick))
+    if args.only in (None, "graph"):
+        results.update(graph_benchmarks(args.quick))
+
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            stored = json.load(f)
+    if stored and stored.get("environment") != environment():
+        print(
+            f"Note: baselines were recorded on {stored.get('environment')}, "
+            f"this is {environment()}"
+        )
+    rows = compare(results, stored.get("results", {}), args.tolerance)
+
+    print(f"{'benchmark':<36}{'baseline':>12}{'current':>12}{'change':>9}")
+    for row in rows:
+        change = f"{row['change']:+.0%}" if row["change"] is not None else "new"
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<36}{format_time(row['baseline']):>12}"
+            f"{format_time(row['value']):>12}{change:>9}{flag}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {"environment": environment(), "results": results, "comparison": rows},
+                f,
+                indent=2,
+            )
+    if args.update_baseline:
+        merged = {**stored.get("results", {}), **results}
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(
+                {"environment": environment(), "results": merged},
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+            f.write("\n")
+        print(f"Baselines written to {args.baseline}")
+        return
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
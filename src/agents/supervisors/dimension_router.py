@@ -0,0 +1,213 @@
+import json
+import math
+import os
+
+from typing import Callable
+
+import numpy as np
+
+from src.agents.workers.inquiry_base import BaseInquiryWorker
+from src.agents.workers.registry import create_worker_registry
+from src.agents.workers.similarity import hashed_ngram_counts
+
+
+def supervisor_metric(worker_metrics: dict[str, float]) -> float:
+    """`InquirySupervisor.calculate_metric` from per-dimension worker metrics."""
+    num_with_answer = sum(1 for metric in worker_metrics.values() if metric > 0)
+    return math.sqrt(num_with_answer) + sum(worker_metrics.values())
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+class DimensionRouter:
+    """Local, LLM-free selection of the dimensions worth a prelim call.
+
+    Every dimension gets an expected `calculate_worker_metric` for the inquiry:
+
+    - after `fit`: the similarity-weighted mean metric of the dimension over
+      the `k` most similar past inquiries (character n-gram TF-IDF, cosine);
+    - without history: the similarity between the inquiry and the dimension's
+      definition (primary focus, contextual utility, answer types).
+
+    Dimensions are taken by expected metric until `recall` of the total
+    expected metric is covered, but at least `min_dimensions`. If nothing is
+    similar enough (below `min_similarity`), all dimensions are routed.
+    `dimensions` and `get_worker_class` (dimension -> worker class) come from
+    a worker registry; by default a new one with the built-in and plugin
+    workers.
+    """
+
+    def __init__(
+        self,
+        dimensions: list[str] | None = None,
+        recall: float = 0.9,
+        min_dimensions: int = 3,
+        k: int = 5,
+        min_similarity: float = 0.1,
+        get_worker_class: Callable[[str], type[BaseInquiryWorker]] | None = None,
+    ):
+        if not 0.0 < recall <= 1.0:
+            raise ValueError(f"recall must be in (0, 1], got {recall}")
+        if not dimensions or get_worker_class is None:
+            registry = create_worker_registry()
+            dimensions = dimensions or registry.dimensions
+            get_worker_class = get_worker_class or registry.get
+        self.dimensions = list(dimensions)
+        self.get_worker_class = get_worker_class
+        self.recall = recall
+        self.min_dimensions = min_dimensions
+        self.k = k
+        self.min_similarity = min_similarity
+        self._idf = None
+        self._history = None  # normalized TF-IDF rows of past inquiries
+        self._metrics = None  # (num past inquiries, num dimensions)
+        self._definitions = None
+
+    @property
+    def fitted(self) -> bool:
+        return self._history is not None
+
+    def _vectorize(self, texts: list[str]) -> np.ndarray:
+        counts = hashed_ngram_counts(texts)
+        return _normalize(counts * self._idf if self._idf is not None else counts)
+
+    def fit(self, inquiries: list[str], worker_metrics: list[dict[str, float]]) -> "DimensionRouter":
+        """Learn from past runs: one dict of per-dimension worker metrics per inquiry.
+
+        A dimension missing from a run counts as metric 0.
+        """
+        counts = hashed_ngram_counts(inquiries)
+        df = np.count_nonzero(counts, axis=0)
+        self._idf = np.log((1 + len(inquiries)) / (1 + df)) + 1.0
+        self._history = _normalize(counts * self._idf)
+        self._metrics = np.array(
+            [[metrics.get(dim, 0.0) for dim in self.dimensions] for metrics in worker_metrics],
+            dtype=np.float64,
+        ).reshape(len(inquiries), len(self.dimensions))
+        return self
+
+    @classmethod
+    def from_batch_results(cls, path: str, **kwargs) -> "DimensionRouter":
+        """Fit on the JSONL output of the CLI batch mode (failed records are ignored)."""
+        inquiries, worker_metrics = [], []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if result.get("error") or not result.get("metrics"):
+                    continue
+                inquiries.append(result["inquiry"])
+                worker_metrics.append(result["metrics"]["workers"])
+        return cls(**kwargs).fit(inquiries, worker_metrics)
+
+    def _definition_vectors(self) -> np.ndarray:
+        if self._definitions is None:
+            texts = []
+            for dim in self.dimensions:
+                worker = self.get_worker_class(dim)
+                texts.append(
+                    f"{dim} {worker.primary_focus} {worker.contextual_utility} "
+                    f"{' '.join(worker.answer_types)}"
+                )
+            if self._idf is None:
+                # without history, weight n-grams by their rarity among the definitions
+                df = np.count_nonzero(hashed_ngram_counts(texts), axis=0)
+                self._idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+            self._definitions = self._vectorize(texts)
+        return self._definitions
+
+    def expected_metrics(self, inquiry: str) -> tuple[dict[str, float], str]:
+        """Expected metric per dimension and its source: "stats", "keyword" or "none"."""
+        if not self.fitted:
+            self._definition_vectors()  # sets the idf weights used for the query
+        query = self._vectorize([inquiry])[0]
+        if self.fitted and len(self._history):
+            similarity = self._history @ query
+            nearest = np.argsort(-similarity)[: self.k]
+            weights = similarity[nearest]
+            if weights.max() >= self.min_similarity:
+                expected = weights @ self._metrics[nearest] / weights.sum()
+                return dict(zip(self.dimensions, expected.tolist())), "stats"
+        similarity = self._definition_vectors() @ query
+        if similarity.max() >= self.min_similarity:
+            return dict(zip(self.dimensions, similarity.tolist())), "keyword"
+        return {dim: 0.0 for dim in self.dimensions}, "none"
+
+    def route(self, inquiry: str) -> dict:
+        """Pick the dimensions for `inquiry`; see the class docstring."""
+        expected, source = self.expected_metrics(inquiry)
+        total = sum(max(value, 0.0) for value in expected.values())
+        if source == "none" or total <= 0:
+            selected = list(self.dimensions)
+        else:
+            ranked = sorted(self.dimensions, key=lambda dim: -expected[dim])
+            selected, covered = [], 0.0
+            for dim in ranked:
+                if covered >= self.recall * total and len(selected) >= self.min_dimensions:
+                    break
+                selected.append(dim)
+                covered += max(expected[dim], 0.0)
+            selected = [dim for dim in self.dimensions if dim in selected]  # stable order
+        return {
+            "selected": selected,
+            "skipped": [dim for dim in self.dimensions if dim not in selected],
+            "fallback": len(selected) == len(self.dimensions),
+            "source": source,
+            "calls_saved": len(self.dimensions) - len(selected),
+        }
+
+    def evaluate(self, inquiries: list[str], worker_metrics: list[dict[str, float]]) -> dict:
+        """Calls saved and supervisor metric lost against the full fan-out.
+
+        `worker_metrics` are the metrics of full fan-out runs (e.g. held-out
+        batch results); routed runs are approximated by dropping the skipped
+        dimensions.
+        """
+        calls_full = calls_routed = 0
+        metric_full = metric_routed = 0.0
+        for inquiry, metrics in zip(inquiries, worker_metrics):
+            decision = self.route(inquiry)
+            calls_full += len(self.dimensions)
+            calls_routed += len(decision["selected"])
+            metric_full += supervisor_metric(metrics)
+            metric_routed += supervisor_metric(
+                {dim: metrics.get(dim, 0.0) for dim in decision["selected"]}
+            )
+        return {
+            "inquiries": len(inquiries),
+            "calls_full": calls_full,
+            "calls_routed": calls_routed,
+            "calls_saved": calls_full - calls_routed,
+            "metric_full": metric_full,
+            "metric_routed": metric_routed,
+            "metric_loss": (metric_full - metric_routed) / metric_full if metric_full else 0.0,
+        }
+
+
+def create_dimension_router(
+    dimensions: list[str] | None = None,
+    get_worker_class: Callable[[str], type[BaseInquiryWorker]] | None = None,
+) -> DimensionRouter | None:
+    """Create the process-wide router from `DIMENSION_ROUTER*` env vars.
+
+    `DIMENSION_ROUTER=1` enables routing; `DIMENSION_ROUTER_HISTORY` points to
+    batch results to learn from, otherwise the keyword model is used. The graph
+    passes the dimensions and worker classes of its registry.
+    """
+    if os.getenv("DIMENSION_ROUTER", "0") != "1":
+        return None
+    kwargs = {
+        "recall": float(os.getenv("DIMENSION_ROUTER_RECALL", "0.9")),
+        "min_dimensions": int(os.getenv("DIMENSION_ROUTER_MIN_DIMENSIONS", "3")),
+        "dimensions": dimensions,
+        "get_worker_class": get_worker_class,
+    }
+    history = os.getenv("DIMENSION_ROUTER_HISTORY")
+    if history:
+        return DimensionRouter.from_batch_results(history, **kwargs)
+    return DimensionRouter(**kwargs)
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.agents.workers.inquiry_base import (
+    AnswerItem,
+    DimensionConnection,
+    SimilarityScore,
+    WorkerReply,
+)
+
+
+def _offsets(lengths: list[int]) -> np.ndarray:
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def _segment_ids(offsets: np.ndarray) -> np.ndarray:
+    # segment index of every element, e.g. offsets [0, 2, 2, 3] -> [0, 0, 2]
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def _encode(values: list[str], vocabulary: dict[str, int]) -> np.ndarray:
+    return np.fromiter(
+        (vocabulary.setdefault(v, len(vocabulary)) for v in values),
+        dtype=np.int32,
+        count=len(values),
+    )
+
+
+@dataclass
+class ReplyStore:
+    """Columnar representation of many `WorkerReply` objects.
+
+    Answers, similarity scores and connections of all replies are stored in
+    flat arrays; `*_offsets[r]:*_offsets[r + 1]` is the slice of reply `r`.
+    Replies can optionally be grouped into runs (one dict of replies per
+    inquiry) via `run_offsets`, which is what the supervisor metric needs.
+    """
+
+    answer_offsets: np.ndarray
+    answer_scores: np.ndarray
+    answer_type_codes: np.ndarray
+    answer_texts: np.ndarray
+    answer_types: list[str]
+    similarity_offsets: np.ndarray
+    similarity_i: np.ndarray
+    similarity_j: np.ndarray
+    similarity_scores: np.ndarray
+    connection_offsets: np.ndarray
+    connection_i: np.ndarray
+    connection_dim_codes: np.ndarray
+    dimensions: list[str]
+    run_offsets: np.ndarray
+    reply_dim_codes: np.ndarray
+
+    @property
+    def num_replies(self) -> int:
+        return len(self.answer_offsets) - 1
+
+    @property
+    def num_runs(self) -> int:
+        return len(self.run_offsets) - 1
+
+    @property
+    def answer_counts(self) -> np.ndarray:
+        return np.diff(self.answer_offsets)
+
+    @property
+    def connection_counts(self) -> np.ndarray:
+        return np.diff(self.connection_offsets)
+
+    @classmethod
+    def from_replies(cls, replies: list[WorkerReply]) -> "ReplyStore":
+        """One run per reply, without dimension names."""
+        return cls.from_runs([{"": reply} for reply in replies])
+
+    @classmethod
+    def from_runs(cls, runs: list[dict[str, WorkerReply]]) -> "ReplyStore":
+        replies = [reply for run in runs for reply in run.values()]
+        answers = [a for reply in replies for a in reply.answers_list]
+        sims = [s for reply in replies for s in reply.similarity_scores]
+        conns = [c for reply in replies for c in reply.connections_list]
+        answer_types, dimensions = {}, {}
+        answer_type_codes = _encode([a.answer_type for a in answers], answer_types)
+        # reply and connection dimension names share one vocabulary
+        connection_dim_codes = _encode([c.dimension_name for c in conns], dimensions)
+        reply_dim_codes = _encode([dim for run in runs for dim in run], dimensions)
+        return cls(
+            answer_offsets=_offsets([len(r.answers_list) for r in replies]),
+            answer_scores=np.fromiter((a.score for a in answers), np.float64, len(answers)),
+            answer_type_codes=answer_type_codes,
+            answer_texts=np.array([a.answer for a in answers], dtype=object),
+            answer_types=list(answer_types),
+            similarity_offsets=_offsets([len(r.similarity_scores) for r in replies]),
+            similarity_i=np.fromiter((s.i for s in sims), np.int32, len(sims)),
+            similarity_j=np.fromiter((s.j for s in sims), np.int32, len(sims)),
+            similarity_scores=np.fromiter((s.score for s in sims), np.float64, len(sims)),
+            connection_offsets=_offsets([len(r.connections_list) for r in replies]),
+            connection_i=np.fromiter((c.i for c in conns), np.int32, len(conns)),
+            connection_dim_codes=connection_dim_codes,
+            dimensions=list(dimensions),
+            run_offsets=_offsets([len(run) for run in runs]),
+            reply_dim_codes=reply_dim_codes,
+        )
+
+    def to_reply(self, r: int) -> WorkerReply:
+        a0, a1 = self.answer_offsets[r], self.answer_offsets[r + 1]
+        s0, s1 = self.similarity_offsets[r], self.similarity_offsets[r + 1]
+        c0, c1 = self.connection_offsets[r], self.connection_offsets[r + 1]
+        return WorkerReply(
+            answers_list=[
+                AnswerItem(
+                    answer=self.answer_texts[k],
+                    answer_type=self.answer_types[self.answer_type_codes[k]],
+                    score=float(self.answer_scores[k]),
+                )
+                for k in range(a0, a1)
+            ],
+            similarity_scores=[
+                SimilarityScore(
+                    i=int(self.similarity_i[k]),
+                    j=int(self.similarity_j[k]),
+                    score=float(self.similarity_scores[k]),
+                )
+                for k in range(s0, s1)
+            ],
+            connections_list=[
+                DimensionConnection(
+                    i=int(self.connection_i[k]),
+                    dimension_name=self.dimensions[self.connection_dim_codes[k]],
+                )
+                for k in range(c0, c1)
+            ],
+        )
+
+    def to_replies(self) -> list[WorkerReply]:
+        return [self.to_reply(r) for r in range(self.num_replies)]
+
+    def to_runs(self) -> list[dict[str, WorkerReply]]:
+        return [
+            {
+                self.dimensions[self.reply_dim_codes[r]]: self.to_reply(r)
+                for r in range(self.run_offsets[g], self.run_offsets[g + 1])
+            }
+            for g in range(self.num_runs)
+        ]
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            **{
+                k: v
+                for k, v in vars(self).items()
+                if isinstance(v, np.ndarray) and k != "answer_texts"
+            },
+            answer_texts_str=self.answer_texts.astype(str),
+            answer_types=np.array(self.answer_types, dtype=str),
+            dimensions=np.array(self.dimensions, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "ReplyStore":
+        with np.load(path, allow_pickle=False) as data:
+            fields = {k: data[k] for k in data.files if k != "answer_texts"}
+        fields["answer_texts"] = fields.pop("answer_texts_str").astype(object)
+        fields["answer_types"] = fields["answer_types"].tolist()
+        fields["dimensions"] = fields["dimensions"].tolist()
+        return cls(**fields)
+
+
+def worker_metrics(store: ReplyStore) -> np.ndarray:
+    """Vectorized `calculate_worker_metric` for every reply in the store."""
+    n = store.num_replies
+    a_len = store.answer_counts.astype(np.float64)
+    b_len = np.diff(store.similarity_offsets).astype(np.float64)
+    sum_relevance = np.bincount(
+        _segment_ids(store.answer_offsets), weights=store.answer_scores, minlength=n
+    )
+    sum_similarity = np.bincount(
+        _segment_ids(store.similarity_offsets), weights=store.similarity_scores, minlength=n
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_relevance = sum_relevance / a_len
+        mean_similarity = np.where(b_len > 0, sum_similarity / np.maximum(b_len, 1), 0.0)
+        avg_connections = store.connection_counts / a_len
+        metric = np.sqrt(a_len) + mean_relevance - mean_similarity + avg_connections
+    return np.where(a_len > 0, metric, 0.0)
+
+
+def supervisor_metrics(store: ReplyStore) -> np.ndarray:
+    """Vectorized `InquirySupervisor.calculate_metric` for every run in the store."""
+    runs = _segment_ids(store.run_offsets)
+    num_with_answer = np.bincount(
+        runs, weights=(store.answer_counts > 0).astype(np.float64), minlength=store.num_runs
+    )
+    sum_metrics = np.bincount(runs, weights=worker_metrics(store), minlength=store.num_runs)
+    return np.sqrt(num_with_answer) + sum_metrics
@@ -0,0 +1,69 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class StoppingPolicy:
+    """When to stop the cross-node loop of one inquiry.
+
+    Checked after prelim_nodes (budgets only) and after every cross loop, in
+    this order; the first reason that applies is recorded as `stop_reason`:
+
+    - "latency_budget": `latency_budget` seconds since the run started
+    - "token_budget": `token_budget` (estimated) tokens spent
+    - "max_loops": `max_loops` cross loops done
+    - "converged": relative gain of `InquirySupervisor.calculate_metric`
+      below `min_relative_gain`
+    - "no_new_connections": the next loop would only resend connections
+      that were already delivered
+    """
+
+    max_loops: int = 3
+    min_relative_gain: float | None = 0.02
+    stop_without_new_connections: bool = True
+    latency_budget: float | None = None
+    token_budget: int | None = None
+
+    def budget_exhausted(self, elapsed: float, tokens_used: int) -> str | None:
+        if self.latency_budget is not None and elapsed >= self.latency_budget:
+            return "latency_budget"
+        if self.token_budget is not None and tokens_used >= self.token_budget:
+            return "token_budget"
+        return None
+
+    def stop_reason(
+        self,
+        loop_count: int,
+        previous_metric: float,
+        metric: float,
+        new_connections: int,
+        elapsed: float,
+        tokens_used: int,
+    ) -> str | None:
+        """Reason to stop after cross loop number `loop_count`, or None to continue."""
+        if reason := self.budget_exhausted(elapsed, tokens_used):
+            return reason
+        if loop_count >= self.max_loops:
+            return "max_loops"
+        if self.min_relative_gain is not None:
+            gain = (metric - previous_metric) / previous_metric if previous_metric else 1.0
+            if gain < self.min_relative_gain:
+                return "converged"
+        if self.stop_without_new_connections and new_connections == 0:
+            return "no_new_connections"
+        return None
+
+
+def create_stopping_policy() -> StoppingPolicy:
+    """Create the process-wide policy from `STOP_*` env vars."""
+    min_gain = os.getenv("STOP_MIN_GAIN", "0.02")
+    latency_budget = os.getenv("STOP_LATENCY_BUDGET")
+    token_budget = os.getenv("STOP_TOKEN_BUDGET")
+    return StoppingPolicy(
+        max_loops=int(os.getenv("STOP_MAX_LOOPS", "3")),
+        # STOP_MIN_GAIN="" disables the convergence check
+        min_relative_gain=float(min_gain) if min_gain else None,
+        stop_without_new_connections=os.getenv("STOP_WITHOUT_NEW_CONNECTIONS", "1") == "1",
+        latency_budget=float(latency_budget) if latency_budget else None,
+        token_budget=int(token_budget) if token_budget else None,
+    )
@@ -0,0 +1,82 @@
+import json
+import os
+from dataclasses import dataclass
+
+from src.llms.usage import estimate_tokens
+
+from .local_reply_merger import text_similarity
+
+CONTEXT_HEADER = "score | type | from | answer"
+
+
+@dataclass
+class ContextCompactor:
+    """Shrinks the answers `cross_nodes` sends to a dimension as additional context.
+
+    Near-identical answers (`text_similarity` above `similarity_threshold`)
+    from several source dimensions are sent once, with all their sources.
+    The rest are ranked by score and cut to `max_answers` and `token_budget`
+    (estimated tokens, at least one answer is kept). Instead of JSON, every
+    answer is one `score | type | from | answer` line; the order depends only
+    on the answers, so identical inputs render identical prompts (and hit the
+    response cache).
+    """
+
+    max_answers: int = 8
+    token_budget: int = 300
+    similarity_threshold: float = 0.8
+
+    def dedupe(self, answers: list[dict]) -> list[dict]:
+        kept: list[dict] = []
+        ranked = sorted(answers, key=lambda a: (-a["score"], a["answer"], a["from_dim"]))
+        for answer in ranked:
+            for other in kept:
+                if other["answer_type"] == answer["answer_type"] and (
+                    text_similarity(other["answer"], answer["answer"]) > self.similarity_threshold
+                ):
+                    if answer["from_dim"] not in other["from_dims"]:
+                        other["from_dims"].append(answer["from_dim"])
+                    break
+            else:
+                kept.append({**answer, "from_dims": [answer["from_dim"]]})
+        return kept
+
+    @staticmethod
+    def encode_line(answer: dict) -> str:
+        text = " ".join(answer["answer"].split())
+        return f"{answer['score']:.2f} | {answer['answer_type']} | {','.join(answer['from_dims'])} | {text}"
+
+    def compact(self, answers: list[dict]) -> tuple[str, dict]:
+        """Return the compact context and its token stats (`raw` is the JSON it replaces)."""
+        lines = [CONTEXT_HEADER]
+        tokens = estimate_tokens(CONTEXT_HEADER)
+        kept = 0
+        for answer in self.dedupe(answers)[: self.max_answers]:
+            line = self.encode_line(answer)
+            line_tokens = estimate_tokens(line)
+            if kept and tokens + line_tokens > self.token_budget:
+                break
+            lines.append(line)
+            tokens += line_tokens
+            kept += 1
+        context = "\n".join(lines)
+        return context, {
+            "answers": len(answers),
+            "kept": kept,
+            "raw_tokens": estimate_tokens(json.dumps(answers)),
+            "tokens": estimate_tokens(context),
+        }
+
+
+def create_context_compactor() -> ContextCompactor | None:
+    """Create the process-wide compactor from `CONTEXT_*` env vars.
+
+    `CONTEXT_COMPACTION=1` enables it; otherwise the answers are sent as JSON.
+    """
+    if os.getenv("CONTEXT_COMPACTION", "0") != "1":
+        return None
+    return ContextCompactor(
+        max_answers=int(os.getenv("CONTEXT_MAX_ANSWERS", "8")),
+        token_budget=int(os.getenv("CONTEXT_TOKEN_BUDGET", "300")),
+        similarity_threshold=float(os.getenv("CONTEXT_DEDUPE_THRESHOLD", "0.8")),
+    )
@@ -1,8 +1,10 @@
 import math
-import jinja2
+from functools import lru_cache
 from pydantic import BaseModel, Field
 from typing import ClassVar, List
 
+from src.agents.workers import prompt_engine
+
 
 class AnswerItem(BaseModel):
     answer: str = Field(description="The short precise answer.")
@@ -97,10 +99,13 @@ Process the following human inquiry step by step:
     - compute the relevance score between the answer and inquiry given the "{{ dimension }}" dimension. Use techniques like embedding model and cosine similarity.
 	- identify the answer type; label answer type as "other" if the given labels don't fit.
 
-2) Compute the similarity score between answers that have the same answer type. Similarity scores have values between 0.0 (not similar) and 1.0 (perfect match). Use techniques like Joint Sequence Attention.
+{% if request_similarity %}2) Compute the similarity score between answers that have the same answer type. Similarity scores have values between 0.0 (not similar) and 1.0 (perfect match). Use techniques like Joint Sequence Attention.
 
 3) For each answer type, select the two answers X and Y (of the same answer type) with the highest similarity score. If the similarity score is greater than {{ similarity_threshold }}, then merge both answers to merged answer Z, e.g. "[combined answer], e.g. [variant 1, variant 2]", and compute a relevance score of the merge answer Z. If the relevance score of the merged answer Z is higher than those of answer X and Y, then drop answer X and Y from the answer list, and add the merged answer Z to the answer list, and drop the similarity score between X and Y.
-   
+{% else %}2) Do not compute similarity scores between answers, they are computed separately.
+
+3) For each answer type, if two answers X and Y say the same thing, merge both answers to merged answer Z, e.g. "[combined answer], e.g. [variant 1, variant 2]", and replace X and Y with Z.
+{% endif %}   
 4) Set loops+=1. If loops>={{ max_fillups }}, then go to step 6.
 
 5) If length of the answer list is lower than {{ max_answers }}, then repeat step 3.
@@ -116,9 +121,23 @@ Process the following human inquiry step by step:
 {% endif %}
 
 ### OUTPUT
-Respond strictly with valid JSON conforming to the schema of answers_list, similarity_scores, and connections_list.
+Respond strictly with valid JSON conforming to the schema of answers_list{% if request_similarity %}, similarity_scores,{% endif %} and connections_list.
 """
 
+# static prefix (role, focus, answer types, connections, task) and variable suffix
+# (inquiry, context); provider-side prefix caching can reuse the prefix
+BASE_PROMPT_PREFIX_TEMPLATE, _sep, _suffix = BASE_PROMPT_TEMPLATE.partition("### INQUIRY")
+BASE_PROMPT_SUFFIX_TEMPLATE = _sep + _suffix
+
+
+@lru_cache(maxsize=None)
+def valid_connection_dimensions(
+    dimension: str, dimensions: tuple[str, ...] | None = None
+) -> str:
+    # `dimensions`: those of the worker registry, including plugins; by default
+    # the built-in ones
+    return ", ".join(d for d in dimensions or ALL_DIMENSIONS if d != dimension)
+
 
 class BaseInquiryWorker:
     # worker metadata
@@ -131,30 +150,67 @@ class BaseInquiryWorker:
     output_schema: ClassVar[type[BaseModel]] = WorkerReply
 
     @classmethod
-    def render_prompt(
-        cls, inquiry: str, 
-        additional_context: str = "", 
+    def render_prompt_prefix(
+        cls,
         max_answers: int = 5,
         max_fillups: int = 2,
         max_connections: int = 3,
         similarity_threshold: float = 0.8,
+        request_similarity: bool = True,
+        dimensions: tuple[str, ...] | None = None,
     ) -> str:
-        template = jinja2.Template(BASE_PROMPT_TEMPLATE)
-        valid_uif_dimensions = [d for d in ALL_DIMENSIONS if d != cls.dimension]
-        return template.render(
+        # inquiry-independent, rendered once per worker definition and parameters
+        return prompt_engine.render_static(
+            BASE_PROMPT_PREFIX_TEMPLATE,
+            keep_trailing_newline=True,
             dimension=cls.dimension,
             primary_focus=cls.primary_focus,
             answer_types=", ".join(cls.answer_types),
-            valid_uif_dimensions=", ".join(valid_uif_dimensions),
+            valid_uif_dimensions=valid_connection_dimensions(
+                cls.dimension, dimensions
+            ),
             contextual_utility=cls.contextual_utility,
+            # parameters
+            max_answers=max_answers,
+            max_fillups=max_fillups,
+            max_connections=max_connections,
+            similarity_threshold=similarity_threshold,
+            request_similarity=request_similarity,
+        )
+
+    @classmethod
+    def render_prompt_suffix(
+        cls, inquiry: str, additional_context: str = "", request_similarity: bool = True
+    ) -> str:
+        return prompt_engine.render(
+            BASE_PROMPT_SUFFIX_TEMPLATE,
             inquiry=inquiry,
             additional_context=additional_context,
-            # parameters
+            request_similarity=request_similarity,
+        )
+
+    @classmethod
+    def render_prompt(
+        cls, inquiry: str, 
+        additional_context: str = "", 
+        max_answers: int = 5,
+        max_fillups: int = 2,
+        max_connections: int = 3,
+        similarity_threshold: float = 0.8,
+        request_similarity: bool = True,
+        dimensions: tuple[str, ...] | None = None,
+    ) -> str:
+        # request_similarity=False: the model doesn't emit similarity_scores, see
+        # src/agents/workers/similarity.py
+        prefix = cls.render_prompt_prefix(
             max_answers=max_answers,
             max_fillups=max_fillups,
             max_connections=max_connections,
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            request_similarity=request_similarity,
+            dimensions=dimensions,
         )
+        return prefix + cls.render_prompt_suffix(inquiry, additional_context, request_similarity)
 
 
 # This is a kind of residual dimensions that the LLM hallucinates when it doesn't fit the given dimensions
@@ -168,12 +224,19 @@ class InquiryOther(BaseInquiryWorker):
     )
 
     @classmethod
-    def set_definition(cls, dimension: str) -> None:
+    def for_dimension(cls, dimension: str) -> type["InquiryOther"]:
+        # a new subclass per dimension; InquiryOther itself is shared and never changed
         # keep dimension name as is
-        cls.name = f"inquiry_{dimension.lower()}"
-        cls.primary_focus = f"{dimension} dimension"
-        cls.answer_types = [f"{dimension.lower()}"]
-        cls.contextual_utility = f"The {dimension} dimension."
+        return type(
+            f"InquiryOther[{dimension}]",
+            (cls,),
+            {
+                "name": f"inquiry_{dimension.lower()}",
+                "primary_focus": f"{dimension} dimension",
+                "answer_types": (dimension.lower(),),
+                "contextual_utility": f"The {dimension} dimension.",
+            },
+        )
 
 
 class InquiryActionable(BaseInquiryWorker):
@@ -1,5 +1,5 @@
-import jinja2
 import json
+from . import prompt_engine
 from .inquiry_base import WorkerReply
 
 MERGER_PROMPT = """
@@ -13,7 +13,7 @@ Follow these steps strictly:
 
 1) Concat data1.answers_list and data2.answers_list. Concat data1.connections_list and data2.connections_list
 
-2) Compute the similarity score between answers that have the same answer type. Similarity scores have values between 0.0 (not similar) and 1.0 (perfect match). Use techniques like Joint Sequence Attention.
+{% if request_similarity %}2) Compute the similarity score between answers that have the same answer type. Similarity scores have values between 0.0 (not similar) and 1.0 (perfect match). Use techniques like Joint Sequence Attention.
 
 3) For each answer type, select the two answers X and Y (of the same answer type) with the highest similarity score. If the similarity score is greater than {{ similarity_threshold }}, then merge both answers to merged answer Z, e.g. "[combined answer], e.g. [variant 1, variant 2]", and compute a relevance score of the merge answer Z. If the relevance score of the merged answer Z is higher than those of answer X and Y, then 
    - drop answer X and Y from the answer list, 
@@ -21,7 +21,14 @@ Follow these steps strictly:
    - and drop the similarity score between X and Y,
    - drop connections of X and Y from the connection list,
    - add connection of Z to connection list.
+{% else %}2) Do not compute similarity scores between answers, they are computed separately.
 
+3) For each answer type, if two answers X and Y say the same thing, merge both answers to merged answer Z, e.g. "[combined answer], e.g. [variant 1, variant 2]", then
+   - drop answer X and Y from the answer list,
+   - and add the merged answer Z to the answer list,
+   - drop connections of X and Y from the connection list,
+   - add connection of Z to connection list.
+{% endif %}
 4) Set loops+=1. If loops>={{ max_removals }}, then go to step 6.
 
 5) If length of the answer list is greater than {{ max_answers }}, then repeat step 3.
@@ -34,7 +41,7 @@ data1: {{ data1 }}
 data2: {{ data2 }}
 
 ### OUTPUT
-Respond strictly with valid JSON conforming to the schema of answers_list, similarity_scores, and connections_list.
+Respond strictly with valid JSON conforming to the schema of answers_list{% if request_similarity %}, similarity_scores,{% endif %} and connections_list.
 """
 
 
@@ -43,14 +50,22 @@ class InquiryReplyMerger:
     output_schema = WorkerReply
 
     @classmethod
-    def render_prompt(cls, previous_reply: WorkerReply, current_reply: WorkerReply) -> str:
+    def render_prompt(
+        cls,
+        previous_reply: WorkerReply,
+        current_reply: WorkerReply,
+        request_similarity: bool = True,
+    ) -> str:
         num1, num2 = len(previous_reply.answers_list), len(current_reply.answers_list)
+        # without requested similarity scores, the input doesn't need them either
+        exclude = None if request_similarity else {"similarity_scores"}
         # run merge query
-        template = jinja2.Template(MERGER_PROMPT)
-        return template.render(
-            data1=previous_reply.model_dump_json(), 
-            data2=current_reply.model_dump_json(), 
+        return prompt_engine.render(
+            MERGER_PROMPT,
+            data1=previous_reply.model_dump_json(exclude=exclude), 
+            data2=current_reply.model_dump_json(exclude=exclude), 
             max_answers=5,
             max_removals=max(0, num1 + num2 - 5),
-            similarity_threshold=0.8
+            similarity_threshold=0.8,
+            request_similarity=request_similarity,
         )
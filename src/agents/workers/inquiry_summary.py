@@ -1,4 +1,4 @@
-import jinja2
+from . import prompt_engine
 
 SUMMARY_PROMPT = """
 ### ROLE
@@ -31,5 +31,6 @@ class InquirySummary:
 
     @classmethod
     def render_prompt(cls, inquiry: str, worker_replies: dict) -> str:
-        template = jinja2.Template(SUMMARY_PROMPT)
-        return template.render(inquiry=inquiry, worker_replies=worker_replies)
+        return prompt_engine.render(
+            SUMMARY_PROMPT, inquiry=inquiry, worker_replies=worker_replies
+        )
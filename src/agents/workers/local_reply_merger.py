@@ -0,0 +1,104 @@
+import re
+
+from .inquiry_base import AnswerItem, DimensionConnection, SimilarityScore, WorkerReply
+
+
+def _ngrams(text: str, n: int = 3) -> set[str]:
+    text = f" {' '.join(text.lower().split())} "
+    return {text[i : i + n] for i in range(max(1, len(text) - n + 1))}
+
+
+def _tokens(text: str) -> set[str]:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def text_similarity(a: str, b: str) -> float:
+    """Near-duplicate score in [0, 1]: max of char-trigram and token-set Jaccard."""
+    return max(_jaccard(_ngrams(a), _ngrams(b)), _jaccard(_tokens(a), _tokens(b)))
+
+
+class LocalReplyMerger:
+    """Deterministic, local replacement for the `InquiryReplyMerger` LLM call.
+
+    Same contract as the merger prompt: concat both replies, merge the most
+    similar pair of the same answer type while its similarity is above
+    `similarity_threshold`, cap at `max_answers` and remap the connection
+    indices. A merged answer keeps the text of its higher-scored variant.
+    """
+
+    name = "local_reply_merger"
+    output_schema = WorkerReply
+
+    @classmethod
+    def similarity_pairs(cls, answers: list[AnswerItem]) -> list[SimilarityScore]:
+        return [
+            SimilarityScore(i=i, j=j, score=round(text_similarity(a.answer, b.answer), 4))
+            for i, a in enumerate(answers)
+            for j, b in enumerate(answers[i + 1 :], start=i + 1)
+            if a.answer_type == b.answer_type
+        ]
+
+    @classmethod
+    def is_ambiguous(
+        cls,
+        previous_reply: WorkerReply,
+        current_reply: WorkerReply,
+        similarity_threshold: float = 0.8,
+        margin: float = 0.2,
+    ) -> bool:
+        """True if a same-type pair is close to the threshold, i.e. needs the LLM."""
+        answers = previous_reply.answers_list + current_reply.answers_list
+        return any(
+            similarity_threshold - margin <= pair.score <= similarity_threshold
+            for pair in cls.similarity_pairs(answers)
+        )
+
+    @classmethod
+    def merge(
+        cls,
+        previous_reply: WorkerReply,
+        current_reply: WorkerReply,
+        max_answers: int = 5,
+        similarity_threshold: float = 0.8,
+    ) -> WorkerReply:
+        answers = list(previous_reply.answers_list) + list(current_reply.answers_list)
+        offset = len(previous_reply.answers_list)
+        # connections per answer, so that merges and drops keep them aligned
+        connections = [[] for _ in answers]
+        for conn in previous_reply.connections_list:
+            if conn.i < offset:
+                connections[conn.i].append(conn.dimension_name)
+        for conn in current_reply.connections_list:
+            if conn.i < len(current_reply.answers_list):
+                connections[conn.i + offset].append(conn.dimension_name)
+
+        while True:
+            pairs = [p for p in cls.similarity_pairs(answers) if p.score > similarity_threshold]
+            if not pairs:
+                break
+            best = max(pairs, key=lambda p: p.score)
+            keep, drop = sorted((best.i, best.j), key=lambda k: -answers[k].score)
+            connections[keep] += connections[drop]
+            del answers[drop], connections[drop]
+
+        # cap by relevance score, keep the original order otherwise
+        kept = sorted(range(len(answers)), key=lambda k: -answers[k].score)[:max_answers]
+        kept.sort()
+        answers = [answers[k] for k in kept]
+        connections = [connections[k] for k in kept]
+
+        return WorkerReply(
+            answers_list=answers,
+            similarity_scores=cls.similarity_pairs(answers),
+            connections_list=[
+                DimensionConnection(i=i, dimension_name=dim)
+                for i, dims in enumerate(connections)
+                for dim in dict.fromkeys(dims)  # dedupe, keep order
+            ],
+        )
@@ -0,0 +1,34 @@
+from functools import lru_cache
+
+import jinja2
+
+# same defaults as `jinja2.Template(source)`, i.e. the trailing newline is dropped
+_ENV = jinja2.Environment()
+# for template parts that are concatenated with a following part
+_ENV_KEEP_NEWLINE = jinja2.Environment(keep_trailing_newline=True)
+
+
+@lru_cache(maxsize=None)
+def compile_template(source: str, keep_trailing_newline: bool = False) -> jinja2.Template:
+    """Compile a template source once and reuse it for every render."""
+    env = _ENV_KEEP_NEWLINE if keep_trailing_newline else _ENV
+    return env.from_string(source)
+
+
+@lru_cache(maxsize=4096)
+def _render_static(source: str, keep_trailing_newline: bool, params: tuple) -> str:
+    return compile_template(source, keep_trailing_newline).render(dict(params))
+
+
+def render_static(source: str, keep_trailing_newline: bool = False, **params) -> str:
+    """Render and memoize a template whose params are all hashable.
+
+    Meant for the inquiry-independent parts of a prompt, e.g. a worker's role
+    and task, which are identical for every call of that worker.
+    """
+    return _render_static(source, keep_trailing_newline, tuple(sorted(params.items())))
+
+
+def render(source: str, keep_trailing_newline: bool = False, **params) -> str:
+    """Render a precompiled template with variable params (no memoization)."""
+    return compile_template(source, keep_trailing_newline).render(**params)
@@ -0,0 +1,83 @@
+import os
+import threading
+from importlib.metadata import entry_points
+
+from . import inquiry_base
+from .inquiry_base import ALL_DIMENSIONS, BaseInquiryWorker, InquiryOther
+
+# packages add or replace dimensions with an entry point in this group, e.g.
+# [project.entry-points."inquiry_bot.workers"]
+# olfactory = "my_package.workers:InquiryOlfactory"
+WORKER_ENTRY_POINT_GROUP = "inquiry_bot.workers"
+
+
+def _key(dimension: str) -> str:
+    # same normalization as the Inquiry<Dimension> class names
+    return dimension.replace(" ", "").replace("'", "")
+
+
+class WorkerRegistry:
+    """Worker class per dimension, built once and shared by all graph runs.
+
+    Holds the built-in `Inquiry<Dimension>` classes and the workers of
+    plugins. An unknown dimension (e.g. a connection the model made up) gets
+    an `InquiryOther.for_dimension` subclass; these are cached, up to
+    `max_other` of them, and never changed afterwards. Lookups are
+    thread-safe.
+    """
+
+    def __init__(self, workers: list[type[BaseInquiryWorker]] | None = None, max_other: int = 1024):
+        self._workers: dict[str, type[BaseInquiryWorker]] = {}
+        self._dimensions: list[str] = []
+        # the residual dimension is not fanned out to, but has its own worker
+        self._other: dict[str, type[BaseInquiryWorker]] = {InquiryOther.dimension: InquiryOther}
+        self.max_other = max_other
+        self._lock = threading.Lock()
+        for worker in workers if workers is not None else builtin_workers():
+            self.register(worker)
+
+    def register(self, worker: type[BaseInquiryWorker]) -> None:
+        """Add a worker class, replacing the one of its dimension if there is one."""
+        if not (isinstance(worker, type) and issubclass(worker, BaseInquiryWorker)) or not worker.dimension:
+            raise ValueError(f"{worker!r} is not a BaseInquiryWorker subclass with a dimension")
+        with self._lock:
+            if _key(worker.dimension) not in self._workers:
+                self._dimensions.append(worker.dimension)
+            self._workers[_key(worker.dimension)] = worker
+            self._other.pop(worker.dimension, None)
+
+    @property
+    def dimensions(self) -> list[str]:
+        """Built-in dimensions in `ALL_DIMENSIONS` order, then those added by plugins."""
+        with self._lock:
+            return list(self._dimensions)
+
+    def get(self, dimension: str) -> type[BaseInquiryWorker]:
+        worker = self._workers.get(_key(dimension)) or self._other.get(dimension)
+        if worker is not None:
+            return worker
+        worker = InquiryOther.for_dimension(dimension)
+        with self._lock:
+            if len(self._other) >= self.max_other:
+                return worker
+            # another thread may have defined it in the meantime
+            return self._other.setdefault(dimension, worker)
+
+
+def builtin_workers() -> list[type[BaseInquiryWorker]]:
+    """The `Inquiry<Dimension>` classes of `ALL_DIMENSIONS`, in that order."""
+    return [getattr(inquiry_base, f"Inquiry{_key(dim)}") for dim in ALL_DIMENSIONS]
+
+
+def load_plugins(registry: WorkerRegistry) -> WorkerRegistry:
+    for entry_point in entry_points(group=WORKER_ENTRY_POINT_GROUP):
+        registry.register(entry_point.load())
+    return registry
+
+
+def create_worker_registry() -> WorkerRegistry:
+    """Built-in workers plus the `inquiry_bot.workers` entry points (`WORKER_PLUGINS=0` skips these)."""
+    registry = WorkerRegistry()
+    if os.getenv("WORKER_PLUGINS", "1") == "1":
+        load_plugins(registry)
+    return registry
@@ -0,0 +1,77 @@
+import zlib
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .inquiry_base import AnswerItem, DimensionConnection, SimilarityScore, WorkerReply
+
+HASH_DIM = 2**12
+
+
+class WorkerAnswers(BaseModel):
+    """`WorkerReply` without `similarity_scores`, which are computed locally instead."""
+
+    answers_list: list[AnswerItem] = Field(description="List of answers and relevance scores.")
+    connections_list: list[DimensionConnection] = Field(
+        description="Connections to related dimensions."
+    )
+
+
+def _ngram_ids(text: str, n: int, dim: int) -> list[int]:
+    # crc32 instead of hash(): stable across processes (PYTHONHASHSEED)
+    text = f" {' '.join(text.lower().split())} "
+    return [
+        zlib.crc32(text[i : i + n].encode("utf-8")) % dim
+        for i in range(max(1, len(text) - n + 1))
+    ]
+
+
+def hashed_ngram_counts(texts: list[str], n: int = 3, dim: int = HASH_DIM) -> np.ndarray:
+    """Character n-gram count vectors via the hashing trick, shape (len(texts), dim)."""
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        ids = _ngram_ids(text, n, dim)
+        rows.extend([row] * len(ids))
+        cols.extend(ids)
+    counts = np.zeros((len(texts), dim), dtype=np.float64)
+    np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), 1.0)
+    return counts
+
+
+def tfidf_matrix(texts: list[str], n: int = 3, dim: int = HASH_DIM) -> np.ndarray:
+    """L2-normalized TF-IDF rows of hashed character n-grams."""
+    counts = hashed_ngram_counts(texts, n, dim)
+    df = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(texts)) / (1 + df)) + 1.0
+    weights = counts * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return weights / np.where(norms == 0, 1.0, norms)
+
+
+def cosine_similarity_matrix(texts: list[str], n: int = 3) -> np.ndarray:
+    if not texts:
+        return np.zeros((0, 0))
+    vectors = tfidf_matrix(texts, n)
+    return np.clip(vectors @ vectors.T, 0.0, 1.0)
+
+
+def similarity_scores(answers: list[AnswerItem]) -> list[SimilarityScore]:
+    """Pairwise similarity of answers with the same answer_type (i < j)."""
+    if len(answers) < 2:
+        return []
+    matrix = cosine_similarity_matrix([a.answer for a in answers])
+    types = np.array([a.answer_type for a in answers])
+    mask = np.triu(types[:, None] == types[None, :], k=1)
+    return [
+        SimilarityScore(i=int(i), j=int(j), score=round(float(matrix[i, j]), 4))
+        for i, j in zip(*np.nonzero(mask))
+    ]
+
+
+def with_local_similarity(reply: WorkerAnswers | WorkerReply) -> WorkerReply:
+    """Return a `WorkerReply` whose similarity_scores are computed locally."""
+    return WorkerReply(
+        answers_list=reply.answers_list,
+        similarity_scores=similarity_scores(reply.answers_list),
+        connections_list=reply.connections_list,
+    )
@@ -0,0 +1,190 @@
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Iterator, TextIO
+
+from src.agents.supervisors.inquiry_supervisor import InquirySupervisor
+from src.agents.workers.inquiry_base import calculate_worker_metric
+from src.graphs.inquiry_bot import add_revisions, merge_dict
+
+
+class InvalidLine(ValueError):
+    """An input line that isn't valid JSON; fails as a record of its own."""
+
+
+def validate_record(record) -> str | None:
+    """Why `record` can't be run, or None."""
+    if isinstance(record, InvalidLine):
+        return str(record)
+    if not isinstance(record, dict):
+        return f"invalid record {record!r}, expected an object or a string"
+    inquiry = record.get("inquiry")
+    if not isinstance(inquiry, str) or not inquiry.strip():
+        return f"record {record.get('id')!r} has no inquiry"
+    return None
+
+
+def record_key(record: dict) -> str:
+    # an explicit id wins, otherwise the inquiry text identifies the record
+    record_id = record.get("id")
+    return str(record_id if record_id not in (None, "") else record["inquiry"])
+
+
+def read_inquiries(path: str, fmt: str | None = None) -> Iterator[dict]:
+    """Yield {"inquiry": ..., ["id": ...]} records from a JSONL/CSV file or stdin ("-")."""
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+    stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+    try:
+        if fmt == "csv":
+            yield from (row for row in csv.DictReader(stream) if row.get("inquiry"))
+        elif fmt == "jsonl":
+            for number, line in enumerate(stream, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield InvalidLine(f"line {number} is not valid JSON: {e}")
+                    continue
+                yield {"inquiry": record} if isinstance(record, str) else record
+        else:
+            raise ValueError(f"Unknown input format '{fmt}', expected 'jsonl' or 'csv'")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def load_completed(output_path: str | None) -> set[str]:
+    """Keys of records that already finished successfully in a previous run."""
+    if not output_path or not os.path.exists(output_path):
+        return set()
+    completed = set()
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partially written line of an interrupted run
+            if not result.get("error"):
+                completed.add(record_key(result))
+    return completed
+
+
+def build_result(record: dict, state: dict, timings: dict, error: str | None) -> dict:
+    worker_replies = state.get("worker_replies") or {}
+    return {
+        "id": record.get("id"),
+        "inquiry": record.get("inquiry"),
+        "summary": state.get("summary"),
+        "worker_replies": {dim: reply.model_dump() for dim, reply in worker_replies.items()},
+        "metrics": {
+            "supervisor": InquirySupervisor.calculate_metric(worker_replies),
+            "workers": {
+                dim: calculate_worker_metric(reply) for dim, reply in worker_replies.items()
+            },
+            "loop_count": state.get("loop_count"),
+            "deactivated_workers": state.get("deactivated_workers", []),
+            "routing": state.get("routing"),
+            "stop_reason": state.get("stop_reason"),
+            "tokens_used": state.get("tokens_used"),
+        },
+        "timings": timings,
+        "error": error,
+    }
+
+
+def apply_update(state: dict, update: dict) -> None:
+    # same semantics as the graph's channels: worker_replies are merged per dimension
+    for key, value in update.items():
+        if key in ("worker_replies", "reply_revisions") and value is None:
+            state[key] = {}  # reset by init_node
+        elif key == "worker_replies":
+            state[key] = merge_dict(state.get(key), value)
+        elif key == "reply_revisions":
+            state[key] = add_revisions(state.get(key) or {}, [value])
+        else:
+            state[key] = value
+
+
+async def run_record(graph, record: dict, config: dict) -> dict:
+    """Run one inquiry via graph.astream and collect its final state and timings."""
+    state, nodes, cross_loops = {}, {}, []
+    start = last = time.perf_counter()
+    error = None
+    try:
+        async for event in graph.astream({"inquiry": record["inquiry"]}, config):
+            now = time.perf_counter()
+            for node, update in event.items():
+                nodes.setdefault(node, []).append(now - last)
+                apply_update(state, update or {})
+                if (update or {}).get("cross_timing"):
+                    cross_loops.append(update["cross_timing"])
+            last = now
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    timings = {"total": time.perf_counter() - start, "nodes": nodes, "cross_loops": cross_loops}
+    return build_result(record, state, timings, error)
+
+
+async def run_batch(
+    graph,
+    records: Iterator[dict],
+    output: TextIO,
+    concurrency: int = 8,
+    completed: set[str] | None = None,
+    config: dict | None = None,
+) -> dict:
+    """Run records with up to `concurrency` graph runs in flight.
+
+    Every result is written as one JSONL line as soon as it finishes. Records
+    whose key is in `completed` are skipped.
+    """
+    completed = completed or set()
+    stats = {"done": 0, "failed": 0, "skipped": 0}
+    records = iter(records)
+    end = object()
+    reading = asyncio.Lock()
+
+    async def next_record():
+        # reading (e.g. stdin) blocks; one worker at a time may advance the generator
+        async with reading:
+            return await asyncio.to_thread(next, records, end)
+
+    async def worker():
+        while (record := await next_record()) is not end:
+            error = validate_record(record)
+            if error:
+                # one bad record fails on its own, like a failed graph run
+                record = record if isinstance(record, dict) else {}
+                result = build_result(record, {}, {}, error)
+                output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                output.flush()
+                stats["failed"] += 1
+                continue
+            key = record_key(record)
+            if key in completed:
+                stats["skipped"] += 1
+                continue
+            completed.add(key)  # skip duplicates within the same input
+            # per attempt: a rerun must not continue the checkpointed state of an earlier one
+            digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+            run_config = {
+                **(config or {}),
+                "configurable": {
+                    **(config or {}).get("configurable", {}),
+                    "thread_id": f"batch-{digest}-{uuid.uuid4().hex[:8]}",
+                },
+            }
+            result = await run_record(graph, record, run_config)
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+            stats["failed" if result["error"] else "done"] += 1
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    return stats
@@ -1,42 +1,295 @@
 import argparse
+import asyncio
 import os
 import sys
 import json
-from dotenv import load_dotenv
+import time
+import uuid
 
 # Ensure the root directory is in the python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-# check keys
-load_dotenv()
+from src.env import load_env
 
-if not os.getenv("GEMINI_API_KEY"):
-    print("Error: GEMINI_API_KEY environment variable not set.")
-    sys.exit(1)
+# the graph (LangGraph, LLM clients) is built on first use, so --help and argument
+# errors return right away; tests replace it via src.cli.graph
+graph = None
 
-from src.graphs.inquiry_bot import graph
 
-def main():
-    parser = argparse.ArgumentParser(description="Multi-Agent System CLI for Inquiry Bot")
-    parser.add_argument(
+def get_graph():
+    global graph
+    if graph is None:
+        from src.graphs.inquiry_bot import get_graph as build_graph
+
+        graph = build_graph()
+    return graph
+
+
+def check_keys() -> None:
+    load_env()
+    if os.getenv("LLM_BACKEND", "google") == "google" and not os.getenv(
+        "GEMINI_API_KEY"
+    ):
+        print("Error: GEMINI_API_KEY environment variable not set.")
+        sys.exit(1)
+
+
+def print_event(event: dict, summary_streamed: bool = False) -> None:
+    for key, value in event.items():
+        if summary_streamed and value.get("summary"):
+            # already printed token by token, see SummaryPrinter
+            print()
+            continue
+        print(f"\n--- Node: {key} ---")
+        if key == "semantic_cache" and value.get("semantic_cache"):
+            match = value["semantic_cache"]
+            print(
+                f"Semantic cache {match['mode']}: '{match['inquiry']}' "
+                f"(similarity {match['similarity']:.2f})"
+            )
+        if value.get("worker_replies"):
+            for dim, reply_obj in value["worker_replies"].items():
+                print(f"Worker ({dim}) Replied:\n{reply_obj}\n")
+
+        elif key == "init_node":
+            print("Initialization complete.")
+
+        elif key == "router" and value.get("routing"):
+            routing = value["routing"]
+            print(
+                f"Routed {len(routing['selected'])} dimensions "
+                f"({routing['calls_saved']} prelim calls saved, "
+                f"source: {routing['source']})"
+            )
+
+        if key == "cross_nodes" and value.get("cross_timing"):
+            timing = value["cross_timing"]
+            print(
+                f"Cross loop {timing['loop']}: {timing['calls']} calls "
+                f"({timing['skipped_calls']} skipped without new connections)"
+            )
+
+        if value.get("stop_reason"):
+            print(
+                f"Stopping after loop {value.get('loop_count', 0)}: "
+                f"{value['stop_reason']}"
+            )
+
+        if "summary" in value and value["summary"]:
+            print(f"Final Summary:\n{value['summary']}")
+
+
+class SummaryPrinter:
+    """Prints the summary tokens of the graph's "messages" stream as they arrive."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_token: float | None = None
+
+    def on_message(self, chunk: tuple) -> None:
+        message, metadata = chunk
+        if metadata.get("langgraph_node") != "summarizer":
+            return
+        if not isinstance(message.content, str) or not message.content:
+            return
+        if self.first_token is None:
+            self.first_token = time.perf_counter() - self.started
+            print("\n--- Node: summarizer ---\nFinal Summary:")
+        print(message.content, end="", flush=True)
+
+    def print_timing(self) -> None:
+        total = time.perf_counter() - self.started
+        if self.first_token is None:
+            # e.g. a cached summary, it arrives with the node update
+            print(
+                "Time to first token: n/a (summary not streamed), "
+                f"total time: {total:.3f}s"
+            )
+        else:
+            print(
+                f"Time to first token: {self.first_token:.3f}s, "
+                f"total time: {total:.3f}s"
+            )
+
+
+def print_profile(report: dict) -> None:
+    totals = report["totals"]
+    print("\n--- Profile ---")
+    print(
+        f"LLM calls: {totals['calls']} (cache hits: {totals['cache_hits']}, "
+        f"errors: {totals['errors']}, retries: {totals['retries']}), "
+        f"estimated tokens: {totals['prompt_tokens']} prompt / "
+        f"{totals['completion_tokens']} completion"
+    )
+    if totals["raw_context_tokens"]:
+        saved = 1 - totals["context_tokens"] / totals["raw_context_tokens"]
+        print(
+            f"Cross context: {totals['context_tokens']} tokens "
+            f"({totals['raw_context_tokens']} as JSON, {saved:.0%} saved)"
+        )
+    if totals.get("hedges"):
+        print(
+            f"Hedged calls: {totals['hedges']} ({totals['hedge_rate']:.1%}, "
+            f"{totals['hedge_wins']} won by the duplicate), p99 call time: "
+            f"{totals['call_time_p99']:.3f}s "
+            f"(~{totals['call_time_p99_unhedged']:.3f}s without hedging)"
+        )
+    print(
+        f"\n{'critical path':<16}{'dimension':<16}{'wall [s]':>10}{'queue [s]':>11}"
+        f"{'llm [s]':>10}{'other [s]':>11}{'calls':>7}"
+    )
+    for step in report["critical_path"]:
+        node = (
+            step["node"]
+            if step["node"] != "cross_nodes"
+            else f"cross_nodes #{step['loop']}"
+        )
+        print(
+            f"{node:<16}{step['critical_dimension'] or '-':<16}"
+            f"{step['wall_time']:>10.3f}{step['queue_wait']:>11.3f}"
+            f"{step['llm_time']:>10.3f}{step['other']:>11.3f}"
+            f"{step['calls']:>7}"
+        )
+    print(f"{'total':<32}{sum(s['wall_time'] for s in report['critical_path']):>10.3f}")
+
+
+def run_sync(initial_state: dict, config: dict, stream_tokens: bool = False) -> None:
+    if not stream_tokens:
+        # Use stream to get updates as the graph executes
+        for event in get_graph().stream(initial_state, config):
+            print_event(event)
+        return
+    printer = SummaryPrinter()
+    for mode, chunk in get_graph().stream(
+        initial_state, config, stream_mode=["updates", "messages"]
+    ):
+        if mode == "messages":
+            printer.on_message(chunk)
+        else:
+            print_event(chunk, printer.first_token is not None)
+    printer.print_timing()
+
+
+async def run_async(
+    initial_state: dict, config: dict, stream_tokens: bool = False
+) -> None:
+    # native asyncio nodes; one event loop, bounded in-flight LLM requests
+    if not stream_tokens:
+        async for event in get_graph().astream(initial_state, config):
+            print_event(event)
+        return
+    printer = SummaryPrinter()
+    async for mode, chunk in get_graph().astream(
+        initial_state, config, stream_mode=["updates", "messages"]
+    ):
+        if mode == "messages":
+            printer.on_message(chunk)
+        else:
+            print_event(chunk, printer.first_token is not None)
+    printer.print_timing()
+
+
+def run_batch_mode(args: argparse.Namespace) -> None:
+    from src.batch import load_completed, read_inquiries, run_batch
+
+    config = {
+        "run_name": "InquiryDecompositionGraph",
+        "metadata": {
+            "environment": "development",
+            "interface": "CLI-batch",
+            "dimensions_count": 22,
+        },
+    }
+    completed = load_completed(args.output)
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        records = read_inquiries(args.batch, args.format)
+        stats = asyncio.run(
+            run_batch(get_graph(), records, output, args.concurrency, completed, config)
+        )
+    except Exception as e:
+        print(f"An error occurred during execution: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(
+        f"Batch finished: {stats['done']} done, {stats['failed']} failed, "
+        f"{stats['skipped']} skipped",
+        file=sys.stderr,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Multi-Agent System CLI for Inquiry Bot"
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument(
         "-q",
         "--query",
         help="The query or task for the supervisor agent",
-        required=True,
     )
-    args = parser.parse_args()
+    mode.add_argument(
+        "-b",
+        "--batch",
+        help="Batch mode: JSONL/CSV file with inquiries, or '-' for stdin",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Run the graph with native asyncio nodes (graph.astream)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the summary token by token and report the time to first token",
+    )
+    parser.add_argument(
+        "--thread-id",
+        help="Checkpoint thread id (default: a new id per inquiry); "
+        "an interrupted run with this id is resumed",
+    )
+    add_batch_arguments(parser)
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print LLM calls, tokens and the critical path breakdown of the run",
+    )
+    parser.add_argument(
+        "--profile-json", help="Write the per-call profile report to this JSON file"
+    )
+    parser.add_argument(
+        "--prometheus", help="Write the profile as Prometheus text format to this file"
+    )
+    return parser
 
 
-    print(f"Started Multi-Agent System with query: '{args.query}'\n")
-    initial_state = {
-        "inquiry": args.query,
-    }
+def add_batch_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="Batch mode: JSONL output file (appended; finished inquiries are skipped)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["jsonl", "csv"],
+        help="Batch mode: input format (default: by file extension, else jsonl)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Batch mode: number of concurrent graph runs",
+    )
+
 
-    # Config with enhanced LangSmith metadata and custom run name
+def query_config(args: argparse.Namespace) -> dict:
+    """Run config of a single inquiry: thread id, LangSmith metadata, profiler."""
     config = {
-        "configurable": {
-            "thread_id": "cli_user"
-        },
+        "configurable": {"thread_id": args.thread_id or f"cli-{uuid.uuid4().hex}"},
         "run_name": "InquiryDecompositionGraph",
         "metadata": {
             "environment": "development",
@@ -44,28 +297,59 @@ def main():
             "dimensions_count": 22
         }
     }
+    if args.profile or args.profile_json or args.prometheus:
+        from src.graphs.profiling import RunProfiler
+
+        config["configurable"]["profiler"] = RunProfiler()
+    return config
+
+
+def report_profile(profiler, args: argparse.Namespace) -> None:
+    if args.profile:
+        print_profile(profiler.report())
+    if args.profile_json:
+        profiler.write_json(args.profile_json)
+    if args.prometheus:
+        profiler.write_prometheus(args.prometheus)
+
+
+def run_query_mode(args: argparse.Namespace) -> None:
+    print(f"Started Multi-Agent System with query: '{args.query}'\n")
+    initial_state = {
+        "inquiry": args.query,
+    }
+    config = query_config(args)
+    print(f"Thread id: {config['configurable']['thread_id']}\n")
+    if args.thread_id and get_graph().get_state(config).next:
+        # unfinished run of this thread: continue from its last checkpoint
+        print("Resuming interrupted run from the last checkpoint.\n")
+        initial_state = None
 
     try:
-        # Use stream to get updates as the graph executes
-        for event in graph.stream(initial_state, config):
-            for key, value in event.items():
-                print(f"\n--- Node: {key} ---")
-                if "worker_replies" in value:
-                    for dim, reply_obj in value["worker_replies"].items():
-                        print(f"Worker ({dim}) Replied:\n{reply_obj}\n")
-                        
-                elif key == "init_node":
-                    print("Initialization complete.")
-                    
-                if "summary" in value and value["summary"]:
-                    print(f"Final Summary:\n{value['summary']}")
+        if args.use_async:
+            asyncio.run(run_async(initial_state, config, args.stream))
+        else:
+            run_sync(initial_state, config, args.stream)
 
         print("\n--- Execution Finished ---")
 
+        profiler = config["configurable"].get("profiler")
+        if profiler is not None:
+            report_profile(profiler, args)
+
     except Exception as e:
         print(f"An error occurred during execution: {e}")
         sys.exit(1)
 
 
+def main():
+    args = build_parser().parse_args()
+    check_keys()
+    if args.batch:
+        run_batch_mode(args)
+    else:
+        run_query_mode(args)
+
+
 if __name__ == "__main__":
     main()
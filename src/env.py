@@ -0,0 +1,19 @@
+import threading
+
+from dotenv import load_dotenv
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """Load `.env` into the environment, once per process.
+
+    Both the CLI and the graph module need it; the second call is a no-op
+    instead of another search for the file.
+    """
+    global _loaded
+    with _lock:
+        if not _loaded:
+            load_dotenv()
+            _loaded = True
@@ -0,0 +1,477 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Iterator, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+# state types that may be restored from a checkpoint
+ALLOWED_STATE_TYPES = [
+    ("src.agents.workers.inquiry_base", "WorkerReply"),
+    ("src.agents.workers.inquiry_base", "AnswerItem"),
+    ("src.agents.workers.inquiry_base", "SimilarityScore"),
+    ("src.agents.workers.inquiry_base", "DimensionConnection"),
+]
+
+
+def replay_depth(metadata: CheckpointMetadata) -> int:
+    """Number of parent checkpoints needed to restore a checkpoint's delta channels.
+
+    A `DeltaChannel` stores a snapshot every few updates and otherwise only
+    the writes of each step; LangGraph records the supersteps since the last
+    snapshot in `counters_since_delta_snapshot` (absent right after one).
+    """
+    counters = (metadata or {}).get("counters_since_delta_snapshot") or {}
+    return max((supersteps for _, supersteps in counters.values()), default=0)
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver[str]):
+    """Disk-backed LangGraph checkpointer with retention policies.
+
+    Every checkpoint row holds the state of its step, so nothing is
+    kept in memory between calls and an interrupted run resumes from the
+    latest row of its thread. Retention:
+
+    - `keep_latest_only`: older checkpoints (and their pending writes) of a
+      thread are deleted whenever a new one is saved. Delta channels (e.g.
+      `worker_replies`) are only stored as writes between two snapshots, so
+      the checkpoints back to the latest snapshot are kept as well.
+    - `max_age`: threads without a checkpoint in the last `max_age` seconds
+      are deleted.
+    - `max_bytes`: the least recently updated threads are deleted until the
+      stored checkpoints and writes fit into `max_bytes`.
+
+    Age and size are enforced every `retention_interval` saves and by
+    `compact()`, which also returns the freed pages to the file system.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        keep_latest_only: bool = True,
+        max_age: float | None = None,
+        max_bytes: int | None = None,
+        retention_interval: int = 100,
+        serde=None,
+    ):
+        super().__init__(
+            serde=serde
+            or JsonPlusSerializer(allowed_msgpack_modules=ALLOWED_STATE_TYPES)
+        )
+        self.path = path
+        self.keep_latest_only = keep_latest_only
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.retention_interval = retention_interval
+        self._puts = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints ("
+            "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, "
+            "checkpoint_id TEXT NOT NULL, parent_checkpoint_id TEXT, "
+            "type TEXT, checkpoint BLOB NOT NULL, metadata_type TEXT, "
+            "metadata BLOB NOT NULL, created_at REAL NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS writes ("
+            "thread_id TEXT NOT NULL, checkpoint_ns TEXT NOT NULL, "
+            "checkpoint_id TEXT NOT NULL, task_id TEXT NOT NULL, "
+            "idx INTEGER NOT NULL, "
+            "channel TEXT NOT NULL, type TEXT, value BLOB, task_path TEXT NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx))"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_checkpoints_created "
+            "ON checkpoints(created_at)"
+        )
+        self._db.commit()
+
+    # --- reads ---
+
+    def _to_tuple(self, row: tuple) -> CheckpointTuple:
+        (
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            parent_id,
+            type_,
+            checkpoint,
+            metadata_type,
+            metadata,
+        ) = row
+        writes = self._db.execute(
+            "SELECT task_id, channel, type, value FROM writes "
+            "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? "
+            "ORDER BY task_path, task_id, idx",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((t, v)))
+                for task_id, channel, t, v in writes
+            ],
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+        )
+
+    _COLUMNS = (
+        "thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, "
+        "type, checkpoint, metadata_type, metadata"
+    )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self._db.execute(
+                    f"SELECT {self._COLUMNS} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._db.execute(
+                    f"SELECT {self._COLUMNS} FROM checkpoints "
+                    "WHERE thread_id = ? AND checkpoint_ns = ? "
+                    "ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            return self._to_tuple(row) if row else None
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        where, params = [], []
+        if config is not None:
+            where.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (
+                checkpoint_ns := config["configurable"].get("checkpoint_ns")
+            ) is not None:
+                where.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                where.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            where.append("checkpoint_id < ?")
+            params.append(before_id)
+        query = f"SELECT {self._COLUMNS} FROM checkpoints"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY checkpoint_id DESC"
+        if limit is not None and not filter:
+            # the metadata is serialized, so a filter is applied to the loaded rows
+            query += " LIMIT ?"
+            params.append(max(limit, 0))
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+            if filter:
+                rows = [row for row in rows if self._matches(row, filter)]
+            if limit is not None:
+                rows = rows[: max(limit, 0)]
+            # pending writes are only loaded for the returned checkpoints
+            tuples = [self._to_tuple(row) for row in rows]
+        yield from tuples
+
+    def _matches(self, row: tuple, filter: dict[str, Any]) -> bool:
+        metadata = self.serde.loads_typed((row[6], row[7]))
+        return all(metadata.get(k) == v for k, v in filter.items())
+
+    # --- writes ---
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO checkpoints "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    type_,
+                    data,
+                    metadata_type,
+                    metadata_data,
+                    time.time(),
+                    len(data) + len(metadata_data),
+                ),
+            )
+            if self.keep_latest_only:
+                # older rows are never read again, except those delta channels replay
+                self._delete_unused(thread_id, checkpoint_ns, replay_depth(metadata))
+            self._puts += 1
+            if self.retention_interval and self._puts % self.retention_interval == 0:
+                self._enforce_retention()
+            self._db.commit()
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            rows.append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    data,
+                    task_path,
+                    len(data),
+                )
+            )
+        # special channels (errors, interrupts, ...) may be overwritten, regular
+        # writes of a task are only stored once
+        special = all(channel in WRITES_IDX_MAP for channel, _ in writes)
+        verb = "INSERT OR REPLACE" if special else "INSERT OR IGNORE"
+        with self._lock:
+            self._db.executemany(
+                f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._db.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            self._delete_threads([thread_id])
+            self._db.commit()
+
+    def prune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        with self._lock:
+            if strategy == "delete":
+                self._delete_threads(thread_ids)
+            elif strategy == "keep_latest":
+                self._keep_latest(thread_ids)
+            else:
+                raise ValueError(f"Unknown prune strategy '{strategy}'")
+            self._db.commit()
+
+    def _delete_unused(self, thread_id: str, checkpoint_ns: str, depth: int) -> None:
+        """Delete all but the latest `depth + 1` checkpoints of a thread."""
+        for table in ("checkpoints", "writes"):
+            # no-op if the thread has fewer checkpoints (comparison with NULL)
+            self._db.execute(
+                f"DELETE FROM {table} "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ("
+                "SELECT checkpoint_id FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?)",
+                (thread_id, checkpoint_ns, thread_id, checkpoint_ns, depth),
+            )
+
+    def _keep_latest(self, thread_ids: Sequence[str] | None = None) -> None:
+        """Delete the checkpoints the latest one of each thread doesn't need."""
+        query = (
+            "SELECT thread_id, checkpoint_ns, metadata_type, metadata "
+            "FROM checkpoints AS c "
+            "WHERE checkpoint_id = (SELECT MAX(checkpoint_id) FROM checkpoints "
+            "WHERE thread_id = c.thread_id AND checkpoint_ns = c.checkpoint_ns)"
+        )
+        latest = self._db.execute(query).fetchall()
+        for thread_id, checkpoint_ns, metadata_type, metadata in latest:
+            if thread_ids is None or thread_id in thread_ids:
+                depth = replay_depth(self.serde.loads_typed((metadata_type, metadata)))
+                self._delete_unused(thread_id, checkpoint_ns, depth)
+
+    def _delete_threads(self, thread_ids: Sequence[str]) -> None:
+        for table in ("checkpoints", "writes"):
+            self._db.executemany(
+                f"DELETE FROM {table} WHERE thread_id = ?", [(t,) for t in thread_ids]
+            )
+
+    # --- retention ---
+
+    def _enforce_retention(self) -> int:
+        """Delete expired and, if over `max_bytes`, least recently updated threads."""
+        threads = self._db.execute(
+            "SELECT thread_id, MAX(created_at), SUM(size) FROM checkpoints "
+            "GROUP BY thread_id ORDER BY MAX(created_at)"
+        ).fetchall()
+        write_sizes = dict(
+            self._db.execute(
+                "SELECT thread_id, SUM(size) FROM writes GROUP BY thread_id"
+            )
+        )
+        expired = []
+        if self.max_age is not None:
+            cutoff = time.time() - self.max_age
+            expired = [
+                thread_id for thread_id, updated, _ in threads if updated < cutoff
+            ]
+        if self.max_bytes is not None:
+            sizes = [(t, size + write_sizes.get(t, 0)) for t, _, size in threads]
+            total = sum(size for t, size in sizes if t not in expired)
+            for thread_id, size in sizes:  # oldest first
+                if total <= self.max_bytes:
+                    break
+                if thread_id not in expired:
+                    expired.append(thread_id)
+                    total -= size
+        self._delete_threads(expired)
+        return len(expired)
+
+    def compact(self) -> dict:
+        """Apply all retention policies now and shrink the database file."""
+        with self._lock:
+            if self.keep_latest_only:
+                self._keep_latest()
+            deleted_threads = self._enforce_retention()
+            self._db.commit()
+            self._db.execute("VACUUM")
+        return {"deleted_threads": deleted_threads, **self.stats()}
+
+    def stats(self) -> dict:
+        with self._lock:
+            threads, checkpoints, checkpoint_bytes = self._db.execute(
+                "SELECT COUNT(DISTINCT thread_id), COUNT(*), COALESCE(SUM(size), 0) "
+                "FROM checkpoints"
+            ).fetchone()
+            writes, write_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM writes"
+            ).fetchone()
+        return {
+            "threads": threads,
+            "checkpoints": checkpoints,
+            "writes": writes,
+            "bytes": checkpoint_bytes + write_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # --- async API: SQLite calls are short, run them inline like InMemorySaver ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return self.get_tuple(config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        for item in self.list(config, filter=filter, before=before, limit=limit):
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.put(config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.put_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.delete_thread(thread_id)
+
+    async def aprune(
+        self, thread_ids: Sequence[str], *, strategy: str = "keep_latest"
+    ) -> None:
+        self.prune(thread_ids, strategy=strategy)
+
+
+def create_checkpointer() -> BaseCheckpointSaver:
+    """Create the graph's checkpointer from `CHECKPOINT_*` env vars.
+
+    Without `CHECKPOINT_PATH` the state is kept in memory (`InMemorySaver`).
+    """
+    path = os.getenv("CHECKPOINT_PATH") or None
+    if not path:
+        return InMemorySaver(
+            serde=JsonPlusSerializer(allowed_msgpack_modules=ALLOWED_STATE_TYPES)
+        )
+    max_age = os.getenv("CHECKPOINT_MAX_AGE")
+    max_bytes = os.getenv("CHECKPOINT_MAX_BYTES")
+    return SQLiteCheckpointer(
+        path,
+        keep_latest_only=os.getenv("CHECKPOINT_KEEP_HISTORY", "0") != "1",
+        max_age=float(max_age) if max_age else None,
+        max_bytes=int(max_bytes) if max_bytes else None,
+    )
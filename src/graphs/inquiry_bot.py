@@ -1,36 +1,83 @@
-import importlib
+import asyncio
 import os
+import threading
+import time
+from functools import cache
 from typing import TypedDict, Annotated
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from src.agents.workers.inquiry_base import WorkerReply
 
-from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import InMemorySaver
-
 # llm client
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_core.runnables import RunnableConfig
-from dotenv import load_dotenv
-load_dotenv()
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from src.env import load_env
+
+load_env()
 
 import json
 
+from src.agents.supervisors.dimension_router import (
+    DimensionRouter,
+    create_dimension_router,
+)
+from src.agents.supervisors.inquiry_supervisor import InquirySupervisor
+from src.agents.supervisors.stopping_policy import (
+    StoppingPolicy,
+    create_stopping_policy,
+)
+from src.agents.workers.context_compactor import (
+    ContextCompactor,
+    create_context_compactor,
+)
 from src.agents.workers.inquiry_reply_merger import InquiryReplyMerger
-from src.agents.workers.inquiry_base import calculate_worker_metric, ALL_DIMENSIONS, InquiryOther
+from src.agents.workers.local_reply_merger import LocalReplyMerger
+from src.agents.workers.registry import WorkerRegistry, create_worker_registry
+from src.agents.workers.similarity import WorkerAnswers, with_local_similarity
+from src.agents.workers.inquiry_base import calculate_worker_metric
 from src.agents.workers.inquiry_summary import InquirySummary
+from src.llms.concurrency import llm_limiter
+from src.llms.client_pool import (
+    Endpoint,
+    LLMClientPool,
+    as_client_pool,
+    create_client_pool,
+)
+from src.llms.hedging import RequestHedger, create_hedger
+from src.llms.model_routing import ModelRouting, create_model_routing, route_role
+from src.llms.response_cache import ResponseCache, create_response_cache
+from src.llms.usage import TokenMeter, estimate_tokens
+from src.graphs.profiling import RunProfiler, get_profiler, profiled
+from src.graphs.semantic_cache import SemanticCache, create_semantic_cache
 
 
-# import util for worker class
-def get_worker_class(dimension: str):
-    dim_class = dimension.replace(" ", "").replace("'", "")
-    try:
-        module = importlib.import_module(f"src.agents.workers.inquiry_base")
-        return getattr(module, f"Inquiry{dim_class}")
-    except (ImportError, AttributeError):
-        obj = InquiryOther()
-        obj.set_definition(dimension)
-        return obj
+def _configurable(config: RunnableConfig | None, key: str, default):
+    """`config["configurable"][key]` if the run sets it, else the process-wide default.
+
+    An explicit None disables the component for the run, e.g.
+    {"configurable": {"response_cache": None}}.
+    """
+    configurable = (config or {}).get("configurable", {})
+    return configurable[key] if key in configurable else default
+
+
+# worker class per dimension: built-in workers and inquiry_bot.workers entry points
+worker_registry = create_worker_registry()
+
+
+def get_worker_registry(config: RunnableConfig | None = None) -> WorkerRegistry:
+    # a run can plug in its own registry:
+    # {"configurable": {"worker_registry": ...}}
+    configurable = (config or {}).get("configurable", {})
+    return configurable.get("worker_registry") or worker_registry
+
+
+def get_worker_class(dimension: str, config: RunnableConfig | None = None):
+    return get_worker_registry(config).get(dimension)
+
+
+def connection_dimensions(config: RunnableConfig | None = None) -> tuple[str, ...]:
+    """The dimensions a worker may connect its answers to, plugins included."""
+    return tuple(get_worker_registry(config).dimensions)
 
 
 # --- 1. SHARED STATE ---
@@ -44,51 +91,587 @@ def merge_dict(val1: dict, val2: dict) -> dict:
     return res
 
 
+def merge_replies(replies: dict, updates: list[dict | None]) -> dict:
+    # DeltaChannel reducer: one copy per superstep, the latest reply of a
+    # dimension wins; None resets, see init_node
+    merged = dict(replies)
+    for update in updates:
+        if update is None:
+            merged = {}
+        else:
+            merged.update(update)
+    return merged
+
+
+def add_revisions(revisions: dict, updates: list[dict | None]) -> dict:
+    merged = dict(revisions)
+    for update in updates:
+        if update is None:
+            merged = {}
+            continue
+        for dim, count in update.items():
+            merged[dim] = merged.get(dim, 0) + count
+    return merged
+
+
+# checkpoints store only the replies changed in a step, plus the full dict every
+# REPLY_SNAPSHOT_FREQUENCY updates; older replies are restored by replaying those writes
+REPLY_SNAPSHOT_FREQUENCY = int(os.getenv("REPLY_SNAPSHOT_FREQUENCY", "4"))
+
+
 class AgentState(TypedDict):
     inquiry: str
     active_workers: list[str]
     deactivated_workers: list[str]
     loop_count: int
     stop: bool
-    worker_replies: Annotated[dict[str, WorkerReply], merge_dict]
+    worker_replies: dict[
+        str, WorkerReply
+    ]  # merged per dimension, see graph_state_schema
+    reply_revisions: dict[
+        str, int
+    ]  # per dimension: number of prelim/cross steps that changed its reply
+    changed_dimensions: list[
+        str
+    ]  # dimensions whose reply changed in the latest prelim/cross step
+    delivered_edges: list[
+        tuple[str, str, str]
+    ]  # (from_dim, answer, to_dim) already sent in a cross loop
     summary: str | None
+    cross_timing: dict | None  # per-dimension critical path of the latest cross loop
+    routing: dict | None  # dimensions selected by the router, see router_node
+    # InquirySupervisor.calculate_metric of worker_replies
+    supervisor_metric: float | None
+    stop_reason: str | None  # see StoppingPolicy
+    started_at: float  # time.time() when the run started, for the latency budget
+    tokens_used: int  # estimated tokens of all LLM calls, for the token budget
+    # {"mode", "similarity", "inquiry"} of the near-duplicate used, if any
+    semantic_cache: dict | None
+
+
+@cache
+def graph_state_schema() -> type:
+    """`AgentState` with the channels of the graph; imports LangGraph.
+
+    `worker_replies` and `reply_revisions` are `DeltaChannel`s: nodes write
+    only the changed dimensions, which the reducers merge.
+    """
+    from langgraph.channels.delta import DeltaChannel
+
+    fields = {
+        **AgentState.__annotations__,
+        "worker_replies": Annotated[
+            dict[str, WorkerReply],
+            DeltaChannel(merge_replies, snapshot_frequency=REPLY_SNAPSHOT_FREQUENCY),
+        ],
+        "reply_revisions": Annotated[
+            dict[str, int],
+            DeltaChannel(add_revisions, snapshot_frequency=REPLY_SNAPSHOT_FREQUENCY),
+        ],
+    }
+    return TypedDict("AgentState", fields)
 
 
 
 
 # --- 2. NODE WRAPPERS ---
-llm = ChatGoogleGenerativeAI(
-    model="gemini-2.5-flash-lite",
-    temperature=0,
-    api_key=os.getenv("GEMINI_API_KEY"),
-)
+# shared by all runs: rate limits, retries and circuit breakers per endpoint
+# (LLM_* env vars);
+# created on first use, creating the client imports the provider SDK
+_llm: LLMClientPool | None = None
+_build_lock = threading.Lock()
+
+
+def get_default_llm() -> LLMClientPool:
+    global _llm
+    with _build_lock:
+        if _llm is None:
+            _llm = create_client_pool()
+        return _llm
+
+
+# MODEL_ROUTING=profile.json: a model, temperature and timeout per role and dimension
+model_routing = create_model_routing()
 
 
+def get_model_routing(config: RunnableConfig | None = None) -> ModelRouting | None:
+    # None: every call goes to the default pool
+    return _configurable(config, "model_routing", model_routing)
+
+
+def get_llm(config: RunnableConfig | None = None, call: dict | None = None):
+    # a run can plug in its own client or pool:
+    # {"configurable": {"llm": FakeLLM()}}
+    configurable = (config or {}).get("configurable", {})
+    if configurable.get("llm"):
+        return configurable["llm"]
+    routing = get_model_routing(config)
+    if routing is not None and call:
+        return routing.client(route_role(call), call.get("dimension"))
+    return get_default_llm()
+
+
+# identical prompts at temperature=0 return the cached reply without a network call
+response_cache = create_response_cache()
+
+
+def get_response_cache(config: RunnableConfig | None = None) -> ResponseCache | None:
+    return _configurable(config, "response_cache", response_cache)
+
+
+# LOCAL_SIMILARITY=1: models don't emit similarity_scores, they are computed locally
+LOCAL_SIMILARITY = os.getenv("LOCAL_SIMILARITY", "0") == "1"
+
+
+def use_local_similarity(config: RunnableConfig | None = None) -> bool:
+    value = (config or {}).get("configurable", {}).get("local_similarity")
+    return LOCAL_SIMILARITY if value is None else value
+
+
+def reply_schema(schema, config: RunnableConfig | None = None):
+    if schema is WorkerReply and use_local_similarity(config):
+        return WorkerAnswers
+    return schema
+
+
+def _finish_reply(response, schema):
+    # add locally computed similarity_scores to replies returned without them
+    return with_local_similarity(response) if schema is WorkerAnswers else response
+
+
+def _cache_key(
+    model: str, temperature, system_content: str, human_content: str, schema
+) -> str:
+    return ResponseCache.make_key(
+        model,
+        temperature,
+        schema.__name__ if schema else "text",
+        system_content,
+        human_content,
+    )
+
+
+def _lookup_cache(
+    pool: LLMClientPool, system_content: str, human_content: str, config, schema
+):
+    """Return (cache, cached response or None) for an LLM call.
+
+    Replies are cached under the model that served them; the endpoints of a
+    pool are interchangeable, so a reply of any of its models is a hit.
+    """
+    cache = get_response_cache(config)
+    if cache is None:
+        return None, None
+    for model, temperature in pool.identities:
+        cached = cache.get(
+            _cache_key(model, temperature, system_content, human_content, schema)
+        )
+        if cached is not None:
+            return cache, schema.model_validate_json(cached) if schema else cached
+    return cache, None
+
+
+def _store_cache(
+    cache: ResponseCache | None,
+    endpoint: Endpoint,
+    system_content: str,
+    human_content: str,
+    response,
+    schema,
+) -> None:
+    if cache is not None:
+        key = _cache_key(
+            endpoint.model,
+            endpoint.temperature,
+            system_content,
+            human_content,
+            schema,
+        )
+        cache.set(key, response.model_dump_json() if schema else response)
+
+
+# LLM_HEDGING=1: slow worker and merger calls get a duplicate request, first reply wins
+hedger = create_hedger()
+HEDGED_ROLES = ("worker", "merger")
+
+
+def get_hedger(config: RunnableConfig | None = None) -> RequestHedger | None:
+    return _configurable(config, "hedger", hedger)
+
+
+def _hedge_key(
+    pool: LLMClientPool, call: dict | None, config
+) -> tuple[RequestHedger | None, str]:
+    role = (call or {}).get("role")
+    if role not in HEDGED_ROLES:
+        return None, ""
+    # latencies differ by role (prompt and reply size) and model
+    models = ",".join(model for model, _ in pool.identities)
+    return get_hedger(config), f"{role}:{models}"
+
+
+def _invoke_pool(
+    pool: LLMClientPool, messages, schema, config, call
+) -> tuple[object, int, Endpoint, dict | None]:
+    hedger, key = _hedge_key(pool, call, config)
+    if hedger is None:
+        return *pool.invoke(messages, schema, config), None
+    (response, retries, endpoint), hedge = hedger.invoke(
+        key, lambda: pool.invoke(messages, schema, config)
+    )
+    return response, retries, endpoint, hedge
+
 
-def init_node(state: AgentState):
+async def _ainvoke_pool(
+    pool: LLMClientPool, messages, schema, config, call
+) -> tuple[object, int, Endpoint, dict | None]:
+    hedger, key = _hedge_key(pool, call, config)
+    if hedger is None:
+        return *(await pool.ainvoke(messages, schema, config)), None
+    # the caller holds a limiter slot for the primary; the duplicate takes its own
+    (response, retries, endpoint), hedge = await hedger.ainvoke(
+        key, lambda: pool.ainvoke(messages, schema, config), slot=llm_limiter
+    )
+    return response, retries, endpoint, hedge
+
+
+def _record_call(
+    profiler: RunProfiler | None,
+    meter: TokenMeter | None,
+    call: dict | None,
+    started: float,
+    system_content: str,
+    human_content: str,
+    response,
+    schema,
+    cache_status: str,
+    queue_wait: float = 0.0,
+    error: str | None = None,
+    retries: int = 0,
+    hedge: dict | None = None,
+) -> None:
+    output = (
+        "" if response is None else (response.model_dump_json() if schema else response)
+    )
+    prompt_tokens = estimate_tokens(system_content) + estimate_tokens(human_content)
+    completion_tokens = estimate_tokens(output)
+    if meter is not None and cache_status != "hit":
+        meter.add(prompt_tokens + completion_tokens)
+    if profiler is not None:
+        call = call or {}
+        profiler.record_call(
+            node=call.get("node", ""),
+            role=call.get("role", ""),
+            dimension=call.get("dimension"),
+            loop=call.get("loop"),
+            start=started - profiler.t0,
+            wall_time=time.perf_counter() - started,
+            queue_wait=call.get("queue_wait", 0.0) + queue_wait,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            retries=retries,
+            cache=cache_status,
+            context_tokens=call.get("context_tokens"),
+            raw_context_tokens=call.get("raw_context_tokens"),
+            error=error,
+            **(hedge or {}),
+        )
+
+
+class _LLMCall:
+    """Cache lookup, profiling and cache store around one LLM request.
+
+    `invoke_llm` and `ainvoke_llm` only differ in how the request is sent.
+    """
+
+    def __init__(self, system_content, human_content, config, schema, meter, call):
+        self.system_content, self.human_content = system_content, human_content
+        self.config, self.schema, self.meter, self.call = config, schema, meter, call
+        self.pool = as_client_pool(get_llm(config, call))
+        self.profiler = get_profiler(config)
+        self.started = time.perf_counter()
+        self.queue_wait = 0.0
+        self.cache, self.cached = _lookup_cache(
+            self.pool, system_content, human_content, config, schema
+        )
+        self.cache_status = "off" if self.cache is None else "miss"
+
+    @property
+    def messages(self) -> list:
+        return [
+            SystemMessage(content=self.system_content),
+            HumanMessage(content=self.human_content),
+        ]
+
+    def cached_reply(self):
+        """The cached reply (recorded as a hit), or None."""
+        if self.cached is None:
+            return None
+        self._record(self.cached, "hit", meter=self.meter)
+        return _finish_reply(self.cached, self.schema)
+
+    def waited(self, queue_wait: float) -> None:
+        # time waiting for the limiter counts as queue wait, not call time
+        self.queue_wait = queue_wait
+        self.started += queue_wait
+
+    def failed(self, error: Exception) -> None:
+        self._record(None, error=f"{type(error).__name__}: {error}")
+
+    def finish(self, response, retries: int, endpoint: Endpoint, hedge: dict | None):
+        if not self.schema:
+            response = response.content
+        self._record(response, meter=self.meter, retries=retries, hedge=hedge)
+        _store_cache(
+            self.cache,
+            endpoint,
+            self.system_content,
+            self.human_content,
+            response,
+            self.schema,
+        )
+        return _finish_reply(response, self.schema)
+
+    def _record(self, response, cache_status: str | None = None, meter=None, **fields):
+        _record_call(
+            self.profiler,
+            meter,
+            self.call,
+            self.started,
+            self.system_content,
+            self.human_content,
+            response,
+            self.schema,
+            cache_status or self.cache_status,
+            self.queue_wait,
+            **fields,
+        )
+
+
+def invoke_llm(
+    system_content: str,
+    human_content: str,
+    config: RunnableConfig,
+    schema=None,
+    meter: TokenMeter | None = None,
+    call: dict | None = None,
+):
+    """Invoke the LLM (structured if `schema` is given) through the response cache.
+
+    Tokens of uncached calls are added to `meter`. With a profiler in the
+    config, the call is recorded with the tags in `call` (node, role,
+    dimension, loop and the queue_wait before the call started).
+    """
+    llm_call = _LLMCall(system_content, human_content, config, schema, meter, call)
+    if (cached := llm_call.cached_reply()) is not None:
+        return cached
+    try:
+        result = _invoke_pool(llm_call.pool, llm_call.messages, schema, config, call)
+    except Exception as e:
+        llm_call.failed(e)
+        raise
+    return llm_call.finish(*result)
+
+
+async def ainvoke_llm(
+    system_content: str,
+    human_content: str,
+    config: RunnableConfig,
+    schema=None,
+    meter: TokenMeter | None = None,
+    call: dict | None = None,
+):
+    """Async `invoke_llm`; in-flight requests are bounded by the shared limiter."""
+    llm_call = _LLMCall(system_content, human_content, config, schema, meter, call)
+    if (cached := llm_call.cached_reply()) is not None:
+        return cached
+    waiting = time.perf_counter()
+    async with llm_limiter:
+        llm_call.waited(time.perf_counter() - waiting)
+        try:
+            result = await _ainvoke_pool(
+                llm_call.pool, llm_call.messages, schema, config, call
+            )
+        except Exception as e:
+            llm_call.failed(e)
+            raise
+    return llm_call.finish(*result)
+
+
+def init_node(state: AgentState, config: RunnableConfig):
     return {
-        "active_workers": ALL_DIMENSIONS,
+        "active_workers": get_worker_registry(config).dimensions,
         "deactivated_workers": [],
+        # a rerun on the same thread id starts from scratch, not from the last
+        # run's replies
+        "worker_replies": None,
+        "reply_revisions": None,
+        "changed_dimensions": [],
+        "delivered_edges": [],
         "loop_count": 0,
         "stop": False,
-        "summary": None
+        "summary": None,
+        "supervisor_metric": None,
+        "stop_reason": None,
+        "started_at": time.time(),
+        "tokens_used": 0,
+    }
+
+
+# SEMANTIC_CACHE=1: reuse, or start from, the result of a near-duplicate inquiry
+semantic_cache = create_semantic_cache()
+
+
+def get_semantic_cache(config: RunnableConfig | None = None) -> SemanticCache | None:
+    return _configurable(config, "semantic_cache", semantic_cache)
+
+
+def semantic_cache_node(state: AgentState, config: RunnableConfig):
+    cache = get_semantic_cache(config)
+    match = cache.lookup(state["inquiry"]) if cache is not None else None
+    if match is None:
+        return {"semantic_cache": None}
+    replies = {
+        dim: WorkerReply.model_validate(reply)
+        for dim, reply in match["result"]["worker_replies"].items()
+    }
+    update = {
+        **reply_delta(state, replies),
+        "semantic_cache": {
+            key: match[key] for key in ("mode", "similarity", "inquiry")
+        },
+    }
+    if match["mode"] == "hit":
+        # the stored result is the answer, no LLM calls
+        update.update(
+            summary=match["result"]["summary"],
+            stop=True,
+            stop_reason=f"semantic cache hit (similarity {match['similarity']:.2f})",
+        )
+    else:
+        # seed: skip the prelim stage, the cross loops adapt the neighbour's replies
+        update["supervisor_metric"] = InquirySupervisor.calculate_metric(
+            merge_dict(state.get("worker_replies"), replies)
+        )
+    return update
+
+
+def remember_result(
+    state: AgentState, summary: str | None, config: RunnableConfig
+) -> None:
+    cache = get_semantic_cache(config)
+    if cache is None or not summary:
+        return
+    replies = state.get("worker_replies") or {}
+    cache.store(
+        state["inquiry"],
+        {
+            "summary": summary,
+            "worker_replies": {
+                dim: reply.model_dump() for dim, reply in replies.items()
+            },
+        },
+    )
+
+
+# DIMENSION_ROUTER=1: prelim calls only for the dimensions a local model
+# expects to pay off
+dimension_router = create_dimension_router(
+    worker_registry.dimensions, worker_registry.get
+)
+
+
+def get_dimension_router(
+    config: RunnableConfig | None = None,
+) -> DimensionRouter | None:
+    return _configurable(config, "dimension_router", dimension_router)
+
+
+def router_node(state: AgentState, config: RunnableConfig):
+    router = get_dimension_router(config)
+    if router is None:
+        return {"routing": None}
+    routing = router.route(state["inquiry"])
+    return {"active_workers": routing["selected"], "routing": routing}
+
+
+HUMAN_PROMPT = (
+    "Please process the inquiry and provide the structured list as requested."
+)
+
+
+# adaptive end of the cross loop, see StoppingPolicy and the STOP_* env vars
+stopping_policy = create_stopping_policy()
+
+
+def get_stopping_policy(config: RunnableConfig | None = None) -> StoppingPolicy:
+    # a run can plug in its own policy, e.g. {"configurable": {"stopping_policy": ...}}
+    configurable = (config or {}).get("configurable", {})
+    return configurable.get("stopping_policy") or stopping_policy
+
+
+def reply_delta(state: AgentState, results: dict) -> dict:
+    """Channel writes of a step's replies; unchanged replies aren't written again."""
+    previous = state.get("worker_replies") or {}
+    changed = {
+        dim: reply for dim, reply in results.items() if previous.get(dim) != reply
+    }
+    return {
+        "worker_replies": changed,
+        "reply_revisions": dict.fromkeys(changed, 1),
+        "changed_dimensions": list(changed),
+    }
+
+
+def prelim_update(
+    state: AgentState, results: dict, meter: TokenMeter, config: RunnableConfig
+) -> dict:
+    tokens_used = state["tokens_used"] + meter.total
+    reason = get_stopping_policy(config).budget_exhausted(
+        time.time() - state["started_at"], tokens_used
+    )
+    return {
+        **reply_delta(state, results),
+        "supervisor_metric": InquirySupervisor.calculate_metric(
+            merge_dict(state.get("worker_replies"), results)
+        ),
+        "tokens_used": tokens_used,
+        "stop": reason is not None,
+        "stop_reason": reason,
     }
 
 
-HUMAN_PROMPT = "Please process the inquiry and provide the structured list as requested."
+def prelim_request(state: AgentState, name: str, config: RunnableConfig):
+    """The system prompt, output schema and call tags of a prelim worker call."""
+    worker_class = get_worker_class(name, config)  # get Inquiry<Dimension> class
+    system_content = worker_class.render_prompt(
+        state["inquiry"],
+        request_similarity=not use_local_similarity(config),
+        dimensions=connection_dimensions(config),
+    )  # create prompt
+    call = {
+        "node": "prelim_nodes",
+        "role": "worker",
+        "dimension": name,
+        "loop": state["loop_count"],
+    }
+    return system_content, reply_schema(worker_class.output_schema, config), call
+
 
 def prelim_nodes(state: AgentState, config: RunnableConfig):
-    # loop over state.active_workers (ALL_DIMENSIONS) to create batch of inline requests
+    # loop over state.active_workers (all registered dimensions) to create batch of
+    # inline requests
     results = {}
-    
+    meter = TokenMeter()
+    submitted = time.perf_counter()
+
     def process_worker(name):
-        worker_class = get_worker_class(name)  # get Inquiry<Dimension> class
-        system_content = worker_class.render_prompt(state["inquiry"]) # create prompt
-        structured_llm = llm.with_structured_output(worker_class.output_schema) # set output schema
-        response = structured_llm.invoke([
-            SystemMessage(content=system_content),
-            HumanMessage(content=HUMAN_PROMPT)
-        ], config=config) # invoke llm
+        queue_wait = time.perf_counter() - submitted
+        system_content, schema, call = prelim_request(state, name, config)
+        call["queue_wait"] = queue_wait
+        response = invoke_llm(
+            system_content, HUMAN_PROMPT, config, schema=schema, meter=meter, call=call
+        )  # invoke llm (or read from cache)
         return name, response
 
     with ThreadPoolExecutor() as executor:
@@ -97,13 +680,29 @@ def prelim_nodes(state: AgentState, config: RunnableConfig):
             name = futures[future]
             _, response = future.result()
             results[name] = response
-            
-    return {"worker_replies": results}
+
+    return prelim_update(state, results, meter, config)
+
+
+async def aprelim_nodes(state: AgentState, config: RunnableConfig):
+    meter = TokenMeter()
+
+    async def process_worker(name):
+        system_content, schema, call = prelim_request(state, name, config)
+        response = await ainvoke_llm(
+            system_content, HUMAN_PROMPT, config, schema=schema, meter=meter, call=call
+        )
+        return name, response
+
+    replies = await asyncio.gather(
+        *(process_worker(name) for name in state["active_workers"])
+    )
+    return prelim_update(state, dict(replies), meter, config)
 
 
 MERGER_PROMPT = "Please process the previous texts and merge the overlapping contents efficiently."
 
-def cross_nodes(state: AgentState, config: RunnableConfig):
+def collect_cross_inputs(state: AgentState) -> dict[str, list[dict]]:
     # use the answers
     new_inputs = {}
     for from_dim, reply in state["worker_replies"].items():
@@ -120,111 +719,568 @@ def cross_nodes(state: AgentState, config: RunnableConfig):
                 new_inputs[to_dim] = [ans]
             else:
                 new_inputs[to_dim].append(ans)
-    
-    # combine previous answer to prompt
+    return new_inputs
+
+
+# CONTEXT_COMPACTION=1: deduplicated, top-k, line-encoded context instead of
+# the JSON dump
+context_compactor = create_context_compactor()
+
+
+def get_context_compactor(
+    config: RunnableConfig | None = None,
+) -> ContextCompactor | None:
+    # None: the context is the JSON dump of the answers
+    return _configurable(config, "context_compactor", context_compactor)
+
+
+def render_context(answers: list[dict], config: RunnableConfig) -> tuple[str, dict]:
+    compactor = get_context_compactor(config)
+    if compactor is not None:
+        return compactor.compact(answers)
+    context = json.dumps(answers)
+    tokens = estimate_tokens(context)
+    return context, {
+        "answers": len(answers),
+        "kept": len(answers),
+        "raw_tokens": tokens,
+        "tokens": tokens,
+    }
+
+
+def render_cross_prompt(
+    state: AgentState, to_dim: str, answers: list[dict], config: RunnableConfig
+):
+    """The system prompt, output schema and context token stats of a cross call."""
+    worker_class = get_worker_class(to_dim, config)
+    additional_context, context_stats = render_context(answers, config)
+    system_content = worker_class.render_prompt(
+        inquiry=state["inquiry"],
+        additional_context=additional_context,
+        request_similarity=not use_local_similarity(config),
+        dimensions=connection_dimensions(config),
+    )
+    return (
+        system_content,
+        reply_schema(worker_class.output_schema, config),
+        context_stats,
+    )
+
+
+def select_reply(
+    dim: str,
+    previous_reply: WorkerReply,
+    answer: WorkerReply,
+    merged_reply: WorkerReply,
+):
+    # metric check to save or deactivate
+    prev_metric = calculate_worker_metric(previous_reply)
+    new_metric = calculate_worker_metric(merged_reply)
+    if new_metric > prev_metric:
+        return dim, merged_reply, None
+    else:
+        return dim, answer, dim
+
+
+def summarize_cross_timing(
+    loop: int, timings: dict[str, dict], loop_time: float, skipped_calls: int = 0
+) -> dict:
+    """Per-dimension critical path of one cross loop.
+
+    `done` is measured from the loop start, i.e. it includes time spent queued.
+    With the pipelined stage the loop takes ~max(cross + merge) instead of
+    max(cross) + max(merge); both are reported for comparison. `skipped_calls`
+    counts the dimensions that had connections but none new, see `frontier_inputs`.
+    """
+    critical = max(timings, key=lambda d: timings[d]["done"], default=None)
+    return {
+        "loop": loop,
+        "loop_time": loop_time,
+        "calls": len(timings),
+        "skipped_calls": skipped_calls,
+        "critical_dimension": critical,
+        "max_cross_plus_merge": max(
+            (t["cross"] + t["merge"] for t in timings.values()), default=0.0
+        ),
+        "context_tokens": sum(t.get("context_tokens", 0) for t in timings.values()),
+        "raw_context_tokens": sum(
+            t.get("raw_context_tokens", 0) for t in timings.values()
+        ),
+        "max_cross_plus_max_merge": (
+            max((t["cross"] for t in timings.values()), default=0.0)
+            + max((t["merge"] for t in timings.values()), default=0.0)
+        ),
+        "dimensions": timings,
+    }
+
+
+def cross_edges(inputs: dict[str, list[dict]]) -> set[tuple[str, str, str]]:
+    # (from_dim, answer, to_dim) of every answer sent to another dimension
+    return {
+        (a["from_dim"], a["answer"], to_dim)
+        for to_dim, answers in inputs.items()
+        for a in answers
+    }
+
+
+def get_delivered_edges(state: AgentState) -> set[tuple[str, str, str]]:
+    # the checkpointer may hand the tuples back as lists
+    return {tuple(edge) for edge in state.get("delivered_edges") or ()}
+
+
+def frontier_inputs(
+    inputs: dict[str, list[dict]], delivered: set[tuple[str, str, str]]
+) -> dict[str, list[dict]]:
+    """The answers of `inputs` that weren't delivered yet.
+
+    Dimensions without any new answer are dropped.
+
+    A dimension has absorbed the answers of earlier loops into its reply, so
+    it is only queried again with the connections that are new to it.
+    """
+    frontier = {}
+    for to_dim, answers in inputs.items():
+        new = [
+            a for a in answers if (a["from_dim"], a["answer"], to_dim) not in delivered
+        ]
+        if new:
+            frontier[to_dim] = new
+    return frontier
+
+
+def cross_update(
+    state: AgentState,
+    sent: dict[str, list[dict]],
+    merges: list[tuple],
+    timings: dict[str, dict],
+    loop_time: float,
+    meter: TokenMeter,
+    config: RunnableConfig,
+    skipped_calls: int = 0,
+) -> dict:
     results = {}
-    
-    def process_cross_worker(to_dim, answers):
-        worker_class = get_worker_class(to_dim)
-        system_content = worker_class.render_prompt(
-            inquiry=state["inquiry"], 
-            additional_context=json.dumps(answers))
-        structured_llm = llm.with_structured_output(worker_class.output_schema)
-        response = structured_llm.invoke([
-            SystemMessage(content=system_content),
-            HumanMessage(content=HUMAN_PROMPT)
-        ], config=config)
-        return to_dim, response
+    deactivated = list(state["deactivated_workers"])
+    for dim, merged_reply, deactivated_dim in merges:
+        if deactivated_dim:
+            deactivated.append(deactivated_dim)
+        if merged_reply is not None:
+            results[dim] = merged_reply
 
-    with ThreadPoolExecutor() as executor:
-        futures = {executor.submit(process_cross_worker, to_dim, answers): to_dim for to_dim, answers in new_inputs.items()}
-        for future in futures:
-            to_dim = futures[future]
-            _, response = future.result()
-            results[to_dim] = response
-    
-    # merge previous answers
+    # stop if the supervisor metric converged, nothing new would be sent or a
+    # budget is spent
+    replies = merge_dict(state["worker_replies"], results)
+    delivered = get_delivered_edges(state) | cross_edges(sent)
+    next_inputs = collect_cross_inputs(
+        {"worker_replies": replies, "deactivated_workers": deactivated}
+    )
+    new_connections = cross_edges(next_inputs) - delivered
+    metric = InquirySupervisor.calculate_metric(replies)
+    tokens_used = state["tokens_used"] + meter.total
+    reason = get_stopping_policy(config).stop_reason(
+        loop_count=state["loop_count"] + 1,
+        previous_metric=state["supervisor_metric"],
+        metric=metric,
+        new_connections=len(new_connections),
+        elapsed=time.time() - state["started_at"],
+        tokens_used=tokens_used,
+    )
+    return {
+        **reply_delta(state, results),
+        "loop_count": state["loop_count"] + 1,
+        "stop": reason is not None,
+        "stop_reason": reason,
+        "supervisor_metric": metric,
+        "tokens_used": tokens_used,
+        "deactivated_workers": deactivated,
+        "delivered_edges": sorted(delivered),
+        "cross_timing": summarize_cross_timing(
+            state["loop_count"], timings, loop_time, skipped_calls
+        ),
+    }
+
+
+MERGER_MODES = ("llm", "local", "hybrid")
+MERGER_MODE = os.getenv("MERGER_MODE", "llm")
+
+
+def local_merge(
+    previous_reply: WorkerReply, answer: WorkerReply, config: RunnableConfig
+):
+    """Merge locally unless the merger mode asks for the LLM; None means: call the LLM.
+
+    "llm" always calls the LLM, "local" never does, and "hybrid" only calls it
+    when a same-type answer pair is close to the similarity threshold.
+    """
+    mode = (config or {}).get("configurable", {}).get("merger_mode") or MERGER_MODE
+    if mode not in MERGER_MODES:
+        raise ValueError(
+            f"Unknown merger mode '{mode}', expected one of {MERGER_MODES}"
+        )
+    if mode == "llm":
+        return None
+    if mode == "hybrid" and LocalReplyMerger.is_ambiguous(previous_reply, answer):
+        return None
+    merged_reply = LocalReplyMerger.merge(previous_reply, answer)
+    return (
+        with_local_similarity(merged_reply)
+        if use_local_similarity(config)
+        else merged_reply
+    )
+
+
+def merge_without_llm(
+    previous: dict, dim: str, answer: WorkerReply, config: RunnableConfig
+):
+    """The merge result if no merger call is needed, else None."""
+    if dim not in previous:
+        return dim, answer, None
+    merged_reply = local_merge(previous[dim], answer, config)
+    if merged_reply is not None:
+        return select_reply(dim, previous[dim], answer, merged_reply)
+    return None
+
+
+def merger_request(
+    previous_reply: WorkerReply,
+    answer: WorkerReply,
+    config: RunnableConfig,
+    call: dict | None = None,
+):
+    """The system prompt, output schema and call tags of a merger call."""
+    merger_content = InquiryReplyMerger.render_prompt(
+        previous_reply=previous_reply,
+        current_reply=answer,
+        request_similarity=not use_local_similarity(config),
+    )
+    call = {
+        **(call or {}),
+        "role": "merger",
+        "queue_wait": 0.0,
+        "context_tokens": None,
+        "raw_context_tokens": None,
+    }
+    return (
+        merger_content,
+        reply_schema(InquiryReplyMerger.output_schema, config),
+        call,
+    )
+
+
+def merge_reply(
+    previous: dict,
+    dim: str,
+    answer: WorkerReply,
+    config: RunnableConfig,
+    meter: TokenMeter | None = None,
+    call: dict | None = None,
+):
+    if (merge := merge_without_llm(previous, dim, answer, config)) is not None:
+        return merge
+    merger_content, schema, call = merger_request(previous[dim], answer, config, call)
+    merged_reply = invoke_llm(
+        merger_content, MERGER_PROMPT, config, schema=schema, meter=meter, call=call
+    )
+    return select_reply(dim, previous[dim], answer, merged_reply)
+
+
+async def amerge_reply(
+    previous: dict,
+    dim: str,
+    answer: WorkerReply,
+    config: RunnableConfig,
+    meter: TokenMeter | None = None,
+    call: dict | None = None,
+):
+    if (merge := merge_without_llm(previous, dim, answer, config)) is not None:
+        return merge
+    merger_content, schema, call = merger_request(previous[dim], answer, config, call)
+    merged_reply = await ainvoke_llm(
+        merger_content, MERGER_PROMPT, config, schema=schema, meter=meter, call=call
+    )
+    return select_reply(dim, previous[dim], answer, merged_reply)
+
+
+def cross_request(
+    state: AgentState, to_dim: str, answers: list[dict], config: RunnableConfig
+):
+    """The system prompt, output schema and call tags of a cross worker call."""
+    system_content, schema, context_stats = render_cross_prompt(
+        state, to_dim, answers, config
+    )
+    call = {
+        "node": "cross_nodes",
+        "role": "worker",
+        "dimension": to_dim,
+        "loop": state["loop_count"],
+        "context_tokens": context_stats["tokens"],
+        "raw_context_tokens": context_stats["raw_tokens"],
+    }
+    return system_content, schema, call
+
+
+def cross_timing(call: dict, loop_start: float, started: float, crossed: float):
+    """Timing of one dimension's cross and merge call, see `summarize_cross_timing`."""
+    done = time.perf_counter()
+    return {
+        "queued": started - loop_start,
+        "cross": crossed - started,
+        "merge": done - crossed,
+        "done": done - loop_start,
+        "context_tokens": call["context_tokens"],
+        "raw_context_tokens": call["raw_context_tokens"],
+    }
+
+
+def cross_inputs(state: AgentState) -> tuple[dict, dict]:
+    """All cross inputs and those not delivered in an earlier loop."""
+    inputs = collect_cross_inputs(state)
+    return inputs, frontier_inputs(inputs, get_delivered_edges(state))
+
+
+def cross_nodes(state: AgentState, config: RunnableConfig):
+    # only the connections not delivered in an earlier loop
+    inputs, new_inputs = cross_inputs(state)
     previous = state.get("worker_replies", {})
-    deactivated = list(state["deactivated_workers"])
-    
-    def process_merge(dim, answer):
-        if dim not in previous:
-            return dim, answer, None
-        merger_content = InquiryReplyMerger.render_prompt(
-            previous_reply=previous[dim], current_reply=answer)
-        merger_llm = llm.with_structured_output(InquiryReplyMerger.output_schema)
-        merged_reply = merger_llm.invoke([
-            SystemMessage(content=merger_content),
-            HumanMessage(content=MERGER_PROMPT)], config=config)
-        
-        # metric check to save or deactivate
-        prev_metric = calculate_worker_metric(previous[dim])
-        new_metric = calculate_worker_metric(merged_reply)
-        if new_metric > prev_metric:
-            return dim, merged_reply, None
-        else:
-            return dim, answer, dim
+    loop_start = time.perf_counter()
+    meter = TokenMeter()
+
+    # pipeline: each dimension is merged as soon as its own cross reply arrives
+    def process_dimension(to_dim, answers):
+        started = time.perf_counter()
+        system_content, schema, call = cross_request(state, to_dim, answers, config)
+        call["queue_wait"] = started - loop_start
+        answer = invoke_llm(
+            system_content, HUMAN_PROMPT, config, schema=schema, meter=meter, call=call
+        )
+        crossed = time.perf_counter()
+        merge = merge_reply(previous, to_dim, answer, config, meter, call)
+        return merge, cross_timing(call, loop_start, started, crossed)
 
+    by_dim, timings = {}, {}
     with ThreadPoolExecutor() as executor:
-        merge_futures = [executor.submit(process_merge, dim, answer) for dim, answer in results.items()]
-        results = {}
-        for future in merge_futures:
-            dim, merged_reply, deactivated_dim = future.result()
-            if deactivated_dim:
-                deactivated.append(deactivated_dim)
-            if merged_reply is not None:
-                results[dim] = merged_reply
-
-    # done
+        futures = [
+            executor.submit(process_dimension, to_dim, answers)
+            for to_dim, answers in new_inputs.items()
+        ]
+        for future in as_completed(futures):
+            merge, timing = future.result()
+            by_dim[merge[0]] = merge
+            timings[merge[0]] = timing
+    merges = [by_dim[dim] for dim in new_inputs]  # deterministic order
+
+    return cross_update(
+        state,
+        new_inputs,
+        merges,
+        timings,
+        time.perf_counter() - loop_start,
+        meter,
+        config,
+        skipped_calls=len(inputs) - len(new_inputs),
+    )
+
+
+async def across_nodes(state: AgentState, config: RunnableConfig):
+    # only the connections not delivered in an earlier loop
+    inputs, new_inputs = cross_inputs(state)
+    previous = state.get("worker_replies", {})
+    loop_start = time.perf_counter()
+    meter = TokenMeter()
+
+    async def process_dimension(to_dim, answers):
+        started = time.perf_counter()
+        system_content, schema, call = cross_request(state, to_dim, answers, config)
+        answer = await ainvoke_llm(
+            system_content, HUMAN_PROMPT, config, schema=schema, meter=meter, call=call
+        )
+        crossed = time.perf_counter()
+        merge = await amerge_reply(previous, to_dim, answer, config, meter, call)
+        return merge, cross_timing(call, loop_start, started, crossed)
+
+    results = await asyncio.gather(
+        *(process_dimension(to_dim, answers) for to_dim, answers in new_inputs.items())
+    )
+    merges = [merge for merge, _ in results]
+    timings = {merge[0]: timing for merge, timing in results}
+    return cross_update(
+        state,
+        new_inputs,
+        merges,
+        timings,
+        time.perf_counter() - loop_start,
+        meter,
+        config,
+        skipped_calls=len(inputs) - len(new_inputs),
+    )
+
+
+SUMMARY_PROMPT = "Please provide the final synthesized summary."
+
+
+def summary_call(state: AgentState) -> dict:
     return {
-        "worker_replies": results,
-        "loop_count": state["loop_count"] + 1,
-        "stop": state["loop_count"] >= 2,
-        "deactivated_workers": deactivated
+        "node": "summarizer",
+        "role": "summarizer",
+        "dimension": None,
+        "loop": state["loop_count"],
     }
 
 
-def summarizer_node(state: AgentState):
+def summarizer_node(state: AgentState, config: RunnableConfig):
     inquiry = state["inquiry"]
     worker_replies = state.get("worker_replies", {})
 
     system_content = InquirySummary.render_prompt(inquiry, worker_replies)
 
-    response = llm.invoke(
-        [
-            SystemMessage(content=system_content),
-            HumanMessage(content="Please provide the final synthesized summary."),
-        ]
+    summary = invoke_llm(
+        system_content, SUMMARY_PROMPT, config, call=summary_call(state)
     )
+    remember_result(state, summary, config)
 
-    return {"summary": response.content}
+    return {"summary": summary}
+
+
+async def asummarizer_node(state: AgentState, config: RunnableConfig):
+    system_content = InquirySummary.render_prompt(
+        state["inquiry"], state.get("worker_replies", {})
+    )
+    summary = await ainvoke_llm(
+        system_content, SUMMARY_PROMPT, config, call=summary_call(state)
+    )
+    remember_result(state, summary, config)
+    return {"summary": summary}
 
 
 
 # --- 3. BUILD THE GRAPH ---
-workflow = StateGraph(AgentState)
-
-workflow.add_node("init_node", init_node)
-workflow.add_node("prelim_nodes", prelim_nodes)  # input layer: 1 input str to all X workers
-workflow.add_node("cross_nodes", cross_nodes)  # hidden layer: 1..X workers to 1..X workers
-workflow.add_node("summarizer", summarizer_node)  # output layer: X workers to 1 output str
-
-# Routing/Edges
-workflow.add_edge(START, "init_node")
-workflow.add_edge("init_node", "prelim_nodes")
-workflow.add_edge("prelim_nodes", "cross_nodes")
-# workflow.add_edge("cross_nodes", "summarizer")
-workflow.add_conditional_edges(
-    "cross_nodes", 
-    lambda x: x["stop"],
-    {
-        False: "cross_nodes",
-        True: "summarizer",
-    }
-)
-workflow.add_edge("summarizer", END)
+def dual_node(name: str, func, afunc):
+    """A node with a sync and a native async implementation, both profiled."""
+    return RunnableLambda(profiled(name, func), afunc=profiled(name, afunc), name=name)
+
+
+def add_edges(workflow) -> None:
+    from langgraph.graph import START, END
+
+    workflow.add_edge(START, "init_node")
+    workflow.add_edge("init_node", "semantic_cache")
+    # hit: stored result, seed: cross loops on the neighbour's replies, else the
+    # full fan-out
+    workflow.add_conditional_edges(
+        "semantic_cache",
+        lambda x: (x.get("semantic_cache") or {}).get("mode", "miss"),
+        {
+            "hit": END,
+            "seed": "cross_nodes",
+            "miss": "router",
+        },
+    )
+    workflow.add_edge("router", "prelim_nodes")
+    # the prelim stage may already exhaust the latency or token budget
+    workflow.add_conditional_edges(
+        "prelim_nodes",
+        lambda x: x["stop"],
+        {
+            False: "cross_nodes",
+            True: "summarizer",
+        },
+    )
+    # workflow.add_edge("cross_nodes", "summarizer")
+    workflow.add_conditional_edges(
+        "cross_nodes",
+        lambda x: x["stop"],
+        {
+            False: "cross_nodes",
+            True: "summarizer",
+        },
+    )
+    workflow.add_edge("summarizer", END)
+
+
+def build_workflow(state_schema: type | None = None):
+    """The uncompiled graph; LangGraph is imported on first use.
+
+    `state_schema` may replace `graph_state_schema()` with a schema of the same
+    keys but other channels, e.g. to compare channel types in a benchmark.
+    """
+    from langgraph.graph import StateGraph
+
+    state_schema = state_schema or graph_state_schema()
+    workflow = StateGraph(state_schema)
 
-# Initialize in-memory checkpointer
-checkpointer = InMemorySaver()
-# Compile
-graph = workflow.compile(checkpointer=checkpointer)
+    workflow.add_node("init_node", init_node, input_schema=state_schema)
+    # near-duplicate inquiries
+    workflow.add_node("semantic_cache", semantic_cache_node, input_schema=state_schema)
+    # local selection of the dimensions for prelim_nodes
+    workflow.add_node("router", router_node, input_schema=state_schema)
+    # graph.stream runs the sync nodes (thread pools), graph.astream the native
+    # async ones; profiled(): node spans for the RunProfiler in
+    # {"configurable": {"profiler": ...}}, if any
+    # input layer: 1 input str to all X workers
+    workflow.add_node(
+        "prelim_nodes",
+        dual_node("prelim_nodes", prelim_nodes, aprelim_nodes),
+        input_schema=state_schema,
+    )
+    # hidden layer: 1..X workers to 1..X workers
+    workflow.add_node(
+        "cross_nodes",
+        dual_node("cross_nodes", cross_nodes, across_nodes),
+        input_schema=state_schema,
+    )
+    # output layer: X workers to 1 output str
+    workflow.add_node(
+        "summarizer",
+        dual_node("summarizer", summarizer_node, asummarizer_node),
+        input_schema=state_schema,
+    )
+
+    # Routing/Edges
+    add_edges(workflow)
+    return workflow
+
+
+def create_graph(checkpointer=None):
+    """Compile the graph; by default with the process-wide checkpointer."""
+    if checkpointer is None:
+        checkpointer = get_checkpointer()
+    return build_workflow().compile(checkpointer=checkpointer)
+
+
+_checkpointer = None
+_graph = None
+
+
+def get_checkpointer():
+    # in-memory, or SQLite via CHECKPOINT_PATH
+    global _checkpointer
+    with _build_lock:
+        if _checkpointer is None:
+            from src.graphs.checkpointing import create_checkpointer
+
+            _checkpointer = create_checkpointer()
+        return _checkpointer
+
+
+def get_graph():
+    """The process-wide compiled graph, built on first use."""
+    global _graph
+    if _graph is None:
+        graph = create_graph()
+        with _build_lock:
+            if _graph is None:
+                _graph = graph
+    return _graph
+
+
+def __getattr__(name: str):
+    # `from src.graphs.inquiry_bot import graph` still works, it just builds the
+    # graph then
+    lazy = {
+        "graph": get_graph,
+        "workflow": build_workflow,
+        "checkpointer": get_checkpointer,
+        "llm": get_default_llm,
+    }
+    if name in lazy:
+        return lazy[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,302 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+from langchain_core.runnables import RunnableConfig
+
+from src.utils.stats import percentile
+
+
+def _labels(**labels: str) -> str:
+    """Prometheus label set, values escaped as the text format requires."""
+    escaped = {
+        name: value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for name, value in labels.items()
+    }
+    return ",".join(f'{name}="{value}"' for name, value in escaped.items())
+
+
+@dataclass
+class CallRecord:
+    """One LLM call. Times are seconds; `start` is relative to the profiler start."""
+
+    node: str
+    role: str  # worker, merger or summarizer
+    dimension: str | None
+    loop: int | None
+    start: float
+    wall_time: float  # excluding queue_wait
+    queue_wait: float  # thread pool queue and concurrency limiter
+    # estimated from the text (~4 characters per token), see estimate_tokens
+    prompt_tokens: int
+    completion_tokens: int
+    retries: int
+    cache: str  # hit, miss or off
+    error: str | None = None
+    # cross worker calls: tokens of the additional context and of the JSON it replaces
+    context_tokens: int | None = None
+    raw_context_tokens: int | None = None
+    # calls through a RequestHedger: duplicate sent / duplicate won / (estimated)
+    # time without hedging
+    hedged: bool = False
+    hedge_won: bool = False
+    unhedged_time: float | None = None
+
+    @property
+    def end(self) -> float:
+        return self.start + self.wall_time
+
+
+@dataclass
+class NodeSpan:
+    node: str
+    loop: int | None
+    start: float
+    end: float
+
+
+class RunProfiler:
+    """Collects every LLM call and node span of one graph run.
+
+    Pass it as `{"configurable": {"profiler": RunProfiler()}}`; without it the
+    graph records nothing. Thread-safe, so one profiler can be shared by the
+    thread pool workers of a node (or by several runs, for aggregate metrics).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.t0 = time.perf_counter()
+        self.calls: list[CallRecord] = []
+        self.spans: list[NodeSpan] = []
+
+    def now(self) -> float:
+        return time.perf_counter() - self.t0
+
+    def record_call(self, **fields) -> None:
+        record = CallRecord(**fields)
+        with self._lock:
+            self.calls.append(record)
+
+    @contextmanager
+    def span(self, node: str, loop: int | None = None):
+        start = self.now()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.spans.append(NodeSpan(node, loop, start, self.now()))
+
+    # --- reports ---
+
+    def critical_path(self) -> list[dict]:
+        """Per node span: the chain of calls that finished last and where its time went.
+
+        Within a span, calls are grouped by dimension (a cross loop runs the
+        worker and merger call of a dimension back to back); the group that
+        ends last is the critical one. `other` is node time outside of its
+        calls, e.g. prompt rendering, local merging and scheduling.
+        """
+        with self._lock:
+            spans, calls = sorted(self.spans, key=lambda s: s.start), list(self.calls)
+        path = []
+        for span in spans:
+            chains = defaultdict(list)
+            for call in calls:
+                if (
+                    call.node == span.node
+                    and call.loop == span.loop
+                    and span.start <= call.start <= span.end
+                ):
+                    chains[call.dimension].append(call)
+            wall = span.end - span.start
+            if not chains:
+                path.append(
+                    {
+                        "node": span.node,
+                        "loop": span.loop,
+                        "wall_time": wall,
+                        "critical_dimension": None,
+                        "calls": 0,
+                        "queue_wait": 0.0,
+                        "llm_time": 0.0,
+                        "other": wall,
+                    }
+                )
+                continue
+            dimension, chain = max(
+                chains.items(), key=lambda item: max(c.end for c in item[1])
+            )
+            queue_wait = sum(c.queue_wait for c in chain)
+            llm_time = sum(c.wall_time for c in chain)
+            path.append(
+                {
+                    "node": span.node,
+                    "loop": span.loop,
+                    "wall_time": wall,
+                    "critical_dimension": dimension,
+                    "calls": sum(len(c) for c in chains.values()),
+                    "queue_wait": queue_wait,
+                    "llm_time": llm_time,
+                    "other": max(wall - queue_wait - llm_time, 0.0),
+                }
+            )
+        return path
+
+    def report(self) -> dict:
+        with self._lock:
+            calls, spans = list(self.calls), list(self.spans)
+        totals = {
+            "calls": len(calls),
+            "cache_hits": sum(1 for c in calls if c.cache == "hit"),
+            "errors": sum(1 for c in calls if c.error),
+            "retries": sum(c.retries for c in calls),
+            "prompt_tokens": sum(c.prompt_tokens for c in calls),
+            "completion_tokens": sum(c.completion_tokens for c in calls),
+            "llm_time": sum(c.wall_time for c in calls),
+            "queue_wait": sum(c.queue_wait for c in calls),
+            "context_tokens": sum(c.context_tokens or 0 for c in calls),
+            "raw_context_tokens": sum(c.raw_context_tokens or 0 for c in calls),
+            "wall_time": max((s.end for s in spans), default=0.0)
+            - min((s.start for s in spans), default=0.0),
+        }
+        hedgeable = [c for c in calls if c.unhedged_time is not None]
+        if hedgeable:
+            totals.update(
+                {
+                    "hedges": sum(c.hedged for c in hedgeable),
+                    "hedge_wins": sum(c.hedge_won for c in hedgeable),
+                    "hedge_rate": sum(c.hedged for c in hedgeable) / len(hedgeable),
+                    "call_time_p99": percentile([c.wall_time for c in hedgeable], 99),
+                    "call_time_p99_unhedged": percentile(
+                        [c.unhedged_time for c in hedgeable], 99
+                    ),
+                }
+            )
+        return {
+            "totals": totals,
+            "critical_path": self.critical_path(),
+            "nodes": [asdict(s) for s in spans],
+            "calls": [asdict(c) for c in calls],
+        }
+
+    def write_json(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def to_prometheus(self, prefix: str = "inquiry") -> str:
+        """Prometheus text exposition format, aggregated by node, role and dimension."""
+        with self._lock:
+            calls, spans = list(self.calls), list(self.spans)
+        metrics = {
+            "llm_calls_total": ("counter", "LLM calls", lambda c: 1),
+            "llm_cache_hits_total": (
+                "counter",
+                "LLM calls served from the response cache",
+                lambda c: c.cache == "hit",
+            ),
+            "llm_errors_total": (
+                "counter",
+                "Failed LLM calls",
+                lambda c: c.error is not None,
+            ),
+            "llm_retries_total": ("counter", "LLM call retries", lambda c: c.retries),
+            "llm_call_seconds_total": (
+                "counter",
+                "LLM call wall time",
+                lambda c: c.wall_time,
+            ),
+            "llm_queue_wait_seconds_total": (
+                "counter",
+                "Time LLM calls spent queued",
+                lambda c: c.queue_wait,
+            ),
+            "llm_prompt_tokens_total": (
+                "counter",
+                "Estimated prompt tokens",
+                lambda c: c.prompt_tokens,
+            ),
+            "llm_completion_tokens_total": (
+                "counter",
+                "Estimated completion tokens",
+                lambda c: c.completion_tokens,
+            ),
+            "llm_context_tokens_saved_total": (
+                "counter",
+                "Additional context tokens saved by compaction",
+                lambda c: (c.raw_context_tokens or 0) - (c.context_tokens or 0),
+            ),
+            "llm_hedges_total": (
+                "counter",
+                "Hedged (duplicated) LLM calls",
+                lambda c: c.hedged,
+            ),
+            "llm_hedge_wins_total": (
+                "counter",
+                "Hedged LLM calls won by the duplicate",
+                lambda c: c.hedge_won,
+            ),
+        }
+        lines = []
+        for name, (kind, help_text, value) in metrics.items():
+            series = defaultdict(float)
+            for call in calls:
+                series[(call.node, call.role, call.dimension or "")] += float(
+                    value(call)
+                )
+            lines += [
+                f"# HELP {prefix}_{name} {help_text}",
+                f"# TYPE {prefix}_{name} {kind}",
+            ]
+            for (node, role, dimension), total in sorted(series.items()):
+                labels = _labels(node=node, role=role, dimension=dimension)
+                lines.append(f"{prefix}_{name}{{{labels}}} {total:g}")
+        node_seconds = defaultdict(float)
+        for span in spans:
+            node_seconds[span.node] += span.end - span.start
+        lines += [
+            f"# HELP {prefix}_node_seconds_total Node wall time",
+            f"# TYPE {prefix}_node_seconds_total counter",
+        ]
+        for node, total in sorted(node_seconds.items()):
+            lines.append(
+                f"{prefix}_node_seconds_total{{{_labels(node=node)}}} {total:g}"
+            )
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+
+def get_profiler(config: RunnableConfig | None = None) -> RunProfiler | None:
+    return (config or {}).get("configurable", {}).get("profiler")
+
+
+def profiled(name: str, func):
+    """Record a node span if the run has a profiler (sync and async nodes)."""
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_node(state, config: RunnableConfig):
+            profiler = get_profiler(config)
+            if profiler is None:
+                return await func(state, config)
+            with profiler.span(name, state.get("loop_count")):
+                return await func(state, config)
+
+        return async_node
+
+    @functools.wraps(func)
+    def node(state, config: RunnableConfig):
+        profiler = get_profiler(config)
+        if profiler is None:
+            return func(state, config)
+        with profiler.span(name, state.get("loop_count")):
+            return func(state, config)
+
+    return node
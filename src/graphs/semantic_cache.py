@@ -0,0 +1,287 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+
+from src.utils.stats import percentile
+
+# question words and fillers carry no topic, "How to do X?" and "X?" should match
+STOP_WORDS = frozenset(
+    "a an and are at be can could did do does for from get how i in is it make makes "
+    "me my of on or should the to was what when where which who why with would you "
+    "your".split()
+)
+# ... but they change the question: "When was X built?" is not "Where was X built?",
+# so a hit needs the same of these words
+INTENT_WORDS = frozenset(
+    "can could how never no not should what when where which who why would".split()
+)
+
+
+def intent_words(text: str) -> frozenset[str]:
+    return frozenset(re.findall(r"[a-z0-9]+", text.lower())) & INTENT_WORDS
+
+
+def _features(text: str) -> list[tuple[str, float]]:
+    features = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s"):
+            word = word[:-1]  # crude plural stemming: push-ups ~ push-up
+        features.append((f"w:{word}", 2.0))
+        padded = f"<{word}>"
+        features.extend((f"c:{padded[i:i + 3]}", 1.0) for i in range(len(padded) - 2))
+    return features
+
+
+def embed(text: str, dim: int = 256) -> np.ndarray:
+    """Unit vector of the inquiry's words and character trigrams (signed hashing trick).
+
+    Local and CPU-only: a lexical embedding, so paraphrases with different
+    words score lower than with a learned model.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, weight in _features(text):
+        # crc32 instead of hash(): stable across processes (PYTHONHASHSEED)
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % dim] += weight if (h >> 16) & 1 else -weight
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """Results of past inquiries, found again for near-duplicate inquiries.
+
+    Inquiries are embedded with `embed` and indexed with random-hyperplane
+    LSH (`num_tables` tables of `num_bits` bits); the candidates sharing a
+    bucket are ranked by exact cosine similarity. `lookup` returns the most
+    similar entry with its mode:
+
+    - `hit`: similarity >= `threshold` and the same question words (see
+      `INTENT_WORDS`), the stored result can be reused;
+    - `seed`: similarity >= `seed_threshold` (if set), the stored result is a
+      starting point for a new run.
+
+    Bounded by `max_entries` (least recently used first) and `ttl`. With
+    `path`, entries are also kept in a SQLite file and loaded on start.
+    Thread-safe.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        seed_threshold: float | None = None,
+        max_entries: int = 10_000,
+        ttl: float | None = None,
+        path: str | None = None,
+        dim: int = 256,
+        num_tables: int = 16,
+        num_bits: int = 8,
+        seed: int = 0,
+    ):
+        if seed_threshold is not None and seed_threshold > threshold:
+            raise ValueError("seed_threshold must not be above threshold")
+        self.threshold = threshold
+        self.seed_threshold = seed_threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.dim = dim
+        self._planes = (
+            np.random.default_rng(seed)
+            .standard_normal((num_tables, num_bits, dim))
+            .astype(np.float32)
+        )
+        self._powers = 1 << np.arange(num_bits)
+        self._tables: list[dict[int, set[str]]] = [{} for _ in range(num_tables)]
+        # inquiry -> (vector, result, created_at); dict order is the LRU order
+        self._entries: dict[str, tuple[np.ndarray, dict, float]] = {}
+        self._latencies: deque[float] = deque(maxlen=1000)
+        self._lock = threading.Lock()
+        self.hits = self.seeds = self.misses = self.evictions = 0
+        self._db = None
+        if path:
+            self._open_db(path)
+
+    def _open_db(self, path: str) -> None:
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "inquiry TEXT PRIMARY KEY, result TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.commit()
+        rows = self._db.execute(
+            "SELECT inquiry, result, created_at FROM entries "
+            "ORDER BY accessed_at DESC LIMIT ?",
+            (self.max_entries,),
+        ).fetchall()
+        for inquiry, result, created_at in reversed(rows):
+            self._add(inquiry, json.loads(result), created_at)
+
+    def _buckets(self, vector: np.ndarray) -> list[int]:
+        bits = (self._planes @ vector) > 0  # (num_tables, num_bits)
+        return [int(key) for key in bits @ self._powers]
+
+    def _add(self, inquiry: str, result: dict, created_at: float) -> None:
+        self._remove(inquiry)
+        vector = embed(inquiry, self.dim)
+        self._entries[inquiry] = (vector, result, created_at)
+        for table, key in zip(self._tables, self._buckets(vector)):
+            table.setdefault(key, set()).add(inquiry)
+
+    def _remove(self, inquiry: str) -> None:
+        entry = self._entries.pop(inquiry, None)
+        if entry is None:
+            return
+        for table, key in zip(self._tables, self._buckets(entry[0])):
+            bucket = table.get(key)
+            bucket.discard(inquiry)
+            if not bucket:
+                del table[key]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def lookup(self, inquiry: str) -> dict | None:
+        """{"mode", "similarity", "inquiry", "result"} of the best match, or None."""
+        start = time.perf_counter()
+        vector = embed(inquiry, self.dim)
+        buckets = self._buckets(vector)
+        now = time.time()
+        with self._lock:
+            candidates = set().union(
+                *(table.get(key, ()) for table, key in zip(self._tables, buckets))
+            )
+            expired = [c for c in candidates if self._expired(self._entries[c][2], now)]
+            for candidate in expired:
+                self._remove(candidate)
+                self._delete_rows([candidate])
+            candidates = [c for c in candidates if c in self._entries]
+            match = None
+            if candidates:
+                similarities = (
+                    np.stack([self._entries[c][0] for c in candidates]) @ vector
+                )
+                best = int(np.argmax(similarities))
+                similarity = float(similarities[best])
+                same_intent = intent_words(inquiry) == intent_words(candidates[best])
+                if similarity >= self.threshold and same_intent:
+                    match = {
+                        "mode": "hit",
+                        "similarity": similarity,
+                        "inquiry": candidates[best],
+                    }
+                elif (
+                    self.seed_threshold is not None
+                    and similarity >= self.seed_threshold
+                ):
+                    match = {
+                        "mode": "seed",
+                        "similarity": similarity,
+                        "inquiry": candidates[best],
+                    }
+            if match is None:
+                self.misses += 1
+            else:
+                if match["mode"] == "hit":
+                    self.hits += 1
+                else:
+                    self.seeds += 1
+                neighbour = match["inquiry"]
+                match["result"] = self._entries[neighbour][1]
+                self._entries[neighbour] = self._entries.pop(
+                    neighbour
+                )  # most recently used
+                if self._db is not None:
+                    self._db.execute(
+                        "UPDATE entries SET accessed_at = ? WHERE inquiry = ?",
+                        (now, neighbour),
+                    )
+                    self._db.commit()
+            self._latencies.append(time.perf_counter() - start)
+        return match
+
+    def store(self, inquiry: str, result: dict) -> None:
+        """Remember the JSON-serializable `result` of `inquiry`."""
+        if self.max_entries <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._add(inquiry, result, now)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                evicted.append(oldest)
+            self.evictions += len(evicted)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                    (inquiry, json.dumps(result, ensure_ascii=False), now, now),
+                )
+                self._delete_rows(evicted)
+                self._db.commit()
+
+    def _delete_rows(self, inquiries: list[str]) -> None:
+        if self._db is not None and inquiries:
+            self._db.executemany(
+                "DELETE FROM entries WHERE inquiry = ?", [(i,) for i in inquiries]
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for table in self._tables:
+                table.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM entries")
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.seeds + self.misses
+            latencies = list(self._latencies)
+            return {
+                "lookups": lookups,
+                "hits": self.hits,
+                "seeds": self.seeds,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "seed_rate": self.seeds / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+                "lookup_ms_p50": percentile(latencies, 50) * 1e3 if latencies else 0.0,
+                "lookup_ms_p99": percentile(latencies, 99) * 1e3 if latencies else 0.0,
+            }
+
+
+def create_semantic_cache() -> SemanticCache | None:
+    """Create the process-wide cache from `SEMANTIC_CACHE_*` env vars.
+
+    The cache is off unless `SEMANTIC_CACHE=1`.
+    """
+    if os.getenv("SEMANTIC_CACHE", "0") != "1":
+        return None
+    seed_threshold = os.getenv("SEMANTIC_CACHE_SEED_THRESHOLD")
+    ttl = os.getenv("SEMANTIC_CACHE_TTL")
+    return SemanticCache(
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9")),
+        seed_threshold=float(seed_threshold) if seed_threshold else None,
+        max_entries=int(os.getenv("SEMANTIC_CACHE_SIZE", "10000")),
+        ttl=float(ttl) if ttl else None,
+        path=os.getenv("SEMANTIC_CACHE_PATH") or None,
+    )
@@ -0,0 +1,366 @@
+import asyncio
+import itertools
+import os
+import random
+import threading
+import time
+import weakref
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.llms.factory import create_llm
+from src.llms.usage import estimate_tokens
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when every endpoint's circuit breaker is open."""
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether the same request may succeed when retried.
+
+    True for rate limits, server errors, timeouts and connection errors
+    (langchain's `ModelError.is_retryable`, set by the provider
+    integrations), not for invalid requests or replies that don't match the
+    schema.
+    """
+    return isinstance(error, (TimeoutError, ConnectionError)) or getattr(
+        error, "is_retryable", False
+    )
+
+
+class TokenBucket:
+    """Token bucket refilled at `rate_per_minute`, holding at most `capacity`.
+
+    `reserve` takes the tokens right away, possibly going into debt, and
+    returns how long the caller has to wait before using them. Callers then
+    sleep (sync) or `await asyncio.sleep` (async) themselves.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Wait `reserve(amount)` would return, without reserving."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, (amount - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures.
+
+    While open, calls are refused for `reset_timeout` seconds; then one trial
+    call is let through (half-open), which closes the breaker on success and
+    opens it again on failure.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial:
+                self._trial = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial = False
+
+
+class Endpoint:
+    """One chat model (API key / model) with its own limits and breaker."""
+
+    def __init__(
+        self,
+        client: BaseChatModel,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.client = client
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.breaker = breaker or CircuitBreaker()
+        self._runnables: dict = {}
+        self._lock = threading.Lock()
+
+    # the response cache keys on these, see inquiry_bot._lookup_cache
+    @property
+    def model(self) -> str:
+        return str(getattr(self.client, "model", ""))
+
+    @property
+    def temperature(self) -> float | None:
+        return getattr(self.client, "temperature", None)
+
+    def runnable(self, schema=None):
+        # with_structured_output builds a new runnable every time; build it once
+        # per schema
+        if schema is None:
+            return self.client
+        with self._lock:
+            runnable = self._runnables.get(schema)
+            if runnable is None:
+                runnable = self._runnables[schema] = self.client.with_structured_output(
+                    schema
+                )
+            return runnable
+
+    def wait_time(self, prompt_tokens: int) -> float:
+        waits = [0.0]
+        if self.requests:
+            waits.append(self.requests.wait_time(1))
+        if self.tokens:
+            waits.append(self.tokens.wait_time(prompt_tokens))
+        return max(waits)
+
+    def reserve(self, prompt_tokens: int) -> float:
+        waits = [0.0]
+        if self.requests:
+            waits.append(self.requests.reserve(1))
+        if self.tokens:
+            waits.append(self.tokens.reserve(prompt_tokens))
+        return max(waits)
+
+    def record_completion(self, response) -> None:
+        # completion tokens are only known afterwards; taken without waiting
+        if self.tokens:
+            if hasattr(response, "model_dump_json"):
+                output = response.model_dump_json()
+            else:
+                output = str(getattr(response, "content", response))
+            self.tokens.reserve(estimate_tokens(output))
+
+
+class LLMClientPool:
+    """Process-wide LLM client layer shared by all graph runs.
+
+    - Structured runnables are built once per endpoint and schema.
+    - Requests/min and tokens/min (estimated) token buckets per endpoint.
+    - Transient failures (rate limits, server errors, timeouts, connection
+      errors) are retried up to `max_retries` times with full-jitter
+      exponential backoff (`base_delay * 2**attempt`, at most `max_delay`);
+      other errors are raised right away.
+    - A circuit breaker per endpoint takes failing endpoints out of rotation.
+    - Calls go to the endpoint that can start first, ties round-robin, so
+      several API keys or model endpoints share the load.
+    """
+
+    def __init__(
+        self,
+        clients: list[BaseChatModel],
+        rpm: float | None = None,
+        tpm: float | None = None,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        seed: int | None = None,
+    ):
+        if not clients:
+            raise ValueError("LLMClientPool needs at least one client")
+        self.endpoints = [
+            Endpoint(client, rpm, tpm, CircuitBreaker(failure_threshold, reset_timeout))
+            for client in clients
+        ]
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = random.Random(seed)
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    @property
+    def identities(self) -> list[tuple[str, float | None]]:
+        """The distinct (model, temperature) pairs of the endpoints, in order."""
+        return list(dict.fromkeys((e.model, e.temperature) for e in self.endpoints))
+
+    def _pick(self, prompt_tokens: int) -> Endpoint:
+        with self._lock:
+            start = next(self._order)
+        n = len(self.endpoints)
+        candidates = [self.endpoints[(start + k) % n] for k in range(n)]
+        candidates = [e for e in candidates if e.breaker.state != "open"]
+        # sorted() is stable: endpoints that can start equally soon keep the
+        # round-robin order
+        for endpoint in sorted(candidates, key=lambda e: e.wait_time(prompt_tokens)):
+            if endpoint.breaker.allow():
+                return endpoint
+        raise CircuitOpenError("All LLM endpoints are failing (circuit breakers open)")
+
+    def backoff(self, attempt: int) -> float:
+        with self._lock:
+            return self._rng.uniform(
+                0, min(self.max_delay, self.base_delay * 2**attempt)
+            )
+
+    def invoke(
+        self,
+        messages: list[BaseMessage],
+        schema=None,
+        config: RunnableConfig | None = None,
+    ) -> tuple[object, int, Endpoint]:
+        """Return the response (structured if `schema` is given), retries, endpoint."""
+        prompt_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        for attempt in range(self.max_retries + 1):
+            endpoint = self._pick(prompt_tokens)
+            time.sleep(endpoint.reserve(prompt_tokens))
+            try:
+                response = endpoint.runnable(schema).invoke(messages, config=config)
+            except Exception as e:
+                if not is_transient(e):
+                    # the endpoint answered, the request itself is at fault
+                    endpoint.breaker.record_success()
+                    raise
+                endpoint.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.backoff(attempt))
+                continue
+            endpoint.breaker.record_success()
+            endpoint.record_completion(response)
+            return response, attempt, endpoint
+
+    async def ainvoke(
+        self,
+        messages: list[BaseMessage],
+        schema=None,
+        config: RunnableConfig | None = None,
+    ) -> tuple[object, int, Endpoint]:
+        prompt_tokens = sum(estimate_tokens(str(m.content)) for m in messages)
+        for attempt in range(self.max_retries + 1):
+            endpoint = self._pick(prompt_tokens)
+            await asyncio.sleep(endpoint.reserve(prompt_tokens))
+            try:
+                response = await endpoint.runnable(schema).ainvoke(
+                    messages, config=config
+                )
+            except Exception as e:
+                if not is_transient(e):
+                    # the endpoint answered, the request itself is at fault
+                    endpoint.breaker.record_success()
+                    raise
+                endpoint.breaker.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self.backoff(attempt))
+                continue
+            endpoint.breaker.record_success()
+            endpoint.record_completion(response)
+            return response, attempt, endpoint
+
+    def stats(self) -> list[dict]:
+        return [
+            {
+                "model": e.model,
+                "breaker": e.breaker.state,
+                "consecutive_failures": e.breaker.failures,
+            }
+            for e in self.endpoints
+        ]
+
+
+# pools for plain clients a run plugs in via {"configurable": {"llm": ...}}
+_wrapped: dict[int, tuple[weakref.ref, LLMClientPool]] = {}
+_wrapped_lock = threading.Lock()
+
+
+def as_client_pool(client: BaseChatModel | LLMClientPool) -> LLMClientPool:
+    """The pool itself, or a single-endpoint pool for a plain client.
+
+    The plain client's pool has no limits and retries. It is kept as long as
+    the client lives, so its structured runnables are reused across calls.
+    """
+    if isinstance(client, LLMClientPool):
+        return client
+    with _wrapped_lock:
+        entry = _wrapped.get(id(client))
+        if entry is not None and entry[0]() is client:
+            return entry[1]
+        pool = LLMClientPool([client], max_retries=0)
+        _wrapped[id(client)] = (
+            weakref.ref(client, lambda _, key=id(client): _wrapped.pop(key, None)),
+            pool,
+        )
+        return pool
+
+
+def create_client_pool(**llm_kwargs) -> LLMClientPool:
+    """Create the process-wide pool from env vars.
+
+    One endpoint per entry of `LLM_API_KEYS` (comma-separated) and of
+    `LLM_MODELS` (interchangeable models, comma-separated); by default a
+    single `create_llm()` endpoint. Limits and retries come from `LLM_RPM`,
+    `LLM_TPM`, `LLM_MAX_RETRIES`, `LLM_RETRY_BASE_DELAY`,
+    `LLM_RETRY_MAX_DELAY`, `LLM_BREAKER_THRESHOLD` and `LLM_BREAKER_RESET`.
+    `llm_kwargs` (backend, model, temperature, ...) are passed to every
+    `create_llm` call; a `model` there replaces `LLM_MODELS`.
+    """
+    variants = [{}]
+    keys = [key for key in os.getenv("LLM_API_KEYS", "").split(",") if key]
+    models = [model for model in os.getenv("LLM_MODELS", "").split(",") if model]
+    if keys:
+        variants = [{"api_key": key} for key in keys]
+    if models and "model" not in llm_kwargs:
+        variants = [
+            {**variant, "model": model} for variant in variants for model in models
+        ]
+    rpm, tpm = os.getenv("LLM_RPM"), os.getenv("LLM_TPM")
+    return LLMClientPool(
+        [create_llm(**{**variant, **llm_kwargs}) for variant in variants],
+        rpm=float(rpm) if rpm else None,
+        tpm=float(tpm) if tpm else None,
+        max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+        base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+        max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "20")),
+        failure_threshold=int(os.getenv("LLM_BREAKER_THRESHOLD", "5")),
+        reset_timeout=float(os.getenv("LLM_BREAKER_RESET", "30")),
+    )
@@ -0,0 +1,42 @@
+import asyncio
+import os
+import weakref
+
+
+class AsyncConcurrencyLimiter:
+    """Process-wide bound on in-flight async LLM requests.
+
+    All graph runs sharing an event loop share one semaphore, so hundreds of
+    concurrent inquiries still keep at most `limit` requests in flight. A
+    separate semaphore is kept per event loop because asyncio primitives are
+    bound to the loop they are first used in.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        self.limit = limit
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def __aenter__(self):
+        await self._semaphore().acquire()
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.in_flight -= 1
+        self._semaphore().release()
+
+
+llm_limiter = AsyncConcurrencyLimiter(int(os.getenv("LLM_MAX_CONCURRENCY", "64")))
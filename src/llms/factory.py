@@ -0,0 +1,39 @@
+import os
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+LLM_BACKENDS = ("google", "fake")
+
+
+def create_llm(backend: str | None = None, **kwargs) -> BaseChatModel:
+    """Create the chat model for the inquiry graph.
+
+    The backend defaults to the `LLM_BACKEND` env var ("google"). The "fake"
+    backend runs fully offline; its latency, jitter and error rate can be set
+    via kwargs or the `FAKE_LLM_LATENCY`, `FAKE_LLM_JITTER`,
+    `FAKE_LLM_ERROR_RATE`, `FAKE_LLM_SEED` and `FAKE_LLM_TOKEN_LATENCY` env vars.
+    """
+    backend = backend or os.getenv("LLM_BACKEND", "google")
+    if backend == "fake":
+        from src.llms.fake_llm import FakeLLM
+
+        params = {
+            "latency": float(os.getenv("FAKE_LLM_LATENCY", "0")),
+            "jitter": float(os.getenv("FAKE_LLM_JITTER", "0")),
+            "error_rate": float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+            "seed": int(os.getenv("FAKE_LLM_SEED", "0")),
+            "token_latency": float(os.getenv("FAKE_LLM_TOKEN_LATENCY", "0")),
+        }
+        params.update(kwargs)
+        return FakeLLM(**params)
+    if backend == "google":
+        from langchain_google_genai import ChatGoogleGenerativeAI
+
+        params = {
+            "model": "gemini-2.5-flash-lite",
+            "temperature": 0,
+            "api_key": os.getenv("GEMINI_API_KEY"),
+        }
+        params.update(kwargs)
+        return ChatGoogleGenerativeAI(**params)
+    raise ValueError(f"Unknown LLM backend '{backend}', expected one of {LLM_BACKENDS}")
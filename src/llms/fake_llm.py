@@ -0,0 +1,234 @@
+import asyncio
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Any, Iterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel, PrivateAttr
+
+from src.agents.workers.inquiry_base import ALL_DIMENSIONS
+
+
+class FakeLLMError(RuntimeError):
+    """Simulated transient provider error raised by `FakeLLM`."""
+
+    is_retryable = True
+
+
+def _find(pattern: str, text: str, default: str = "") -> str:
+    match = re.search(pattern, text, flags=re.MULTILINE)
+    return match.group(1).strip() if match else default
+
+
+class FakeLLM(BaseChatModel):
+    """Offline, deterministic stand-in for the Gemini chat model.
+
+    Replies are derived from a hash of the rendered prompt, so identical
+    prompts always get identical replies. Latency and errors are drawn from a
+    separate seeded sequence, i.e. a retried or duplicated request may succeed
+    or return faster than the first one.
+    """
+
+    model: str = "fake-llm"
+    temperature: float = 0
+    latency: float = 0.0  # mean latency per call in seconds
+    jitter: float = 0.0  # standard deviation of the latency in seconds
+    error_rate: float = 0.0  # probability that a call raises FakeLLMError
+    slow_rate: float = 0.0  # probability that a call is a straggler
+    slow_factor: float = 10.0  # straggler latency as a multiple of the drawn latency
+    token_latency: float = 0.0  # delay between streamed tokens in seconds
+    timeout: float | None = None  # calls slower than this raise TimeoutError after `timeout`
+    seed: int = 0
+    max_answers: int = 5
+    max_connections: int = 3
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _rng: random.Random | None = PrivateAttr(default=None)
+    _calls: int = PrivateAttr(default=0)
+    _errors: int = PrivateAttr(default=0)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-llm"
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def errors(self) -> int:
+        return self._errors
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._calls = 0
+            self._errors = 0
+
+    # --- simulated network behaviour ---
+    def _next_call(self) -> float:
+        """Count the call, maybe raise an error and return its latency."""
+        with self._lock:
+            if self._rng is None:
+                self._rng = random.Random(self.seed)
+            self._calls += 1
+            delay = max(0.0, self._rng.gauss(self.latency, self.jitter))
+            failed = self._rng.random() < self.error_rate
+            if self.slow_rate and self._rng.random() < self.slow_rate:
+                delay *= self.slow_factor
+            if failed:
+                self._errors += 1
+        if failed:
+            raise FakeLLMError("simulated provider error")
+        return delay
+
+    def _timed_out(self, delay: float) -> bool:
+        if self.timeout is None or delay <= self.timeout:
+            return False
+        with self._lock:
+            self._errors += 1
+        return True
+
+    def _call(self) -> None:
+        delay = self._next_call()
+        if self._timed_out(delay):
+            time.sleep(self.timeout)
+            raise TimeoutError(f"simulated timeout after {self.timeout}s")
+        if delay:
+            time.sleep(delay)
+
+    async def _acall(self) -> None:
+        delay = self._next_call()
+        if self._timed_out(delay):
+            await asyncio.sleep(self.timeout)
+            raise TimeoutError(f"simulated timeout after {self.timeout}s")
+        if delay:
+            await asyncio.sleep(delay)
+
+    # --- deterministic content ---
+    @staticmethod
+    def _prompt_text(messages: Any) -> str:
+        if isinstance(messages, str):
+            return messages
+        return "\n".join(str(getattr(m, "content", m)) for m in messages)
+
+    def _content_rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return random.Random(f"{self.seed}:{digest}")
+
+    def fake_reply(self, prompt: str) -> dict:
+        """Build a WorkerReply-shaped dict for a rendered worker/merger prompt."""
+        if "data1:" in prompt and "data2:" in prompt:
+            return self._fake_merge(prompt)
+        rng = self._content_rng(prompt)
+        dimension = _find(r'for the "(.+?)" dimension', prompt, "Other")
+        inquiry = _find(r"^### INQUIRY\n(.+)$", prompt, "the inquiry")
+        answer_types = [
+            t.strip() for t in _find(r"^Valid Answer Types: (.+)$", prompt).split(",")
+        ]
+        answer_types = [t for t in answer_types if t] or ["other"]
+        targets = [
+            d.strip()
+            for d in _find(r"^Valid Connection Dimensions: (.+)$", prompt).split(",")
+        ]
+        targets = [d for d in targets if d] or list(ALL_DIMENSIONS)
+
+        answers = [
+            {
+                "answer": f"{dimension} aspect {k + 1} of '{inquiry}'",
+                "answer_type": rng.choice(answer_types),
+                "score": round(rng.uniform(0.3, 1.0), 2),
+            }
+            for k in range(rng.randint(1, self.max_answers))
+        ]
+        return {
+            "answers_list": answers,
+            "similarity_scores": self._fake_similarities(rng, answers),
+            "connections_list": [
+                {"i": i, "dimension_name": dim}
+                for i in range(len(answers))
+                for dim in rng.sample(
+                    targets, rng.randint(0, min(self.max_connections, len(targets)))
+                )
+                if rng.random() < 0.3
+            ],
+        }
+
+    def _fake_merge(self, prompt: str) -> dict:
+        data1 = json.loads(_find(r"^data1: (.+)$", prompt, "{}"))
+        data2 = json.loads(_find(r"^data2: (.+)$", prompt, "{}"))
+        answers = (data1.get("answers_list", []) + data2.get("answers_list", []))
+        answers = answers[: self.max_answers]
+        offset = len(data1.get("answers_list", []))
+        connections = list(data1.get("connections_list", [])) + [
+            {**c, "i": c["i"] + offset} for c in data2.get("connections_list", [])
+        ]
+        return {
+            "answers_list": answers,
+            "similarity_scores": self._fake_similarities(
+                self._content_rng(prompt), answers
+            ),
+            "connections_list": [c for c in connections if c["i"] < len(answers)],
+        }
+
+    @staticmethod
+    def _fake_similarities(rng: random.Random, answers: list[dict]) -> list[dict]:
+        return [
+            {"i": i, "j": j, "score": round(rng.uniform(0.0, 0.9), 2)}
+            for i in range(len(answers))
+            for j in range(i + 1, len(answers))
+            if answers[i]["answer_type"] == answers[j]["answer_type"]
+        ]
+
+    def fake_summary(self, prompt: str) -> str:
+        inquiry = _find(r"^### INQUIRY\n(.+)$", prompt, "the inquiry")
+        dimensions = re.findall(r"^\*\*(.+?)\*\*:", prompt, flags=re.MULTILINE)
+        return (
+            f"Summary for '{inquiry}' across {len(dimensions)} dimensions: "
+            + ", ".join(dimensions)
+            + "."
+        )
+
+    # --- chat model interface ---
+    def _generate(
+        self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        self._call()
+        content = self.fake_summary(self._prompt_text(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    async def _agenerate(
+        self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs
+    ) -> ChatResult:
+        await self._acall()
+        content = self.fake_summary(self._prompt_text(messages))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _stream(
+        self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs
+    ) -> Iterator[ChatGenerationChunk]:
+        self._call()
+        for i, token in enumerate(re.findall(r"\S+\s*", self.fake_summary(self._prompt_text(messages)))):
+            if i and self.token_latency:
+                time.sleep(self.token_latency)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def with_structured_output(self, schema: type[BaseModel], **kwargs) -> RunnableLambda:
+        def invoke(messages):
+            self._call()
+            return schema.model_validate(self.fake_reply(self._prompt_text(messages)))
+
+        async def ainvoke(messages):
+            await self._acall()
+            return schema.model_validate(self.fake_reply(self._prompt_text(messages)))
+
+        return RunnableLambda(invoke, afunc=ainvoke, name=f"FakeLLM[{schema.__name__}]")
@@ -0,0 +1,210 @@
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.utils.stats import percentile
+
+
+class RequestHedger:
+    """Hedged requests: a duplicate for calls slower than usual, first reply wins.
+
+    Latencies are kept per key (e.g. role and model) over the last `window`
+    calls. Once `min_samples` are known, a call still running after the
+    `percentile` of them gets a duplicate; whichever succeeds first is
+    returned and the other is cancelled. Sync calls can't be interrupted, a
+    losing sync request finishes in the background and its result is
+    dropped; their time starts when they run on an executor thread, not when
+    they are queued. Duplicates are capped at `max_hedge_rate` of all calls.
+
+    Each call also returns its outcome: whether it was hedged, whether the
+    duplicate won and its latency without hedging. When the duplicate won,
+    the primary's latency is estimated as the median of the recent latencies
+    above its elapsed time.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_rate: float = 0.05,
+        min_samples: int = 20,
+        window: int = 500,
+        min_delay: float = 0.0,
+        max_workers: int = 64,
+    ):
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be in (0, 100)")
+        self.percentile = percentile
+        self.max_hedge_rate = max_hedge_rate
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+        self._latencies: dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def delay(self, key: str) -> float | None:
+        """Seconds before a call under `key` is hedged; None while too few latencies are known."""
+        with self._lock:
+            samples = list(self._latencies[key])
+        if len(samples) < self.min_samples:
+            return None
+        return max(self.min_delay, percentile(samples, self.percentile))
+
+    def observe(self, key: str, latency: float) -> None:
+        with self._lock:
+            self._latencies[key].append(latency)
+
+    def estimate_latency(self, key: str, elapsed: float) -> float:
+        """Expected latency of a call that is still running after `elapsed` seconds."""
+        with self._lock:
+            slower = [t for t in self._latencies[key] if t > elapsed]
+        return percentile(slower, 50) if slower else elapsed
+
+    def _start(self) -> None:
+        with self._lock:
+            self.calls += 1
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > self.max_hedge_rate * self.calls:
+                return False
+            self.hedges += 1
+            return True
+
+    def _outcome(self, key: str, latency: float, hedged: bool = False, hedge_won: bool = False) -> dict:
+        if hedge_won:
+            with self._lock:
+                self.hedge_wins += 1
+            unhedged = self.estimate_latency(key, latency)
+        else:
+            unhedged = latency
+            self.observe(key, latency)
+        return {"hedged": hedged, "hedge_won": hedge_won, "unhedged_time": unhedged}
+
+    def _submit(self, func):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="hedge")
+            executor = self._executor
+        # one context copy per thread, a context can't be entered twice at once
+        return executor.submit(contextvars.copy_context().run, func)
+
+    def invoke(self, key: str, func):
+        """Run `func()`, hedged if it is slow; return (result, outcome)."""
+        self._start()
+        start = time.perf_counter()
+        delay = self.delay(key)
+        if delay is None:
+            result = func()
+            return result, self._outcome(key, time.perf_counter() - start)
+
+        # time queued for an executor thread is neither latency nor a reason to hedge
+        running = threading.Event()
+
+        def run_primary():
+            running.set()
+            return func()
+
+        primary = self._submit(run_primary)
+        running.wait()
+        start = time.perf_counter()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._allow_hedge():
+            result = primary.result()
+            return result, self._outcome(key, time.perf_counter() - start)
+
+        hedge = self._submit(func)
+        pending, winner, error = {primary, hedge}, None, None
+        while pending and winner is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    winner = winner or future
+                else:
+                    error = error or future.exception()
+        latency = time.perf_counter() - start
+        for future in pending:
+            future.cancel()
+        if winner is None:
+            raise error
+        if winner is hedge and not primary.cancelled():
+            # the primary still runs; its latency keeps the window representative
+            primary.add_done_callback(
+                lambda f: f.cancelled() or f.exception() or self.observe(key, time.perf_counter() - start)
+            )
+        return winner.result(), self._outcome(key, latency, True, winner is hedge)
+
+    async def ainvoke(self, key: str, afunc, slot=None):
+        """Async `invoke` for a coroutine function; the losing request is cancelled.
+
+        `slot` is an async context manager held while the duplicate runs, e.g.
+        the concurrency limiter the primary request already holds a slot of.
+        """
+        self._start()
+        start = time.perf_counter()
+        delay = self.delay(key)
+        if delay is None:
+            result = await afunc()
+            return result, self._outcome(key, time.perf_counter() - start)
+
+        primary = asyncio.ensure_future(afunc())
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._allow_hedge():
+                result = await primary
+                return result, self._outcome(key, time.perf_counter() - start)
+
+            hedge = asyncio.ensure_future(self._in_slot(afunc, slot))
+            pending, winner, error = {primary, hedge}, None, None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                    else:
+                        error = error or task.exception()
+            if winner is None:
+                raise error
+            latency = time.perf_counter() - start
+            return winner.result(), self._outcome(key, latency, True, winner is hedge)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @staticmethod
+    async def _in_slot(afunc, slot):
+        if slot is None:
+            return await afunc()
+        async with slot:
+            return await afunc()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "hedge_rate": self.hedges / self.calls if self.calls else 0.0,
+            }
+
+
+def create_hedger() -> RequestHedger | None:
+    """Create the process-wide hedger from `LLM_HEDGE_*` env vars.
+
+    `LLM_HEDGING=1` enables hedged worker and merger calls.
+    """
+    if os.getenv("LLM_HEDGING", "0") != "1":
+        return None
+    return RequestHedger(
+        percentile=float(os.getenv("LLM_HEDGE_PERCENTILE", "95")),
+        max_hedge_rate=float(os.getenv("LLM_HEDGE_MAX_RATE", "0.05")),
+        min_samples=int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20")),
+    )
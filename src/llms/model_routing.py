@@ -0,0 +1,139 @@
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field, fields
+
+from src.llms.client_pool import LLMClientPool, create_client_pool
+
+ROLES = ("prelim", "cross", "merger", "summarizer")
+
+
+@dataclass
+class ModelRoute:
+    """Backend, model and call settings for one role; `None` keeps the default.
+
+    `params` are extra `create_llm` kwargs (e.g. the fake backend's latency).
+    Prices are USD per million tokens and only used for cost reports.
+    """
+
+    backend: str | None = None
+    model: str | None = None
+    temperature: float | None = None
+    timeout: float | None = None
+    params: dict = field(default_factory=dict)
+    input_price: float | None = None
+    output_price: float | None = None
+
+    def updated(self, other: "ModelRoute") -> "ModelRoute":
+        """This route with the fields `other` sets replacing its own."""
+        values = asdict(self)
+        for f in fields(other):
+            value = getattr(other, f.name)
+            if f.name == "params":
+                values["params"] = {**self.params, **value}
+            elif value is not None:
+                values[f.name] = value
+        return ModelRoute(**values)
+
+    def llm_kwargs(self) -> dict:
+        kwargs = {
+            "backend": self.backend,
+            "model": self.model,
+            "temperature": self.temperature,
+            "timeout": self.timeout,
+        }
+        return {**{k: v for k, v in kwargs.items() if v is not None}, **self.params}
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (prompt_tokens * (self.input_price or 0.0) + completion_tokens * (self.output_price or 0.0)) / 1e6
+
+
+def route_role(call: dict) -> str:
+    """Routing role of an `invoke_llm` call: workers are split into prelim and cross."""
+    role = call.get("role", "")
+    if role == "worker":
+        return "prelim" if call.get("node") == "prelim_nodes" else "cross"
+    return role
+
+
+class ModelRouting:
+    """Maps each role, and optionally each dimension, to a model route.
+
+    Routes are resolved from the least to the most specific entry, each one
+    overriding the fields it sets: `default`, `roles[role]`,
+    `dimensions[dimension]`, `dimensions["role:dimension"]`. Every distinct
+    route gets its own `LLMClientPool` (built on first use, with the
+    `LLM_*` limits and retries), so e.g. merges can go to the fastest model
+    and only the summary to a stronger one.
+    """
+
+    def __init__(
+        self,
+        default: ModelRoute | None = None,
+        roles: dict[str, ModelRoute] | None = None,
+        dimensions: dict[str, ModelRoute] | None = None,
+        name: str = "default",
+    ):
+        unknown = set(roles or {}) - set(ROLES)
+        if unknown:
+            raise ValueError(f"Unknown roles {sorted(unknown)}, expected some of {ROLES}")
+        self.default = default or ModelRoute()
+        self.roles = roles or {}
+        self.dimensions = dimensions or {}
+        self.name = name
+        self._pools: dict[str, LLMClientPool] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dict(cls, data: dict, name: str = "default") -> "ModelRouting":
+        return cls(
+            default=ModelRoute(**data.get("default", {})),
+            roles={role: ModelRoute(**route) for role, route in data.get("roles", {}).items()},
+            dimensions={dim: ModelRoute(**route) for dim, route in data.get("dimensions", {}).items()},
+            name=data.get("name", name),
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> "ModelRouting":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls.from_dict(data, name=os.path.splitext(os.path.basename(path))[0])
+
+    def route(self, role: str, dimension: str | None = None) -> ModelRoute:
+        route = self.default
+        for override in (
+            self.roles.get(role),
+            self.dimensions.get(dimension) if dimension else None,
+            self.dimensions.get(f"{role}:{dimension}") if dimension else None,
+        ):
+            if override is not None:
+                route = route.updated(override)
+        return route
+
+    def client(self, role: str, dimension: str | None = None) -> LLMClientPool:
+        route = self.route(role, dimension)
+        key = json.dumps(route.llm_kwargs(), sort_keys=True)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = self._pools[key] = create_client_pool(**route.llm_kwargs())
+            return pool
+
+    def cost(self, calls: list[dict]) -> float:
+        """USD cost of uncached calls from a `RunProfiler.report()`."""
+        return sum(
+            self.route(route_role(c), c["dimension"]).cost(c["prompt_tokens"], c["completion_tokens"])
+            for c in calls
+            if c["cache"] != "hit"
+        )
+
+
+def create_model_routing() -> ModelRouting | None:
+    """Load the process-wide routing profile from the JSON file in `MODEL_ROUTING`.
+
+    Without it every call goes to the single `create_client_pool()` pool.
+    """
+    path = os.getenv("MODEL_ROUTING")
+    if not path:
+        return None
+    return ModelRouting.from_file(path)
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Content-addressed cache for LLM responses.
+
+    Two tiers: an in-memory LRU and an optional SQLite file. Both honour the
+    TTL and are bounded by number of entries; the least recently used entries
+    are evicted first. Values are stored as JSON strings, so cached objects
+    can't be mutated by callers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        path: str | None = None,
+        ttl: float | None = None,
+        max_disk_entries: int = 100_000,
+    ):
+        self.max_entries = max_entries
+        self.path = path
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_count = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path:
+            self._open_db(path)
+
+    @staticmethod
+    def make_key(
+        model: str,
+        temperature: float | None,
+        schema: str,
+        system_prompt: str,
+        human_prompt: str,
+    ) -> str:
+        payload = json.dumps(
+            [model, temperature, schema, system_prompt, human_prompt],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _open_db(self, path: str) -> None:
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+        )
+        self._db.commit()
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1], now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return entry[0]
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._db.execute(
+                        "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                    self._db.commit()
+                    self._remember(key, row[0], row[1])
+                    self.disk_hits += 1
+                    return row[0]
+                if row is not None:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._disk_count -= 1
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            if self._db is None:
+                return
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO responses VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if cursor.rowcount == 0:
+                self._db.execute(
+                    "UPDATE responses SET value = ?, created_at = ?, accessed_at = ? "
+                    "WHERE key = ?",
+                    (value, now, now, key),
+                )
+            self._disk_count += cursor.rowcount
+            if self._disk_count > self.max_disk_entries:
+                self._evict_disk()
+            self._db.commit()
+
+    def _remember(self, key: str, value: str, created_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        # drop expired entries first, then the least recently used ones
+        if self.ttl is not None:
+            self._db.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+        self._disk_count = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = self._disk_count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self._disk_count -= excess
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+                self._disk_count = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_count,
+        }
+
+
+def create_response_cache() -> ResponseCache | None:
+    """Create the process-wide cache from `LLM_CACHE_*` env vars.
+
+    `LLM_CACHE_SIZE=0` without `LLM_CACHE_PATH` disables caching.
+    """
+    max_entries = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+    path = os.getenv("LLM_CACHE_PATH") or None
+    if max_entries <= 0 and not path:
+        return None
+    ttl = os.getenv("LLM_CACHE_TTL")
+    return ResponseCache(
+        max_entries=max_entries,
+        path=path,
+        ttl=float(ttl) if ttl else None,
+        max_disk_entries=int(os.getenv("LLM_CACHE_MAX_DISK_ENTRIES", "100000")),
+    )
@@ -0,0 +1,19 @@
+import threading
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token for English text. An estimate, not the provider's
+    # count: the same for every backend (including FakeLLM) and known before the call
+    return max(1, len(text) // 4) if text else 0
+
+
+class TokenMeter:
+    """Thread-safe running total of the tokens spent by one node run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def add(self, tokens: int) -> None:
+        with self._lock:
+            self.total += tokens
@@ -0,0 +1,464 @@
+"""Long-running local HTTP service around the compiled graph.
+
+    LLM_BACKEND=fake python src/server.py --port 8765
+    curl -N -d '{"inquiry": "Correct push-ups?"}' localhost:8765/inquiries
+
+`POST /inquiries` streams newline-delimited JSON events (chunked transfer
+encoding): `accepted`, `started`, one `update` per node update, `token` for
+the summary tokens and finally `done` (the result, as in batch mode) or
+`error`. `GET /stats` returns the service counters.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from typing import AsyncIterator
+
+# Ensure the root directory is in the python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.cli import check_keys
+
+MAX_BODY_BYTES = 64 * 1024
+# seconds a client has to send the request line, headers and body
+REQUEST_TIMEOUT = float(os.getenv("SERVICE_REQUEST_TIMEOUT", "30"))
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    408: "Request Timeout",
+    413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+
+class ServiceOverloaded(Exception):
+    """All run slots and queue places are taken."""
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def encode_event(event: dict) -> bytes:
+    # WorkerReply and the other state models are pydantic models
+    def default(value):
+        return value.model_dump() if hasattr(value, "model_dump") else str(value)
+
+    return (
+        json.dumps(event, default=default, ensure_ascii=False).encode("utf-8") + b"\n"
+    )
+
+
+class Flight:
+    """One graph run and the events it produced so far.
+
+    Requests for an inquiry that is already in flight subscribe to its run
+    instead of starting another one; they receive all events from the start.
+    """
+
+    def __init__(self, inquiry: str):
+        self.inquiry = inquiry
+        self.thread_id = f"service-{uuid.uuid4().hex}"
+        self.events: list[dict] = []
+        self.done = False
+        self.created = time.perf_counter()
+        self._changed = asyncio.Condition()
+
+    async def publish(self, event: dict, done: bool = False) -> None:
+        async with self._changed:
+            self.events.append(event)
+            self.done = done
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[dict]:
+        seen = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: len(self.events) > seen or self.done
+                )
+                events, done = self.events[seen:], self.done
+            seen += len(events)
+            for event in events:
+                yield event
+            if done and seen == len(self.events):
+                return
+
+
+class InquiryService:
+    """Runs inquiries on a shared graph with single-flight and admission control.
+
+    At most `max_concurrency` graph runs execute at a time and up to
+    `max_queue` more wait for a slot; beyond that `submit` raises
+    `ServiceOverloaded`. Identical in-flight inquiries share one run. A run
+    finishes even if its clients disconnect; its checkpoints are deleted
+    afterwards. Must be used from one event loop.
+    """
+
+    def __init__(
+        self,
+        graph,
+        max_concurrency: int = 8,
+        max_queue: int = 32,
+        config: dict | None = None,
+    ):
+        if max_concurrency < 1 or max_queue < 0:
+            raise ValueError("max_concurrency must be >= 1 and max_queue >= 0")
+        self.graph = graph
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.config = config or {}
+        self._flights: dict[str, Flight] = {}
+        self._slots: asyncio.Semaphore | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.counters = {
+            "requests": 0,
+            "runs": 0,
+            "coalesced": 0,
+            "rejected": 0,
+            "failed": 0,
+        }
+        self.running = 0
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "running": self.running,
+            "queued": len(self._flights) - self.running,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+    def submit(self, inquiry: str) -> tuple[Flight, bool]:
+        """The flight of `inquiry` and whether it joined a run already in flight."""
+        self.counters["requests"] += 1
+        flight = self._flights.get(inquiry)
+        if flight is not None:
+            self.counters["coalesced"] += 1
+            return flight, True
+        if len(self._flights) >= self.max_concurrency + self.max_queue:
+            self.counters["rejected"] += 1
+            raise ServiceOverloaded(f"{len(self._flights)} inquiries running or queued")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        flight = self._flights[inquiry] = Flight(inquiry)
+        self.counters["runs"] += 1
+        task = asyncio.get_running_loop().create_task(self._run(flight))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return flight, False
+
+    async def stream(self, inquiry: str) -> AsyncIterator[dict]:
+        """Submit `inquiry` and yield its events.
+
+        Raises `ServiceOverloaded` before the first one.
+        """
+        flight, coalesced = self.submit(inquiry)
+        yield {
+            "event": "accepted",
+            "thread_id": flight.thread_id,
+            "coalesced": coalesced,
+        }
+        async for event in flight.subscribe():
+            yield event
+
+    async def _run(self, flight: Flight) -> None:
+        config = {
+            **self.config,
+            "configurable": {
+                **self.config.get("configurable", {}),
+                "thread_id": flight.thread_id,
+            },
+        }
+        try:
+            async with self._slots:
+                self.running += 1
+                try:
+                    await self._run_graph(flight, config)
+                finally:
+                    self.running -= 1
+        finally:
+            self._flights.pop(flight.inquiry, None)
+            # service runs are not resumed; don't let the checkpoints pile up in a
+            # long-lived process
+            checkpointer = getattr(self.graph, "checkpointer", None)
+            if checkpointer:
+                # sync (SQLite) checkpointers would block the event loop
+                await asyncio.to_thread(checkpointer.delete_thread, flight.thread_id)
+
+    async def _run_graph(self, flight: Flight, config: dict) -> None:
+        from src.batch import apply_update, build_result
+
+        started = last = time.perf_counter()
+        await flight.publish(
+            {"event": "started", "queue_wait": started - flight.created}
+        )
+        state, nodes = {}, {}
+        error = None
+        try:
+            async for mode, chunk in self.graph.astream(
+                {"inquiry": flight.inquiry}, config, stream_mode=["updates", "messages"]
+            ):
+                if mode == "messages":
+                    message, metadata = chunk
+                    if (
+                        metadata.get("langgraph_node") == "summarizer"
+                        and isinstance(message.content, str)
+                        and message.content
+                    ):
+                        await flight.publish(
+                            {"event": "token", "text": message.content}
+                        )
+                    continue
+                now = time.perf_counter()
+                for node, update in chunk.items():
+                    nodes.setdefault(node, []).append(now - last)
+                    apply_update(state, update or {})
+                    await flight.publish(
+                        {"event": "update", "node": node, "update": update}
+                    )
+                last = now
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        if error is not None:
+            self.counters["failed"] += 1
+            await flight.publish({"event": "error", "error": error}, done=True)
+            return
+        timings = {"total": time.perf_counter() - started, "nodes": nodes}
+        result = build_result({"inquiry": flight.inquiry}, state, timings, None)
+        await flight.publish({"event": "done", "result": result}, done=True)
+
+    async def join(self) -> None:
+        """Wait for all runs in flight."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+
+# --- HTTP ---
+
+
+async def read_request(
+    reader: asyncio.StreamReader, timeout: float | None = REQUEST_TIMEOUT
+) -> tuple[str, str, dict, bytes]:
+    """Method, path, headers and body; `HTTPError` for requests not to be served."""
+    try:
+        return await asyncio.wait_for(_read_request(reader), timeout)
+    except asyncio.TimeoutError:
+        raise HTTPError(408, f"Request not received within {timeout:g}s") from None
+
+
+async def _readline(reader: asyncio.StreamReader) -> bytes:
+    try:
+        return await reader.readline()
+    except ValueError:  # readline's LimitOverrunError
+        raise HTTPError(400, "Request line or header too long") from None
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict, bytes]:
+    request_line = (await _readline(reader)).decode("latin-1").strip()
+    try:
+        method, path, _ = request_line.split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, f"Malformed request line '{request_line}'") from None
+    headers = {}
+    while (line := await _readline(reader)) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    content_length = headers.get("content-length") or "0"
+    try:
+        length = int(content_length)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(400, f"Invalid Content-Length '{content_length}'")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, f"Request body larger than {MAX_BODY_BYTES} bytes")
+    try:
+        body = await reader.readexactly(length) if length else b""
+    except asyncio.IncompleteReadError:
+        raise HTTPError(400, "Request body shorter than its Content-Length") from None
+    return method, path.split("?", 1)[0], headers, body
+
+
+def response_head(status: int, headers: dict) -> bytes:
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}"]
+    lines += [
+        f"{name}: {value}" for name, value in {**headers, "Connection": "close"}.items()
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def send_json(
+    writer: asyncio.StreamWriter,
+    status: int,
+    payload: dict,
+    headers: dict | None = None,
+) -> None:
+    body = encode_event(payload)
+    head = {
+        "Content-Type": "application/json",
+        "Content-Length": len(body),
+        **(headers or {}),
+    }
+    writer.write(response_head(status, head) + body)
+    await writer.drain()
+
+
+async def send_stream(
+    writer: asyncio.StreamWriter, events: AsyncIterator[dict]
+) -> None:
+    head = response_head(
+        200, {"Content-Type": "application/x-ndjson", "Transfer-Encoding": "chunked"}
+    )
+    writer.write(head)
+    async for event in events:
+        data = encode_event(event)
+        writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+        await writer.drain()
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def handle_connection(
+    service: InquiryService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+):
+    try:
+        try:
+            method, path, _, body = await read_request(reader)
+        except HTTPError as e:
+            await send_json(writer, e.status, {"error": str(e)})
+            return
+        if path == "/stats":
+            await send_json(writer, 200, service.stats())
+        elif path != "/inquiries":
+            await send_json(writer, 404, {"error": f"Unknown path '{path}'"})
+        elif method != "POST":
+            await send_json(writer, 405, {"error": "Use POST"}, {"Allow": "POST"})
+        else:
+            try:
+                inquiry = json.loads(body or b"{}").get("inquiry")
+            except (ValueError, AttributeError):  # not JSON, not UTF-8 or not an object
+                inquiry = None
+            if not isinstance(inquiry, str) or not inquiry.strip():
+                await send_json(
+                    writer, 400, {"error": 'Expected a JSON body {"inquiry": "..."}'}
+                )
+                return
+            events = service.stream(inquiry.strip())
+            try:
+                first = await anext(events)
+            except ServiceOverloaded as e:
+                await send_json(
+                    writer,
+                    503,
+                    {"error": str(e), **service.stats()},
+                    {"Retry-After": 1},
+                )
+                return
+
+            async def all_events():
+                yield first
+                async for event in events:
+                    yield event
+
+            await send_stream(writer, all_events())
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass  # client went away; a shared run keeps going for the others
+    finally:
+        writer.close()
+
+
+async def start_server(
+    service: InquiryService, host: str = "127.0.0.1", port: int = 8765
+) -> asyncio.Server:
+    return await asyncio.start_server(
+        lambda r, w: handle_connection(service, r, w), host, port
+    )
+
+
+async def post_inquiry(host: str, port: int, inquiry: str) -> tuple[int, list[dict]]:
+    """Minimal client: POST an inquiry, return the status and the JSON events."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps({"inquiry": inquiry}).encode("utf-8")
+    writer.write(
+        f"POST /inquiries HTTP/1.1\r\nHost: {host}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    head, _, payload = data.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    if b"transfer-encoding: chunked" in head.lower():
+        chunks = []
+        while payload:
+            size, _, rest = payload.partition(b"\r\n")
+            size = int(size, 16)
+            if size == 0:
+                break
+            chunks.append(rest[:size])
+            payload = rest[size + 2 :]
+        payload = b"".join(chunks)
+    return status, [json.loads(line) for line in payload.splitlines() if line.strip()]
+
+
+def create_inquiry_service(graph=None) -> InquiryService:
+    """Service around the process-wide graph, limits from `SERVICE_*` env vars."""
+    from src.graphs.inquiry_bot import get_default_llm, get_graph
+
+    get_default_llm()  # create the client pool now, not on the first request
+    return InquiryService(
+        graph if graph is not None else get_graph(),
+        max_concurrency=int(os.getenv("SERVICE_CONCURRENCY", "8")),
+        max_queue=int(os.getenv("SERVICE_MAX_QUEUE", "32")),
+        config={
+            "run_name": "InquiryDecompositionGraph",
+            "metadata": {
+                "environment": "development",
+                "interface": "service",
+                "dimensions_count": 22,
+            },
+        },
+    )
+
+
+async def serve(host: str, port: int) -> None:
+    service = create_inquiry_service()
+    server = await start_server(service, host, port)
+    print(
+        f"Serving on http://{host}:{port} "
+        f"(concurrency {service.max_concurrency}, queue {service.max_queue})",
+        flush=True,
+    )
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local HTTP service for the Inquiry Bot"
+    )
+    parser.add_argument("--host", default=os.getenv("SERVICE_HOST", "127.0.0.1"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("SERVICE_PORT", "8765"))
+    )
+    args = parser.parse_args()
+    check_keys()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+import os
+import uuid
+
+import pytest
+
+from src.llms.fake_llm import FakeLLM
+
+# the process-wide response cache is off in tests (it is created when
+# src.graphs.inquiry_bot is first imported); a test that exercises caching
+# passes its own, e.g. graph_config(response_cache=ResponseCache())
+os.environ["LLM_CACHE_SIZE"] = "0"
+os.environ.pop("LLM_CACHE_PATH", None)
+
+
+@pytest.fixture
+def graph_config():
+    """Build a run config: a fresh thread id and a `FakeLLM`, unless overridden.
+
+    Keyword arguments are added to (or replace) the `configurable` entries,
+    e.g. `graph_config(thread_id="t1", profiler=RunProfiler())`.
+    """
+
+    def make(**configurable) -> dict:
+        return {
+            "configurable": {
+                "thread_id": f"test-{uuid.uuid4().hex[:8]}",
+                "llm": FakeLLM(),
+                **configurable,
+            }
+        }
+
+    return make
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from src.llms.concurrency import AsyncConcurrencyLimiter
+
+
+def test_concurrency_limiter_bounds_in_flight():
+    limiter = AsyncConcurrencyLimiter(3)
+
+    async def task():
+        async with limiter:
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(task() for _ in range(20)))
+
+    asyncio.run(main())
+    asyncio.run(main())  # a new event loop gets its own semaphore
+
+    assert limiter.peak_in_flight == 3
+    assert limiter.in_flight == 0
+
+
+def test_concurrency_limiter_rejects_invalid_limit():
+    with pytest.raises(ValueError):
+        AsyncConcurrencyLimiter(0)
+
+
+def test_async_graph_matches_sync_graph(graph_config):
+    from src.graphs.inquiry_bot import graph
+
+    async def run_many():
+        return await asyncio.gather(
+            *(
+                graph.ainvoke({"inquiry": "Correct push-ups?"}, graph_config())
+                for i in range(3)
+            )
+        )
+
+    sync_final = graph.invoke({"inquiry": "Correct push-ups?"}, graph_config())
+    async_finals = asyncio.run(run_many())
+
+    for final in async_finals:
+        assert final["summary"] == sync_final["summary"]
+        assert final["worker_replies"] == sync_final["worker_replies"]
@@ -0,0 +1,79 @@
+import asyncio
+import io
+import json
+
+from src.batch import load_completed, read_inquiries, run_batch
+from src.llms.fake_llm import FakeLLM, FakeLLMError
+
+
+def test_read_inquiries_jsonl_and_csv(tmp_path):
+    jsonl = tmp_path / "in.jsonl"
+    jsonl.write_text('{"id": 1, "inquiry": "Q1"}\n\n"Q2"\n')
+    csv_file = tmp_path / "in.csv"
+    csv_file.write_text("id,inquiry\nx,Q3\ny,\n")
+
+    assert list(read_inquiries(str(jsonl))) == [{"id": 1, "inquiry": "Q1"}, {"inquiry": "Q2"}]
+    assert list(read_inquiries(str(csv_file))) == [{"id": "x", "inquiry": "Q3"}]
+
+
+def test_load_completed_skips_failed_and_partial_lines(tmp_path):
+    output = tmp_path / "out.jsonl"
+    output.write_text(
+        json.dumps({"id": 1, "inquiry": "Q1", "error": None}) + "\n"
+        + json.dumps({"id": None, "inquiry": "Q2", "error": "boom"}) + "\n"
+        + '{"id": 3, "inqu'
+    )
+    assert load_completed(str(output)) == {"1"}
+
+
+def run(config, records, completed=None):
+    from src.graphs.inquiry_bot import graph
+
+    output = io.StringIO()
+    stats = asyncio.run(run_batch(graph, records, output, 2, completed, config))
+    return stats, [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_run_batch_streams_results_and_resumes(graph_config):
+    records = [{"id": "a", "inquiry": "Correct push-ups?"}, {"inquiry": "Why do cats purr?"}]
+
+    stats, results = run(graph_config(), records, completed={"a"})
+
+    assert stats == {"done": 1, "failed": 0, "skipped": 1}
+    result = results[0]
+    assert result["inquiry"] == "Why do cats purr?"
+    assert result["summary"].startswith("Summary for 'Why do cats purr?'")
+    assert len(result["worker_replies"]) == 22
+    assert result["metrics"]["supervisor"] > 0
+    assert result["timings"]["total"] > 0
+    assert len(result["timings"]["nodes"]["cross_nodes"]) == result["metrics"]["loop_count"]
+
+
+def test_run_batch_records_errors(graph_config):
+    stats, results = run(graph_config(llm=FakeLLM(error_rate=1.0)), [{"inquiry": "Q"}])
+
+    assert stats["failed"] == 1
+    assert results[0]["error"].startswith(FakeLLMError.__name__)
+
+
+def test_run_batch_records_invalid_records(graph_config):
+    stats, results = run(
+        graph_config(), [{"id": 2}, ["Q"], {"id": 3, "inquiry": "Correct push-ups?"}]
+    )
+
+    assert stats == {"done": 1, "failed": 2, "skipped": 0}
+    errors = {result["id"]: result["error"] for result in results}
+    assert errors[2] == "record 2 has no inquiry"
+    assert errors[None].startswith("invalid record")
+    assert errors[3] is None
+
+
+def test_run_batch_fails_broken_lines_individually(graph_config, tmp_path):
+    jsonl = tmp_path / "in.jsonl"
+    jsonl.write_text('{"id": 1, "inquiry": "Correct push-ups?"}\n{"id": 2, "inq\n"Why do cats purr?"\n')
+
+    stats, results = run(graph_config(), read_inquiries(str(jsonl)))
+
+    assert stats == {"done": 2, "failed": 1, "skipped": 0}
+    errors = [result["error"] for result in results if result["error"]]
+    assert len(errors) == 1 and errors[0].startswith("line 2 is not valid JSON")
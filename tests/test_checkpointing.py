@@ -0,0 +1,164 @@
+import time
+
+import pytest
+
+from src.agents.workers.inquiry_base import WorkerReply
+from src.graphs.checkpointing import SQLiteCheckpointer, replay_depth
+from src.llms.fake_llm import FakeLLM, FakeLLMError
+
+
+@pytest.fixture
+def saver(tmp_path):
+    saver = SQLiteCheckpointer(str(tmp_path / "checkpoints.sqlite"))
+    yield saver
+    saver.close()
+
+
+def test_graph_state_roundtrip_through_sqlite(graph_config, saver):
+    from src.graphs.inquiry_bot import workflow
+
+    graph = workflow.compile(checkpointer=saver)
+    config = graph_config()
+    result = graph.invoke({"inquiry": "Why do leaves change color?"}, config)
+
+    state = graph.get_state(config)
+    assert state.next == ()
+    assert state.values["summary"] == result["summary"]
+    assert all(isinstance(r, WorkerReply) for r in state.values["worker_replies"].values())
+    # only the latest checkpoint of the thread and those its delta channels replay are kept
+    latest = saver.get_tuple(config)
+    assert saver.stats()["checkpoints"] <= replay_depth(latest.metadata) + 1
+    assert len(list(graph.get_state_history(config))) == saver.stats()["checkpoints"]
+
+
+def test_rerun_on_same_thread_starts_from_scratch(graph_config, saver):
+    from src.graphs.inquiry_bot import workflow
+
+    graph = workflow.compile(checkpointer=saver)
+    fresh = graph.invoke({"inquiry": "Correct push-ups?"}, graph_config())
+
+    config = graph_config()
+    graph.invoke({"inquiry": "Why do leaves change color?"}, config)
+    graph.invoke({"inquiry": "Correct push-ups?"}, config)
+    rerun = graph.invoke({"inquiry": "Correct push-ups?"}, config)
+
+    assert rerun["worker_replies"] == fresh["worker_replies"]
+    assert rerun["reply_revisions"] == fresh["reply_revisions"]
+    assert rerun["supervisor_metric"] == fresh["supervisor_metric"]
+
+
+def test_interrupted_run_resumes(graph_config, saver):
+    from src.graphs.inquiry_bot import workflow
+
+    graph = workflow.compile(checkpointer=saver)
+    inquiry = {"inquiry": "How do vaccines work?"}
+    config = graph_config(thread_id="t2")
+    with pytest.raises(FakeLLMError):
+        graph.invoke(inquiry, graph_config(thread_id="t2", llm=FakeLLM(error_rate=1.0)))
+    assert graph.get_state(config).next == ("prelim_nodes",)
+
+    resumed = graph.invoke(None, config)
+    fresh = graph.invoke(inquiry, graph_config())
+    assert resumed["summary"] == fresh["summary"]
+
+
+def test_keep_history(graph_config, tmp_path):
+    from src.graphs.inquiry_bot import workflow
+
+    saver = SQLiteCheckpointer(str(tmp_path / "history.sqlite"), keep_latest_only=False)
+    graph = workflow.compile(checkpointer=saver)
+    config = graph_config(thread_id="t4")
+    graph.invoke({"inquiry": "What is entropy?"}, config)
+    result = graph.invoke({"inquiry": "What is enthalpy?"}, config)
+    history = list(graph.get_state_history(config))
+    assert len(history) > replay_depth(history[0].metadata) + 1
+
+    saver.prune(["t4"])
+    assert len(list(graph.get_state_history(config))) == replay_depth(history[0].metadata) + 1
+    assert graph.get_state(config).values["worker_replies"] == result["worker_replies"]
+    saver.close()
+
+
+def test_checkpoints_store_only_changed_replies(graph_config, tmp_path):
+    from src.graphs.inquiry_bot import workflow
+
+    saver = SQLiteCheckpointer(str(tmp_path / "delta.sqlite"), keep_latest_only=False)
+    graph = workflow.compile(checkpointer=saver)
+    config = graph_config()
+    result = graph.invoke({"inquiry": "Why is the sky blue?"}, config)
+
+    reply_writes = [
+        value
+        for item in saver.list(config)
+        for _, channel, value in item.pending_writes
+        if channel == "worker_replies" and value is not None  # None: reset by init_node
+    ]
+    assert sum(len(value) for value in reply_writes) == sum(result["reply_revisions"].values())
+    assert set(result["reply_revisions"]) == set(result["worker_replies"])
+    # the channels are rebuilt from the writes since the last snapshot
+    fresh = SQLiteCheckpointer(saver.path)
+    state = workflow.compile(checkpointer=fresh).get_state(config)
+    assert state.values["worker_replies"] == result["worker_replies"]
+    assert state.values["reply_revisions"] == result["reply_revisions"]
+    fresh.close()
+    saver.close()
+
+
+def test_retention_by_age_and_size(graph_config, tmp_path):
+    from src.graphs.inquiry_bot import workflow
+
+    saver = SQLiteCheckpointer(str(tmp_path / "retention.sqlite"))
+    graph = workflow.compile(checkpointer=saver)
+    for i in range(3):
+        graph.invoke({"inquiry": f"Inquiry {i}?"}, graph_config(thread_id=f"t{i}"))
+    assert saver.stats()["threads"] == 3
+
+    saver.max_bytes = saver.stats()["bytes"] // 2
+    report = saver.compact()
+    assert report["threads"] < 3
+    assert report["bytes"] <= saver.max_bytes
+    # the least recently updated thread is evicted first
+    assert saver.get_tuple(graph_config(thread_id="t0")) is None
+    assert saver.get_tuple(graph_config(thread_id="t2")) is not None
+
+    time.sleep(0.01)
+    saver.max_age = 0.0
+    assert saver.compact()["threads"] == 0
+    saver.close()
+
+
+def test_delete_thread(graph_config, saver):
+    from src.graphs.inquiry_bot import workflow
+
+    graph = workflow.compile(checkpointer=saver)
+    graph.invoke({"inquiry": "What is a black hole?"}, graph_config(thread_id="t5"))
+    saver.delete_thread("t5")
+    assert saver.get_tuple(graph_config(thread_id="t5")) is None
+    assert saver.stats() == {"threads": 0, "checkpoints": 0, "writes": 0, "bytes": 0}
+
+
+def test_list_applies_before_and_limit_in_the_query(graph_config, tmp_path):
+    from unittest.mock import patch
+
+    from src.graphs.inquiry_bot import workflow
+
+    saver = SQLiteCheckpointer(str(tmp_path / "list.sqlite"), keep_latest_only=False)
+    graph = workflow.compile(checkpointer=saver)
+    config = graph_config()
+    graph.invoke({"inquiry": "What is a quasar?"}, config)
+    history = list(saver.list(config))
+    assert len(history) > 3
+
+    with patch.object(saver, "_to_tuple", wraps=saver._to_tuple) as to_tuple:
+        latest = list(saver.list(config, limit=2))
+        assert to_tuple.call_count == 2
+    assert [t.config for t in latest] == [t.config for t in history[:2]]
+    older = list(saver.list(config, before=history[1].config, limit=1))
+    assert [t.config for t in older] == [history[2].config]
+    assert list(saver.list(config, limit=0)) == []
+
+    step = history[-1].metadata["step"]
+    assert [t.config for t in saver.list(config, filter={"step": step}, limit=1)] == [
+        history[-1].config
+    ]
+    saver.close()
@@ -47,3 +47,76 @@ def test_cli_error(mock_graph, capsys):
     
     captured = capsys.readouterr()
     assert "An error occurred during execution: Test exception" in captured.out
+
+@patch('src.cli.graph')
+def test_cli_async(mock_graph, capsys):
+    async def astream(initial_state, config):
+        yield {"summarizer": {"summary": "Async summary."}}
+
+    mock_graph.astream = astream
+
+    test_args = ["cli.py", "-q", "Test query", "--async"]
+    with patch.object(sys, 'argv', test_args):
+        main()
+
+    stdout = capsys.readouterr().out
+    assert "Final Summary:" in stdout
+    assert "Async summary." in stdout
+    assert "Execution Finished" in stdout
+    mock_graph.stream.assert_not_called()
+
+
+@patch('src.cli.graph')
+def test_cli_stream(mock_graph, capsys):
+    token = MagicMock(content="Streamed ")
+    mock_graph.stream.return_value = [
+        ("updates", {"init_node": {"status": "started"}}),
+        ("messages", (MagicMock(content="ignored"), {"langgraph_node": "prelim_nodes"})),
+        ("messages", (token, {"langgraph_node": "summarizer"})),
+        ("messages", (MagicMock(content="summary."), {"langgraph_node": "summarizer"})),
+        ("updates", {"summarizer": {"summary": "Streamed summary."}}),
+    ]
+
+    test_args = ["cli.py", "-q", "Test query", "--stream"]
+    with patch.object(sys, 'argv', test_args):
+        main()
+
+    stdout = capsys.readouterr().out
+    assert "Final Summary:\nStreamed summary." in stdout
+    assert stdout.count("Streamed summary.") == 1
+    assert "ignored" not in stdout
+    assert "Time to first token:" in stdout and "total time:" in stdout
+    assert mock_graph.stream.call_args.kwargs["stream_mode"] == ["updates", "messages"]
+
+
+def test_summary_tokens_are_streamed(graph_config):
+    from src.graphs.inquiry_bot import graph as real_graph
+
+    config = graph_config()
+    tokens = []
+    for message, metadata in real_graph.stream({"inquiry": "Correct push-ups?"}, config, stream_mode="messages"):
+        if metadata["langgraph_node"] == "summarizer":
+            tokens.append(message.content)
+    assert len(tokens) > 1
+    assert "".join(tokens).startswith("Summary for 'Correct push-ups?'")
+
+
+def test_cli_import_is_lazy():
+    import subprocess
+
+    code = "import sys, src.cli; print('langgraph' in sys.modules, 'src.graphs.inquiry_bot' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_help_does_not_build_graph(capsys):
+    import src.cli
+
+    with patch.object(sys, 'argv', ["cli.py", "--help"]):
+        with pytest.raises(SystemExit) as e:
+            main()
+    assert e.value.code == 0
+    assert src.cli.graph is None
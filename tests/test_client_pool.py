@@ -0,0 +1,130 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.agents.workers.inquiry_base import WorkerReply
+from src.graphs.profiling import RunProfiler
+from src.llms.client_pool import (
+    CircuitBreaker,
+    CircuitOpenError,
+    LLMClientPool,
+    TokenBucket,
+    as_client_pool,
+)
+from src.llms.fake_llm import FakeLLM, FakeLLMError
+from src.llms.response_cache import ResponseCache
+
+MESSAGES = [HumanMessage(content="Hello")]
+
+
+def test_token_bucket_waits_when_empty():
+    bucket = TokenBucket(rate_per_minute=60, capacity=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.wait_time() == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.05)
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()  # one trial call
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_retries_transient_errors():
+    llm = FakeLLM(error_rate=0.5, seed=3)
+    pool = LLMClientPool([llm], max_retries=10, base_delay=0.0, failure_threshold=100)
+    results = [pool.invoke(MESSAGES) for _ in range(10)]
+
+    assert sum(retries for _, retries, _ in results) == llm.errors > 0
+    assert all(response.content for response, _, _ in results)
+
+    with pytest.raises(FakeLLMError):
+        LLMClientPool([FakeLLM(error_rate=1.0)], max_retries=2, base_delay=0.0).invoke(MESSAGES)
+
+
+def test_other_errors_are_not_retried():
+    pool = LLMClientPool([FakeLLM()], max_retries=3, base_delay=0.0, failure_threshold=1)
+    with patch.object(FakeLLM, "_generate", side_effect=ValueError("invalid")) as generate:
+        with pytest.raises(ValueError):
+            pool.invoke(MESSAGES)
+    assert generate.call_count == 1
+    assert pool.stats()[0]["breaker"] == "closed"
+
+
+def test_cache_keys_on_the_serving_model(graph_config):
+    from src.graphs.inquiry_bot import invoke_llm
+
+    cache = ResponseCache()
+    flash, pro = FakeLLM(model="fake-flash"), FakeLLM(model="fake-pro", error_rate=1.0)
+    pool = LLMClientPool([pro, flash], max_retries=1, base_delay=0.0)
+    config = graph_config(llm=pool, response_cache=cache)
+    reply = invoke_llm("system", "human", config)
+
+    assert pro.calls == 1 and flash.calls == 1
+    assert cache.get(ResponseCache.make_key("fake-flash", 0, "text", "system", "human"))
+    assert not cache.get(ResponseCache.make_key("fake-pro", 0, "text", "system", "human"))
+    # any endpoint's reply is a hit for the pool
+    assert invoke_llm("system", "human", config) == reply
+    assert flash.calls == 1
+
+
+def test_load_is_spread_and_failing_endpoints_are_skipped():
+    healthy, failing = FakeLLM(), FakeLLM(error_rate=1.0)
+    pool = LLMClientPool(
+        [healthy, failing], max_retries=1, base_delay=0.0, failure_threshold=1, reset_timeout=60
+    )
+    for _ in range(10):
+        pool.invoke(MESSAGES)
+
+    assert failing.calls == 1  # breaker opened after the first failure
+    assert healthy.calls == 10
+    assert [e["breaker"] for e in pool.stats()] == ["closed", "open"]
+
+    spread = [FakeLLM(), FakeLLM()]
+    pool = LLMClientPool(spread)
+
+    async def run_all():
+        await asyncio.gather(*(pool.ainvoke(MESSAGES) for _ in range(6)))
+
+    asyncio.run(run_all())
+    assert [llm.calls for llm in spread] == [3, 3]
+
+
+def test_all_circuits_open_fails_fast():
+    pool = LLMClientPool([FakeLLM(error_rate=1.0)], max_retries=0, failure_threshold=1)
+    with pytest.raises(FakeLLMError):
+        pool.invoke(MESSAGES)
+    with pytest.raises(CircuitOpenError):
+        pool.invoke(MESSAGES)
+
+
+def test_structured_runnables_are_reused():
+    llm = FakeLLM()
+    pool = as_client_pool(llm)
+    assert as_client_pool(llm) is pool
+    endpoint = pool.endpoints[0]
+    assert endpoint.runnable(WorkerReply) is endpoint.runnable(WorkerReply)
+
+
+def test_graph_survives_transient_errors(graph_config):
+    from src.graphs.inquiry_bot import graph
+
+    profiler = RunProfiler()
+    pool = LLMClientPool([FakeLLM(error_rate=0.1, seed=1)], max_retries=5, base_delay=0.0)
+    config = graph_config(llm=pool, profiler=profiler)
+    state = graph.invoke({"inquiry": "Why do cats purr?"}, config)
+
+    assert state["summary"]
+    assert profiler.report()["totals"]["retries"] > 0
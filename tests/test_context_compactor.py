@@ -0,0 +1,56 @@
+import json
+
+from src.agents.workers.context_compactor import CONTEXT_HEADER, ContextCompactor
+from src.graphs.profiling import RunProfiler
+
+
+def answer(text, score, from_dim, answer_type="cause"):
+    return {"answer": text, "answer_type": answer_type, "score": score, "from_dim": from_dim}
+
+
+ANSWERS = [
+    answer("Cats purr to calm themselves", 0.7, "Affective"),
+    answer("Cats purr to calm themselves.", 0.9, "Causal"),
+    answer("Purring frequency helps bone healing", 0.6, "Impact"),
+    answer("Kittens purr when nursing", 0.8, "Temporal", "event"),
+]
+
+
+def test_dedupes_near_identical_answers_and_keeps_sources():
+    context, stats = ContextCompactor().compact(ANSWERS)
+    lines = context.splitlines()
+
+    assert lines[0] == CONTEXT_HEADER
+    assert lines[1] == "0.90 | cause | Causal,Affective | Cats purr to calm themselves."
+    assert [line.split(" | ")[0] for line in lines[1:]] == ["0.90", "0.80", "0.60"]
+    assert stats["answers"] == 4 and stats["kept"] == 3
+    assert stats["tokens"] < stats["raw_tokens"]
+
+
+def test_top_k_token_budget_and_stable_encoding():
+    context, stats = ContextCompactor(max_answers=2).compact(ANSWERS)
+    assert stats["kept"] == 2
+
+    context, stats = ContextCompactor(token_budget=1).compact(ANSWERS)
+    assert stats["kept"] == 1  # at least the best answer
+
+    assert ContextCompactor().compact(ANSWERS)[0] == ContextCompactor().compact(ANSWERS[::-1])[0]
+
+
+def test_cross_calls_report_context_token_reduction(graph_config):
+    from src.graphs.inquiry_bot import graph
+
+    def run(compactor):
+        profiler = RunProfiler()
+        config = graph_config(profiler=profiler, context_compactor=compactor)
+        graph.invoke({"inquiry": "Why do cats purr?"}, config)
+        return profiler.report()
+
+    raw = run(None)
+    compact = run(ContextCompactor())
+
+    cross_calls = [c for c in compact["calls"] if c["node"] == "cross_nodes" and c["role"] == "worker"]
+    assert cross_calls and all(c["context_tokens"] <= c["raw_context_tokens"] for c in cross_calls)
+    assert compact["totals"]["context_tokens"] < compact["totals"]["raw_context_tokens"]
+    assert raw["totals"]["context_tokens"] == raw["totals"]["raw_context_tokens"]
+    json.dumps(compact)  # serializable report
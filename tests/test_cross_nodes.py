@@ -0,0 +1,67 @@
+from src.agents.supervisors.stopping_policy import StoppingPolicy
+from src.graphs.inquiry_bot import frontier_inputs, graph, summarize_cross_timing
+
+
+def test_summarize_cross_timing():
+    timings = {
+        "Causal": {"queued": 0.0, "cross": 3.0, "merge": 1.0, "done": 4.0},
+        "Agent": {"queued": 0.0, "cross": 1.0, "merge": 2.0, "done": 3.0},
+    }
+    summary = summarize_cross_timing(0, timings, 4.1)
+
+    assert summary["critical_dimension"] == "Causal"
+    assert summary["max_cross_plus_merge"] == 4.0
+    assert summary["max_cross_plus_max_merge"] == 5.0
+
+
+def test_cross_nodes_report_per_dimension_timing(graph_config):
+    # fixed number of loops
+    config = graph_config(
+        stopping_policy=StoppingPolicy(
+            min_relative_gain=None, stop_without_new_connections=False
+        )
+    )
+    loops = [
+        update["cross_timing"]
+        for event in graph.stream({"inquiry": "Correct push-ups?"}, config)
+        for node, update in event.items()
+        if node == "cross_nodes"
+    ]
+
+    assert [loop["loop"] for loop in loops] == [0, 1, 2]
+    for loop in loops:
+        for timing in loop["dimensions"].values():
+            assert timing["done"] >= timing["cross"] + timing["merge"]
+        assert loop["loop_time"] >= loop["max_cross_plus_merge"]
+
+
+def test_frontier_inputs_drop_delivered_edges():
+    inputs = {
+        "Causal": [{"from_dim": "Agent", "answer": "a"}, {"from_dim": "Content", "answer": "b"}],
+        "Agent": [{"from_dim": "Causal", "answer": "c"}],
+    }
+    delivered = {("Agent", "a", "Causal"), ("Causal", "c", "Agent")}
+
+    assert frontier_inputs(inputs, delivered) == {"Causal": [{"from_dim": "Content", "answer": "b"}]}
+    assert frontier_inputs(inputs, set()) == inputs
+
+
+def test_cross_loops_send_every_connection_once(graph_config):
+    config = graph_config(
+        stopping_policy=StoppingPolicy(
+            min_relative_gain=None, stop_without_new_connections=False
+        )
+    )
+    sent, loops = [], []
+    for event in graph.stream({"inquiry": "Correct push-ups?"}, config):
+        for node, update in event.items():
+            if node == "cross_nodes":
+                delivered = {tuple(edge) for edge in update["delivered_edges"]}
+                sent.append(delivered - set().union(*sent))
+                loops.append(update["cross_timing"])
+
+    assert sent[0]
+    for loop, new_edges in zip(loops, sent):
+        # one call per dimension that received a new connection
+        assert loop["calls"] == len({to_dim for _, _, to_dim in new_edges})
+    assert any(loop["skipped_calls"] for loop in loops[1:])
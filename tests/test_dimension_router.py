@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from src.agents.supervisors.dimension_router import DimensionRouter, supervisor_metric
+from src.agents.workers.inquiry_base import ALL_DIMENSIONS
+from src.llms.fake_llm import FakeLLM
+
+HISTORY = [
+    ("How to do correct push-ups?", {"Procedural": 3.0, "Kinetic": 2.5, "Ethical": 0.0}),
+    ("How to do correct squats?", {"Procedural": 2.8, "Kinetic": 2.7, "Subtext": 0.1}),
+    ("Is it ethical to eat meat?", {"Ethical": 3.2, "Perspective": 2.0, "Kinetic": 0.0}),
+]
+
+
+def fitted_router(**kwargs):
+    return DimensionRouter(**kwargs).fit([q for q, _ in HISTORY], [m for _, m in HISTORY])
+
+
+def test_route_from_stats_of_similar_inquiries():
+    routing = fitted_router(min_dimensions=2).route("Correct push-ups?")
+
+    assert routing["source"] == "stats"
+    assert set(routing["selected"]) == {"Procedural", "Kinetic"}
+    assert routing["calls_saved"] == len(ALL_DIMENSIONS) - 2
+    assert not routing["fallback"]
+    # selected dimensions keep the ALL_DIMENSIONS order
+    assert routing["selected"] == [d for d in ALL_DIMENSIONS if d in routing["selected"]]
+
+
+def test_recall_target_and_fallback():
+    low = fitted_router(recall=0.5, min_dimensions=1).route("Correct push-ups?")
+    high = fitted_router(recall=1.0, min_dimensions=1).route("Correct push-ups?")
+    assert len(low["selected"]) < len(high["selected"])
+
+    # nothing similar and no keyword overlap: all dimensions
+    routing = fitted_router(min_similarity=0.99).route("zzz qqq")
+    assert routing["fallback"] and routing["selected"] == ALL_DIMENSIONS
+
+    with pytest.raises(ValueError):
+        DimensionRouter(recall=0.0)
+
+
+def test_keyword_router_without_history():
+    routing = DimensionRouter(min_dimensions=3).route("Is it ethical to eat meat?")
+    assert routing["source"] == "keyword"
+    assert "Ethical" in routing["selected"]
+
+
+def test_evaluate_reports_calls_saved_and_metric_loss():
+    router = fitted_router(min_dimensions=2)
+    report = router.evaluate([HISTORY[0][0]], [HISTORY[0][1]])
+
+    assert report["calls_saved"] == len(ALL_DIMENSIONS) - 2
+    assert report["metric_full"] == pytest.approx(supervisor_metric(HISTORY[0][1]))
+    assert report["metric_loss"] == pytest.approx(0.0)
+
+
+def test_from_batch_results(tmp_path):
+    path = tmp_path / "results.jsonl"
+    lines = [
+        {"inquiry": q, "metrics": {"workers": m}, "error": None} for q, m in HISTORY
+    ] + [{"inquiry": "failed", "metrics": None, "error": "boom"}]
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+
+    router = DimensionRouter.from_batch_results(str(path), min_dimensions=2)
+    assert router.route("Correct push-ups?")["source"] == "stats"
+
+
+def test_graph_runs_only_routed_dimensions(graph_config):
+    from src.graphs.inquiry_bot import graph
+
+    llm = FakeLLM()
+    config = graph_config(llm=llm, dimension_router=fitted_router(min_dimensions=2))
+    events = list(graph.stream({"inquiry": "Correct push-ups?"}, config))
+    routing = next(e["router"]["routing"] for e in events if "router" in e)
+    prelim = next(e["prelim_nodes"] for e in events if "prelim_nodes" in e)
+
+    assert set(prelim["worker_replies"]) == set(routing["selected"])
@@ -0,0 +1,40 @@
+import pytest
+from langchain_core.messages import SystemMessage, HumanMessage
+
+from src.llms.fake_llm import FakeLLM, FakeLLMError
+from src.agents.workers.inquiry_base import WorkerReply, InquiryCausal
+
+
+def test_fake_llm_structured_reply_is_valid_and_deterministic():
+    llm = FakeLLM()
+    prompt = InquiryCausal.render_prompt("Correct push-ups?")
+    messages = [SystemMessage(content=prompt), HumanMessage(content="Go")]
+
+    reply1 = llm.with_structured_output(WorkerReply).invoke(messages)
+    reply2 = llm.with_structured_output(WorkerReply).invoke(messages)
+
+    assert isinstance(reply1, WorkerReply)
+    assert reply1 == reply2
+    assert 1 <= len(reply1.answers_list) <= 5
+    assert all(c.i < len(reply1.answers_list) for c in reply1.connections_list)
+    assert all(c.dimension_name != "Causal" for c in reply1.connections_list)
+    assert llm.calls == 2
+
+
+def test_fake_llm_error_rate():
+    llm = FakeLLM(error_rate=1.0)
+    with pytest.raises(FakeLLMError):
+        llm.with_structured_output(WorkerReply).invoke("prompt")
+    assert llm.errors == 1
+
+
+def test_graph_runs_offline_with_fake_llm(graph_config):
+    from src.graphs.inquiry_bot import graph
+
+    llm = FakeLLM()
+    config = graph_config(llm=llm)
+    final = graph.invoke({"inquiry": "Correct push-ups?"}, config)
+
+    assert final["summary"].startswith("Summary for 'Correct push-ups?'")
+    assert len(final["worker_replies"]) == 22
+    assert llm.calls >= 23
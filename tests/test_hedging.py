@@ -0,0 +1,136 @@
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.graphs.inquiry_bot import graph
+from src.graphs.profiling import RunProfiler
+from src.llms.fake_llm import FakeLLM
+from src.llms.concurrency import AsyncConcurrencyLimiter
+from src.llms.hedging import RequestHedger
+
+
+def warmed_up(hedger: RequestHedger, key: str = "worker", latency: float = 0.01) -> RequestHedger:
+    for _ in range(hedger.min_samples):
+        hedger.observe(key, latency)
+    return hedger
+
+
+def slow_first(slow: float = 0.5, fast: float = 0.01):
+    """Sync function whose first call is a straggler."""
+    counter = itertools.count()
+
+    def func():
+        n = next(counter)
+        time.sleep(slow if n == 0 else fast)
+        return n
+
+    return func
+
+
+def test_no_hedging_until_enough_latencies_are_known():
+    hedger = RequestHedger(min_samples=5, max_hedge_rate=1.0)
+    assert hedger.delay("worker") is None
+    result, outcome = hedger.invoke("worker", lambda: "ok")
+    assert result == "ok" and not outcome["hedged"]
+    assert hedger.stats()["hedges"] == 0
+
+
+def test_slow_call_is_hedged_and_the_duplicate_wins():
+    hedger = warmed_up(RequestHedger(min_samples=5, max_hedge_rate=1.0))
+    start = time.perf_counter()
+    result, outcome = hedger.invoke("worker", slow_first())
+    assert time.perf_counter() - start < 0.3
+    assert result == 1
+    assert outcome["hedged"] and outcome["hedge_won"]
+    assert hedger.stats() == {"calls": 1, "hedges": 1, "hedge_wins": 1, "hedge_rate": 1.0}
+
+
+def test_queue_wait_does_not_trigger_hedges():
+    hedger = warmed_up(
+        RequestHedger(min_samples=5, max_hedge_rate=0.5, max_workers=4), latency=0.2
+    )
+
+    def call(_):
+        return hedger.invoke("worker", lambda: time.sleep(0.1))
+
+    with ThreadPoolExecutor(16) as callers:
+        outcomes = list(callers.map(call, range(16)))
+    assert hedger.stats()["hedges"] == 0
+    assert all(outcome["unhedged_time"] < 0.18 for _, outcome in outcomes)
+
+
+def test_hedge_rate_is_capped():
+    hedger = warmed_up(RequestHedger(min_samples=5, max_hedge_rate=0.5))
+    _, outcome = hedger.invoke("worker", lambda: time.sleep(0.05))
+    assert not outcome["hedged"]  # 1 hedge in 1 call would exceed 50%
+    _, outcome = hedger.invoke("worker", lambda: time.sleep(0.05))
+    assert outcome["hedged"]
+
+
+def test_async_loser_is_cancelled():
+    hedger = warmed_up(RequestHedger(min_samples=5, max_hedge_rate=1.0))
+    started, cancelled = [], []
+
+    async def afunc():
+        n = len(started)
+        started.append(n)
+        try:
+            await asyncio.sleep(0.5 if n == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(n)
+            raise
+        return n
+
+    async def main():
+        result = await hedger.ainvoke("worker", afunc)
+        await asyncio.sleep(0)
+        return result
+
+    result, outcome = asyncio.run(main())
+    assert result == 1 and outcome["hedge_won"]
+    assert cancelled == [0]
+    assert outcome["unhedged_time"] >= 0.01
+
+
+def test_async_duplicate_takes_its_own_limiter_slot():
+    hedger = warmed_up(RequestHedger(min_samples=5, max_hedge_rate=1.0))
+    limiter = AsyncConcurrencyLimiter(1)
+    started = []
+
+    async def afunc():
+        started.append(limiter.in_flight)
+        await asyncio.sleep(0.1 if len(started) == 1 else 0.01)
+        return len(started)
+
+    async def main():
+        async with limiter:
+            return await hedger.ainvoke("worker", afunc, slot=limiter)
+
+    result, outcome = asyncio.run(main())
+    # the duplicate waited until the primary released the only slot
+    assert result == 1 and outcome["hedged"] and not outcome["hedge_won"]
+    assert limiter.peak_in_flight == 1
+
+
+def test_graph_reports_hedge_metrics(graph_config):
+    hedger = RequestHedger(min_samples=5, max_hedge_rate=0.2)
+    profiler = RunProfiler()
+    config = graph_config(
+        llm=FakeLLM(latency=0.005, slow_rate=0.1), hedger=hedger, profiler=profiler
+    )
+    graph.invoke({"inquiry": "Correct push-ups?"}, config)
+
+    totals = profiler.report()["totals"]
+    assert totals["hedges"] == hedger.stats()["hedges"] > 0
+    assert totals["hedge_rate"] <= 0.2
+    assert totals["call_time_p99_unhedged"] >= totals["call_time_p99"] * 0.5
+    summary = [c for c in profiler.calls if c.role == "summarizer"]
+    assert summary and summary[0].unhedged_time is None
+
+
+def test_invalid_percentile():
+    with pytest.raises(ValueError):
+        RequestHedger(percentile=100)
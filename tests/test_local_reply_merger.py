@@ -0,0 +1,69 @@
+from src.agents.workers.inquiry_base import AnswerItem, DimensionConnection, WorkerReply
+from src.agents.workers.local_reply_merger import LocalReplyMerger, text_similarity
+
+
+def reply(answers, connections=()):
+    return WorkerReply(
+        answers_list=[AnswerItem(answer=a, answer_type=t, score=s) for a, t, s in answers],
+        similarity_scores=[],
+        connections_list=[DimensionConnection(i=i, dimension_name=d) for i, d in connections],
+    )
+
+
+def test_text_similarity():
+    assert text_similarity("Keep your back straight", "keep your  back straight") == 1.0
+    assert text_similarity("Keep your back straight", "Breathe out when pushing") < 0.3
+
+
+def test_merge_near_duplicates_and_remap_connections():
+    previous = reply(
+        [("Keep your back straight", "manner", 0.7), ("Lower slowly", "process", 0.8)],
+        [(0, "Kinetic"), (1, "Temporal")],
+    )
+    current = reply(
+        [("Keep your back straight.", "manner", 0.9), ("Keep your back straight", "risk", 0.5)],
+        [(0, "Impact"), (1, "Ethical")],
+    )
+
+    merged = LocalReplyMerger.merge(previous, current)
+
+    answers = [(a.answer, a.answer_type, a.score) for a in merged.answers_list]
+    # same-type duplicates merged into the higher-scored variant; other types kept
+    assert answers == [
+        ("Lower slowly", "process", 0.8),
+        ("Keep your back straight.", "manner", 0.9),
+        ("Keep your back straight", "risk", 0.5),
+    ]
+    connections = [(c.i, c.dimension_name) for c in merged.connections_list]
+    assert connections == [(0, "Temporal"), (1, "Impact"), (1, "Kinetic"), (2, "Ethical")]
+    assert merged.similarity_scores == []
+
+
+def test_merge_caps_at_max_answers_by_score():
+    previous = reply([(f"answer {c}", c, 0.1 * k) for k, c in enumerate("abcd")], [(3, "Agent")])
+    current = reply([(f"answer {c}", c, 0.1 * k) for k, c in enumerate("efgh")])
+
+    merged = LocalReplyMerger.merge(previous, current, max_answers=3)
+
+    assert [a.answer for a in merged.answers_list] == ["answer c", "answer d", "answer h"]
+    assert [(c.i, c.dimension_name) for c in merged.connections_list] == [(1, "Agent")]
+
+
+def test_is_ambiguous():
+    previous = reply([("push-up form", "manner", 0.7)])
+    clear = reply([("breathing rhythm", "manner", 0.7)])
+    close = reply([("push-up form tips", "manner", 0.7)])
+
+    assert not LocalReplyMerger.is_ambiguous(previous, clear)
+    assert LocalReplyMerger.is_ambiguous(previous, close)
+
+
+def test_graph_local_merger_skips_merger_llm_calls(graph_config):
+    from src.graphs.inquiry_bot import graph
+
+    def run(mode):
+        config = graph_config(merger_mode=mode)
+        graph.invoke({"inquiry": "Correct push-ups?"}, config)
+        return config["configurable"]["llm"].calls
+
+    assert run("local") < run("llm")
@@ -0,0 +1,65 @@
+import pytest
+
+from src.graphs.inquiry_bot import graph
+from src.graphs.profiling import RunProfiler
+from src.llms.fake_llm import FakeLLM
+from src.llms.model_routing import ModelRoute, ModelRouting, route_role
+
+PROFILE = {
+    "default": {"backend": "fake", "model": "fake-flash", "params": {"seed": 1},
+                "input_price": 1.0, "output_price": 2.0},
+    "roles": {
+        "merger": {"model": "fake-lite", "input_price": 0.5},
+        "summarizer": {"model": "fake-pro", "timeout": 5},
+    },
+    "dimensions": {"Ethical": {"temperature": 0.5}, "cross:Ethical": {"model": "fake-ethics"}},
+}
+
+
+def test_routes_resolve_from_default_to_role_and_dimension():
+    routing = ModelRouting.from_dict(PROFILE)
+    assert routing.route("prelim", "Health").model == "fake-flash"
+    merger = routing.route("merger", "Health")
+    assert (merger.model, merger.input_price, merger.output_price) == ("fake-lite", 0.5, 2.0)
+    assert routing.route("summarizer").llm_kwargs() == {
+        "backend": "fake", "model": "fake-pro", "timeout": 5, "seed": 1,
+    }
+    assert routing.route("prelim", "Ethical").temperature == 0.5
+    cross = routing.route("cross", "Ethical")
+    assert (cross.model, cross.temperature) == ("fake-ethics", 0.5)
+
+    assert route_role({"role": "worker", "node": "prelim_nodes"}) == "prelim"
+    assert route_role({"role": "worker", "node": "cross_nodes"}) == "cross"
+    assert ModelRoute(input_price=1.0, output_price=2.0).cost(1_000_000, 500_000) == 2.0
+    with pytest.raises(ValueError):
+        ModelRouting(roles={"planner": ModelRoute()})
+
+
+def test_one_pool_per_distinct_route():
+    routing = ModelRouting.from_dict(PROFILE)
+    assert routing.client("prelim", "Health") is routing.client("cross", "Health")
+    assert routing.client("merger") is not routing.client("prelim")
+    assert routing.client("summarizer").endpoints[0].model == "fake-pro"
+
+
+def test_graph_calls_go_to_the_routed_models(graph_config):
+    routing = ModelRouting.from_dict(PROFILE)
+    profiler = RunProfiler()
+    # no plugged-in client: the calls go through the routing
+    config = graph_config(llm=None, model_routing=routing, profiler=profiler)
+    state = graph.invoke({"inquiry": "Correct push-ups?"}, config)
+    assert state["summary"]
+
+    summarizer = routing.client("summarizer").endpoints[0].client
+    worker = routing.client("prelim", "Health").endpoints[0].client
+    assert summarizer.calls == 1
+    assert worker.calls > 0
+    report = profiler.report()
+    assert routing.cost(report["calls"]) > 0
+
+
+def test_fake_llm_timeout():
+    llm = FakeLLM(latency=0.05, timeout=0.01)
+    with pytest.raises(TimeoutError):
+        llm.invoke("Hello")
+    assert llm.errors == 1
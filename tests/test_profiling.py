@@ -0,0 +1,78 @@
+import asyncio
+import json
+import sys
+from unittest.mock import patch
+
+from src.graphs.profiling import RunProfiler
+from src.llms.response_cache import ResponseCache
+
+
+def profiled_run(config, use_async=False):
+    from src.graphs.inquiry_bot import graph
+
+    profiler = config["configurable"]["profiler"] = RunProfiler()
+    if use_async:
+        asyncio.run(graph.ainvoke({"inquiry": "Why do cats purr?"}, config))
+    else:
+        graph.invoke({"inquiry": "Why do cats purr?"}, config)
+    return profiler
+
+
+def test_calls_are_tagged_by_node_role_dimension_and_loop(graph_config):
+    for use_async in (False, True):
+        report = profiled_run(graph_config(), use_async).report()
+        calls = report["calls"]
+
+        prelim = [c for c in calls if c["node"] == "prelim_nodes"]
+        assert len(prelim) == 22 and {c["role"] for c in prelim} == {"worker"}
+        assert {c["role"] for c in calls if c["node"] == "cross_nodes"} <= {"worker", "merger"}
+        assert [c["role"] for c in calls if c["node"] == "summarizer"] == ["summarizer"]
+        assert all(c["prompt_tokens"] > 0 and c["completion_tokens"] > 0 for c in calls)
+        assert all(c["cache"] == "off" and c["queue_wait"] >= 0 for c in calls)
+        assert report["totals"]["calls"] == len(calls)
+
+        path = report["critical_path"]
+        assert [p["node"] for p in path][0] == "prelim_nodes"
+        assert [p["node"] for p in path][-1] == "summarizer"
+        assert [p["loop"] for p in path if p["node"] == "cross_nodes"] == list(
+            range(len(path) - 2)
+        )
+
+
+def test_cache_status_is_recorded(graph_config):
+    cache = ResponseCache()
+    profiled_run(graph_config(response_cache=cache))
+    report = profiled_run(graph_config(response_cache=cache)).report()
+    assert report["totals"]["cache_hits"] == report["totals"]["calls"]
+
+
+def test_prometheus_text_format(graph_config):
+    text = profiled_run(graph_config()).to_prometheus()
+    assert "# TYPE inquiry_llm_calls_total counter" in text
+    assert 'inquiry_llm_calls_total{node="prelim_nodes",role="worker",dimension="Causal"} 1' in text
+    assert 'inquiry_node_seconds_total{node="summarizer"}' in text
+
+
+def test_prometheus_escapes_label_values():
+    profiler = RunProfiler()
+    profiler.record_call(
+        node="cross_nodes", role="worker", dimension='Say "hi"\\\n', loop=0, start=0.0,
+        wall_time=0.1, queue_wait=0.0, prompt_tokens=1, completion_tokens=1, retries=0,
+        cache="off",
+    )
+    text = profiler.to_prometheus()
+    assert 'dimension="Say \\"hi\\"\\\\\\n"} 1' in text
+
+
+@patch("src.cli.graph")
+def test_cli_profile(mock_graph, capsys, tmp_path):
+    from src.cli import main
+
+    mock_graph.stream.return_value = [{"summarizer": {"summary": "Done."}}]
+    report_path = tmp_path / "profile.json"
+    test_args = ["cli.py", "-q", "Test query", "--profile", "--profile-json", str(report_path)]
+    with patch.object(sys, "argv", test_args):
+        main()
+
+    assert "--- Profile ---" in capsys.readouterr().out
+    assert json.loads(report_path.read_text())["totals"]["calls"] == 0
@@ -0,0 +1,53 @@
+import jinja2
+
+from src.agents.workers import prompt_engine
+from src.agents.workers.inquiry_base import (
+    ALL_DIMENSIONS,
+    BASE_PROMPT_TEMPLATE,
+    InquiryOther,
+    InquiryTheVoid,
+)
+
+
+def legacy_render(cls, inquiry, additional_context=""):
+    return jinja2.Template(BASE_PROMPT_TEMPLATE).render(
+        dimension=cls.dimension,
+        primary_focus=cls.primary_focus,
+        answer_types=", ".join(cls.answer_types),
+        valid_uif_dimensions=", ".join(d for d in ALL_DIMENSIONS if d != cls.dimension),
+        contextual_utility=cls.contextual_utility,
+        inquiry=inquiry,
+        additional_context=additional_context,
+        max_answers=5,
+        max_fillups=2,
+        max_connections=3,
+        similarity_threshold=0.8,
+        request_similarity=True,
+    )
+
+
+def test_render_prompt_matches_legacy_rendering():
+    for context in ["", '[{"answer": "A1"}]']:
+        expected = legacy_render(InquiryTheVoid, "Correct push-ups?", context)
+        assert InquiryTheVoid.render_prompt("Correct push-ups?", context) == expected
+
+
+def test_prompt_prefix_is_inquiry_independent():
+    prefix = InquiryTheVoid.render_prompt_prefix()
+
+    assert InquiryTheVoid.render_prompt("Q1").startswith(prefix)
+    assert InquiryTheVoid.render_prompt("Q2", "ctx").startswith(prefix)
+    assert "Q1" not in prefix
+    assert '"The Void" dimension' in prefix
+    assert InquiryTheVoid.render_prompt_suffix("Q1").startswith("### INQUIRY\nQ1")
+
+
+def test_prompt_prefix_follows_worker_definition():
+    worker = InquiryOther.for_dimension("Olfactory")
+    assert "olfactory" in worker.render_prompt_prefix()
+    assert "olfactory" not in InquiryOther.render_prompt_prefix()
+
+
+def test_compile_template_is_cached():
+    assert prompt_engine.compile_template("{{ x }}") is prompt_engine.compile_template("{{ x }}")
+    assert prompt_engine.render("{{ x }}!", x=1) == "1!"
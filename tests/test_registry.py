@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.agents.workers import registry as registry_module
+from src.agents.workers.inquiry_base import ALL_DIMENSIONS, BaseInquiryWorker, InquiryOther, InquiryTheVoid
+from src.agents.workers.registry import WorkerRegistry, load_plugins
+from src.graphs.inquiry_bot import graph
+
+
+class InquiryOlfactory(BaseInquiryWorker):
+    name = "inquiry_olfactory"
+    dimension = "Olfactory"
+    primary_focus = "Smell"
+    answer_types = ["scent"]
+    contextual_utility = "The Nose: what the inquiry smells like."
+
+
+def test_builtin_workers():
+    registry = WorkerRegistry()
+    assert registry.dimensions == ALL_DIMENSIONS
+    assert registry.get("The Void") is InquiryTheVoid
+    assert registry.get("Other") is InquiryOther
+
+
+def test_unknown_dimensions_get_cached_definitions_without_mutating_other():
+    registry = WorkerRegistry()
+    dims = [f"Hallucinated{i}" for i in range(20)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        workers = list(executor.map(registry.get, dims * 5))
+
+    for dim, worker in zip(dims * 5, workers):
+        assert worker is registry.get(dim)
+        assert worker.name == f"inquiry_{dim.lower()}"
+        assert worker.answer_types == (dim.lower(),)
+        assert f"{dim} dimension" in worker.render_prompt_prefix()
+    assert InquiryOther.name == "inquiry_other"
+    assert InquiryOther.answer_types == ["other"]
+
+
+def test_other_cache_is_bounded():
+    registry = WorkerRegistry(max_other=2)
+    registry.get("A")
+    registry.get("B")
+    assert registry.get("C") is not registry.get("C")
+    assert registry.get("C").name == "inquiry_c"
+
+
+def test_plugins_from_entry_points(monkeypatch):
+    class EntryPoint:
+        def load(self):
+            return InquiryOlfactory
+
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: [EntryPoint()])
+    registry = load_plugins(WorkerRegistry())
+    assert registry.dimensions == ALL_DIMENSIONS + ["Olfactory"]
+    assert registry.get("Olfactory") is InquiryOlfactory
+
+    with pytest.raises(ValueError):
+        registry.register(object)
+
+
+def test_graph_fans_out_to_registered_dimensions(graph_config):
+    registry = WorkerRegistry([InquiryTheVoid, InquiryOlfactory])
+    config = graph_config(worker_registry=registry)
+    state = graph.invoke({"inquiry": "Correct push-ups?"}, config)
+    assert {"The Void", "Olfactory"} <= set(state["worker_replies"])
+
+
+def test_registered_dimensions_are_connection_targets_and_routed():
+    from src.agents.supervisors.dimension_router import DimensionRouter
+    from src.graphs import inquiry_bot
+
+    registry = WorkerRegistry()
+    registry.register(InquiryOlfactory)
+    config = {"configurable": {"worker_registry": registry}}
+    prompt = InquiryTheVoid.render_prompt(
+        "Why do cats purr?", dimensions=inquiry_bot.connection_dimensions(config)
+    )
+    assert "Olfactory" in prompt and "Olfactory" not in InquiryTheVoid.render_prompt("Why?")
+
+    router = DimensionRouter(registry.dimensions, get_worker_class=registry.get)
+    expected, source = router.expected_metrics("What is the scent of roses?")
+    assert source == "keyword" and set(expected) == set(ALL_DIMENSIONS + ["Olfactory"])
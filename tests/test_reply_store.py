@@ -0,0 +1,63 @@
+import numpy as np
+
+from src.agents.supervisors.inquiry_supervisor import InquirySupervisor
+from src.agents.supervisors.reply_store import ReplyStore, supervisor_metrics, worker_metrics
+from src.agents.workers.inquiry_base import (
+    AnswerItem,
+    DimensionConnection,
+    SimilarityScore,
+    WorkerReply,
+    calculate_worker_metric,
+)
+
+
+def make_runs():
+    reply1 = WorkerReply(
+        answers_list=[
+            AnswerItem(answer="A", answer_type="x", score=0.9),
+            AnswerItem(answer="B", answer_type="x", score=0.5),
+        ],
+        similarity_scores=[SimilarityScore(i=0, j=1, score=0.3)],
+        connections_list=[DimensionConnection(i=1, dimension_name="Causal")],
+    )
+    reply2 = WorkerReply(
+        answers_list=[AnswerItem(answer="C", answer_type="y", score=0.7)],
+        similarity_scores=[],
+        connections_list=[],
+    )
+    empty = WorkerReply(answers_list=[], similarity_scores=[], connections_list=[])
+    return [{"Agent": reply1, "Causal": empty}, {}, {"Agent": reply2}]
+
+
+def test_reply_store_round_trip(tmp_path):
+    runs = make_runs()
+    store = ReplyStore.from_runs(runs)
+
+    assert store.num_runs == 3
+    assert store.num_replies == 3
+    assert store.answer_counts.tolist() == [2, 0, 1]
+    assert store.connection_counts.tolist() == [1, 0, 0]
+    assert store.to_runs() == runs
+
+    path = str(tmp_path / "replies.npz")
+    store.save(path)
+    assert ReplyStore.load(path).to_runs() == runs
+
+
+def test_vectorized_metrics_match_per_object_metrics():
+    runs = make_runs()
+    store = ReplyStore.from_runs(runs)
+
+    expected_workers = [calculate_worker_metric(r) for run in runs for r in run.values()]
+    expected_supervisor = [InquirySupervisor.calculate_metric(run) for run in runs]
+
+    assert np.allclose(worker_metrics(store), expected_workers)
+    assert np.allclose(supervisor_metrics(store), expected_supervisor)
+
+
+def test_from_replies():
+    replies = [reply for run in make_runs() for reply in run.values()]
+    store = ReplyStore.from_replies(replies)
+
+    assert store.to_replies() == replies
+    assert np.allclose(worker_metrics(store), [calculate_worker_metric(r) for r in replies])
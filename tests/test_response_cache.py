@@ -0,0 +1,64 @@
+import time
+
+from src.llms.response_cache import ResponseCache
+from src.llms.fake_llm import FakeLLM
+
+
+def test_response_cache_memory_lru():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")  # evicts "b", the least recently used entry
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "3"
+    stats = cache.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_response_cache_disk_tier_ttl_and_eviction(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(max_entries=0, path=path, max_disk_entries=2)
+    for key in ["a", "b", "c"]:
+        cache.set(key, key.upper())
+        time.sleep(0.01)
+    cache.close()
+
+    # persisted across instances, oldest entry evicted
+    cache = ResponseCache(max_entries=0, path=path, ttl=60)
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
+    assert cache.stats()["disk_hits"] == 1
+
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.get("c") is None
+    cache.close()
+
+
+def test_response_cache_key_depends_on_all_fields():
+    key = ResponseCache.make_key("m", 0, "WorkerReply", "sys", "human")
+    assert key == ResponseCache.make_key("m", 0, "WorkerReply", "sys", "human")
+    assert key != ResponseCache.make_key("m", 0.5, "WorkerReply", "sys", "human")
+    assert key != ResponseCache.make_key("m", 0, "WorkerReply", "sys2", "human")
+
+
+def test_graph_cache_hits_skip_llm_calls(graph_config):
+    from src.graphs.inquiry_bot import graph
+
+    cache = ResponseCache()
+    llm = FakeLLM()
+    first = graph.invoke(
+        {"inquiry": "Correct push-ups?"}, graph_config(llm=llm, response_cache=cache)
+    )
+    calls = llm.calls
+
+    second = graph.invoke(
+        {"inquiry": "Correct push-ups?"}, graph_config(llm=llm, response_cache=cache)
+    )
+
+    assert llm.calls == calls
+    assert second["summary"] == first["summary"]
+    assert cache.stats()["hit_rate"] > 0
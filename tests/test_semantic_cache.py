@@ -0,0 +1,83 @@
+import time
+
+from src.graphs.inquiry_bot import graph
+from src.graphs.semantic_cache import SemanticCache, embed
+
+RESULT = {"summary": "Purring is ...", "worker_replies": {}}
+
+
+def run(config: dict, inquiry: str):
+    nodes = [node for event in graph.stream({"inquiry": inquiry}, config) for node in event]
+    return graph.get_state(config).values, nodes, config["configurable"]["llm"].calls
+
+
+def test_paraphrases_are_closer_than_other_inquiries():
+    cats = embed("Why do cats purr?")
+    assert cats @ embed("What makes cats purr?") > 0.9
+    assert cats @ embed("How to do a proper push-up?") < 0.2
+
+
+def test_lookup_modes():
+    cache = SemanticCache(threshold=0.9, seed_threshold=0.4)
+    cache.store("Why do cats purr?", RESULT)
+
+    assert cache.lookup("why do cats purr")["mode"] == "hit"
+    assert cache.lookup("Why do cats purr so loudly?")["mode"] == "seed"
+    assert cache.lookup("Correct push-ups?") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["seeds"], stats["misses"]) == (1, 1, 1)
+    assert stats["lookup_ms_p99"] > 0
+
+
+def test_a_different_question_word_is_no_hit():
+    cache = SemanticCache(threshold=0.9, seed_threshold=0.4)
+    cache.store("When was the Eiffel Tower built?", RESULT)
+    cache.store("How to prepare for a job interview?", RESULT)
+
+    assert cache.lookup("Where was the Eiffel Tower built?")["mode"] == "seed"
+    assert cache.lookup("Why prepare for a job interview?")["mode"] == "seed"
+    assert cache.lookup("how to prepare for a job interview")["mode"] == "hit"
+    no_seeds = SemanticCache(threshold=0.9)
+    no_seeds.store("When was the Eiffel Tower built?", RESULT)
+    assert no_seeds.lookup("Where was the Eiffel Tower built?") is None
+
+
+def test_eviction_ttl_and_persistence(tmp_path):
+    path = str(tmp_path / "semantic.sqlite")
+    cache = SemanticCache(max_entries=2, path=path)
+    cache.store("Why do cats purr?", RESULT)
+    cache.store("Correct push-ups?", RESULT)
+    cache.lookup("Why do cats purr?")  # now the most recently used
+    cache.store("Is solar power worth it?", RESULT)
+    assert cache.stats()["evictions"] == 1
+    assert cache.lookup("Correct push-ups?") is None
+    cache.close()
+
+    reloaded = SemanticCache(max_entries=2, path=path)
+    assert reloaded.lookup("Why do cats purr?")["result"] == RESULT
+    assert reloaded.stats()["entries"] == 2
+
+    reloaded.ttl = 0.0
+    time.sleep(0.01)
+    assert reloaded.lookup("Why do cats purr?") is None
+    reloaded.close()
+
+
+def test_graph_reuses_and_seeds_from_near_duplicates(graph_config):
+    cache = SemanticCache(threshold=0.9, seed_threshold=0.4)
+    first, _, first_calls = run(graph_config(semantic_cache=cache), "Why do cats purr?")
+    assert first_calls > 0 and cache.stats()["entries"] == 1
+
+    hit, nodes, calls = run(graph_config(semantic_cache=cache), "Why do my cats purr?")
+    assert calls == 0 and "prelim_nodes" not in nodes
+    assert hit["summary"] == first["summary"]
+    assert hit["worker_replies"] == first["worker_replies"]
+    assert hit["semantic_cache"]["mode"] == "hit"
+
+    seeded, nodes, calls = run(
+        graph_config(semantic_cache=cache), "Why do cats purr so loudly?"
+    )
+    assert seeded["semantic_cache"]["mode"] == "seed"
+    assert "prelim_nodes" not in nodes and "summarizer" in nodes
+    assert 0 < calls < first_calls
+    assert seeded["summary"].startswith("Summary for 'Why do cats purr so loudly?'")
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from src.graphs.inquiry_bot import graph
+from src.llms.fake_llm import FakeLLM
+from src.server import (
+    HTTPError,
+    InquiryService,
+    ServiceOverloaded,
+    post_inquiry,
+    read_request,
+    start_server,
+)
+
+
+def service(config: dict, **kwargs) -> InquiryService:
+    return InquiryService(graph, config=config, **kwargs)
+
+
+def test_concurrent_duplicates_share_one_run(graph_config):
+    svc = service(graph_config(llm=FakeLLM(latency=0.01)))
+
+    async def collect(inquiry):
+        return [event async for event in svc.stream(inquiry)]
+
+    async def main():
+        return await asyncio.gather(collect("Correct push-ups?"), collect("Correct push-ups?"))
+
+    first, second = asyncio.run(main())
+    assert [e["event"] for e in first][1:] == [e["event"] for e in second][1:]
+    assert (first[0]["coalesced"], second[0]["coalesced"]) == (False, True)
+    assert first[-1]["event"] == "done"
+    assert len(first[-1]["result"]["worker_replies"]) == 22
+    assert svc.stats()["runs"] == 1 and svc.stats()["coalesced"] == 1
+
+    # a finished inquiry is not in flight anymore
+    asyncio.run(collect("Correct push-ups?"))
+    assert svc.stats()["runs"] == 2
+
+
+def test_admission_control_rejects_beyond_the_queue(graph_config):
+    svc = service(graph_config(llm=FakeLLM(latency=0.01)), max_concurrency=1, max_queue=1)
+
+    async def main():
+        svc.submit("Q1?")
+        svc.submit("Q2?")
+        with pytest.raises(ServiceOverloaded):
+            svc.submit("Q3?")
+        assert svc.stats()["queued"] == 2  # neither run got its slot yet
+        svc.submit("Q1?")  # joining a run in flight needs no slot
+        await svc.join()
+
+    asyncio.run(main())
+    assert svc.stats() | {"max_concurrency": 0} == {
+        "requests": 4, "runs": 2, "coalesced": 1, "rejected": 1, "failed": 0,
+        "running": 0, "queued": 0, "max_concurrency": 0, "max_queue": 1,
+    }
+
+
+def test_http_stream_and_errors(graph_config):
+    svc = service(graph_config(), max_concurrency=1, max_queue=0)
+
+    async def main():
+        server = await start_server(svc, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        ok, busy = await asyncio.gather(
+            post_inquiry("127.0.0.1", port, "Why do cats purr?"),
+            post_inquiry("127.0.0.1", port, "Why do dogs bark?"),
+        )
+        bad = await post_inquiry("127.0.0.1", port, "")
+        server.close()
+        return ok, busy, bad
+
+    (status, events), (busy_status, busy), (bad_status, _) = asyncio.run(main())
+    assert status == 200
+    assert [e["event"] for e in events][:2] == ["accepted", "started"]
+    assert {e["node"] for e in events if e["event"] == "update"} >= {"prelim_nodes", "summarizer"}
+    assert events[-1]["result"]["summary"].startswith("Summary for 'Why do cats purr?'")
+    assert busy_status == 503 and busy[0]["rejected"] == 1
+    assert bad_status == 400
+
+
+def test_invalid_content_length_is_a_bad_request():
+    async def read(content_length):
+        reader = asyncio.StreamReader()
+        head = f"POST /inquiry HTTP/1.1\r\nContent-Length: {content_length}\r\n\r\n"
+        reader.feed_data(head.encode("latin-1"))
+        reader.feed_eof()
+        return await read_request(reader)
+
+    for content_length in ("abc", "-1", "1.5", "\xb2"):
+        with pytest.raises(HTTPError) as error:
+            asyncio.run(read(content_length))
+        assert error.value.status == 400
+    assert asyncio.run(read("0"))[:2] == ("POST", "/inquiry")
+
+
+def test_truncated_slow_and_oversized_requests_are_rejected():
+    async def read(data, eof=True, limit=2**16, timeout=None):
+        reader = asyncio.StreamReader(limit=limit)
+        reader.feed_data(data)
+        if eof:
+            reader.feed_eof()
+        return await read_request(reader, timeout)
+
+    cases = [
+        (b"POST /inquiries HTTP/1.1\r\nContent-Length: 10\r\n\r\nabc", {}, 400),
+        (b"POST /inquiries HTTP/1.1\r\nX-Long: " + b"x" * 100 + b"\r\n\r\n", {"limit": 64}, 400),
+        (b"POST /inquiries HTTP/1.1\r\n", {"eof": False, "timeout": 0.05}, 408),
+    ]
+    for data, kwargs, status in cases:
+        with pytest.raises(HTTPError) as error:
+            asyncio.run(read(data, **kwargs))
+        assert error.value.status == status
+
+
+def test_body_that_is_not_utf8_is_a_bad_request(graph_config):
+    async def main():
+        server = await start_server(service(graph_config()), "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /inquiries HTTP/1.1\r\nContent-Length: 4\r\n\r\n\x80abc")
+        await writer.drain()
+        reply = await reader.read()
+        writer.close()
+        server.close()
+        return reply
+
+    assert asyncio.run(main()).startswith(b"HTTP/1.1 400 ")
+
+
+def test_failed_run_reports_an_error_event(graph_config):
+    svc = service(graph_config(llm=FakeLLM(error_rate=1.0)))
+
+    async def main():
+        return [event async for event in svc.stream("Q?")]
+
+    events = asyncio.run(main())
+    assert events[-1]["event"] == "error"
+    assert svc.stats()["failed"] == 1
@@ -0,0 +1,73 @@
+import numpy as np
+
+from src.agents.workers.inquiry_base import AnswerItem, InquiryCausal, WorkerReply
+from src.agents.workers.inquiry_reply_merger import InquiryReplyMerger
+from src.agents.workers.similarity import (
+    WorkerAnswers,
+    cosine_similarity_matrix,
+    similarity_scores,
+    with_local_similarity,
+)
+
+
+def test_cosine_similarity_matrix():
+    matrix = cosine_similarity_matrix(
+        ["Keep your back straight", "keep your back  straight", "Breathe out"]
+    )
+
+    assert matrix.shape == (3, 3)
+    assert np.allclose(np.diag(matrix), 1.0)
+    assert np.allclose(matrix, matrix.T)
+    assert matrix[0, 1] > 0.99
+    assert matrix[0, 2] < 0.3
+
+
+def test_similarity_scores_only_for_same_answer_type():
+    answers = [
+        AnswerItem(answer="Keep your back straight", answer_type="manner", score=0.9),
+        AnswerItem(answer="Keep the back straight", answer_type="risk", score=0.5),
+        AnswerItem(answer="Keep a straight back", answer_type="manner", score=0.7),
+    ]
+    scores = similarity_scores(answers)
+
+    assert [(s.i, s.j) for s in scores] == [(0, 2)]
+    assert 0.0 < scores[0].score < 1.0
+    assert similarity_scores(answers[:1]) == []
+
+
+def test_with_local_similarity_fills_worker_reply():
+    answers = WorkerAnswers(
+        answers_list=[
+            AnswerItem(answer="A", answer_type="x", score=0.9),
+            AnswerItem(answer="A", answer_type="x", score=0.8),
+        ],
+        connections_list=[],
+    )
+    reply = with_local_similarity(answers)
+
+    assert isinstance(reply, WorkerReply)
+    assert reply.similarity_scores[0].score == 1.0
+
+
+def test_prompts_without_similarity_scores():
+    reply = WorkerReply(answers_list=[], similarity_scores=[], connections_list=[])
+
+    worker_prompt = InquiryCausal.render_prompt("Q", request_similarity=False)
+    merger_prompt = InquiryReplyMerger.render_prompt(reply, reply, request_similarity=False)
+
+    for prompt in [worker_prompt, merger_prompt]:
+        assert "schema of answers_list and connections_list." in prompt
+        assert "Joint Sequence Attention" not in prompt
+    assert "similarity_scores" not in merger_prompt.split("### INPUT DATA")[1]
+    assert "answers_list, similarity_scores, and connections_list" in InquiryCausal.render_prompt("Q")
+
+
+def test_graph_with_local_similarity(graph_config):
+    from src.graphs.inquiry_bot import graph
+
+    config = graph_config(local_similarity=True)
+    final = graph.invoke({"inquiry": "Correct push-ups?"}, config)
+
+    for reply in final["worker_replies"].values():
+        assert isinstance(reply, WorkerReply)
+        assert reply.similarity_scores == similarity_scores(reply.answers_list)
@@ -0,0 +1,48 @@
+from src.agents.supervisors.stopping_policy import StoppingPolicy
+
+
+def reason(policy, **kwargs):
+    args = dict(
+        loop_count=1, previous_metric=10.0, metric=12.0, new_connections=3, elapsed=1.0, tokens_used=100
+    )
+    return policy.stop_reason(**{**args, **kwargs})
+
+
+def test_stop_reasons():
+    policy = StoppingPolicy(max_loops=3, min_relative_gain=0.05, latency_budget=60, token_budget=1000)
+
+    assert reason(policy) is None
+    assert reason(policy, metric=10.4) == "converged"
+    assert reason(policy, new_connections=0) == "no_new_connections"
+    assert reason(policy, loop_count=3) == "max_loops"
+    assert reason(policy, elapsed=61.0) == "latency_budget"
+    assert reason(policy, tokens_used=1000) == "token_budget"
+
+    unbounded = StoppingPolicy(max_loops=10, min_relative_gain=None, stop_without_new_connections=False)
+    assert reason(unbounded, metric=5.0, new_connections=0) is None
+
+
+def run(config):
+    from src.graphs.inquiry_bot import graph
+
+    events = list(graph.stream({"inquiry": "Why do cats purr?"}, config))
+    nodes = [node for event in events for node in event]
+    return graph.get_state(config).values, nodes, config["configurable"]["llm"]
+
+
+def test_token_budget_spent_by_prelim_skips_cross_nodes(graph_config):
+    state, nodes, llm = run(graph_config(stopping_policy=StoppingPolicy(token_budget=1)))
+
+    assert state["stop_reason"] == "token_budget"
+    assert state["tokens_used"] > 0
+    assert "cross_nodes" not in nodes
+    assert state["summary"]
+    assert llm.calls == 22 + 1  # prelim + summary
+
+
+def test_stop_reason_recorded_after_cross_loop(graph_config):
+    state, nodes, _ = run(graph_config(stopping_policy=StoppingPolicy(max_loops=1)))
+
+    assert state["stop_reason"] == "max_loops"
+    assert nodes.count("cross_nodes") == 1
+    assert state["supervisor_metric"] > 0